@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+Compare uncompressed API traffic with compressed responses and gzip request bodies, against the local stand-in on a
+bandwidth limited link.
+
+    python benchmarks/bench_compression.py --items 5000 --bandwidth-mb 10
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import argparse
+import time
+
+import benchutil
+from bench_field_profiles import full_item
+from fake_server import FakeSyncSketchServer
+
+from syncsketch import SyncSketchAPI
+
+
+def cases(num_items):
+    item_ids = list(range(1, num_items + 1))
+    users = [{"email": "artist%05d@example.com" % index, "permission": "reviewer"} for index in range(num_items)]
+    return [
+        ("get_tree", lambda api: api.get_tree(withItems=True)),
+        ("get_media", lambda api: api.get_media({"limit": num_items})),
+        ("sort_review_items", lambda api: api.sort_review_items(1, [{"id": i, "sortorder": i} for i in item_ids])),
+        ("bulk_delete_items", lambda api: api.bulk_delete_items(item_ids)),
+        ("add_users_to_project", lambda api: api.add_users_to_project(1, users)),
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--bandwidth-mb", type=float, default=10)
+    parser.add_argument("--latency-ms", type=float, default=5)
+    parser.add_argument("--json")
+    args = parser.parse_args(argv)
+
+    rows = []
+    for mode, compressed in (("plain", False), ("compressed", True)):
+        server = FakeSyncSketchServer(
+            num_items=args.items,
+            latency=args.latency_ms / 1000.0,
+            bandwidth=args.bandwidth_mb * 1024 * 1024,
+            compress_responses=compressed,
+        )
+        with server:
+            for item_id, item in server.objects["item"].items():
+                item.update(full_item(item_id))
+            api = SyncSketchAPI("user", "key", host=server.url, use_header_auth=True, compress_requests=compressed)
+
+            for name, fn in cases(args.items):
+                sent, received = server.bytes_received, server.bytes_sent
+                start = time.perf_counter()
+                fn(api)
+                wall = time.perf_counter() - start
+                rows.append(
+                    {
+                        "name": "%s_%s" % (name, mode),
+                        "ops": 1,
+                        "request_kb": (server.bytes_received - sent) / 1024.0,
+                        "response_kb": (server.bytes_sent - received) / 1024.0,
+                        "wall_s": wall,
+                    }
+                )
+
+    benchutil.print_table(rows)
+    if args.json:
+        benchutil.write_json(rows, args.json)
+    return rows
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+End-to-end benchmarks of the SyncSketch client against the local stand-in server.
+
+Reports throughput and p50/p99 latency for list paging, bulk item creation, multipart upload, bulk
+upload_many ingest and flatten-task polling. For upload_many the latencies are the time until each file finished.
+
+    python benchmarks/bench_e2e.py
+    python benchmarks/bench_e2e.py --latency-ms 20 --bandwidth-mb 50 --error-rate 0.05 --json results.json
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchutil import print_table, summarize, timed, write_json
+from fake_server import FakeSyncSketchServer
+
+from syncsketch import SyncSketchAPI
+
+
+def bench_list_paging(api, page_size):
+    latencies = []
+    offset = 0
+    start = time.perf_counter()
+    while True:
+        response, duration = timed(api.get_media, {"active": 1, "limit": page_size, "offset": offset})
+        latencies.append(duration)
+        if not response["meta"]["next"]:
+            break
+        offset += page_size
+    return summarize("list_paging", latencies, time.perf_counter() - start)
+
+
+def bench_item_creation(api, count):
+    latencies = []
+    start = time.perf_counter()
+    for index in range(count):
+        _, duration = timed(api.add_item, 1, "bench_%05d.mov" % index, 24, {"type": "video"})
+        latencies.append(duration)
+    return summarize("item_creation", latencies, time.perf_counter() - start)
+
+
+def make_file(num_bytes):
+    with tempfile.NamedTemporaryFile(suffix=".mp4", delete=False) as f:
+        remaining = num_bytes
+        while remaining:
+            block = os.urandom(min(remaining, 1024 * 1024))
+            f.write(block)
+            remaining -= len(block)
+    return f.name
+
+
+def bench_multipart_upload(api, size_mb, iterations, chunk_size_mb):
+    num_bytes = size_mb * 1024 * 1024
+    f = make_file(num_bytes)
+
+    try:
+        latencies = []
+        start = time.perf_counter()
+        for _ in range(iterations):
+            result, duration = timed(api.upload_file, 1, f, chunk_size=chunk_size_mb * 1024 * 1024)
+            if result is None:
+                raise RuntimeError("upload_file failed")
+            latencies.append(duration)
+        wall_time = time.perf_counter() - start
+        return summarize("multipart_upload", latencies, wall_time, num_bytes=num_bytes * iterations)
+    finally:
+        os.remove(f)
+
+
+def bench_upload_many(api, num_files, max_size_mb, max_workers):
+    # a typical dailies mix: many small files and a few large ones
+    sizes = [int(max_size_mb * 1024 * 1024 * (index + 1) ** 2 / num_files**2) for index in range(num_files)]
+    paths = [make_file(size) for size in sizes]
+
+    try:
+        latencies = []
+        start = time.perf_counter()
+        for _, item in api.upload_many(1, paths, max_workers=max_workers):
+            if item is None:
+                raise RuntimeError("upload_many failed")
+            latencies.append(time.perf_counter() - start)
+        return summarize("upload_many", latencies, time.perf_counter() - start, num_bytes=sum(sizes))
+    finally:
+        for path in paths:
+            os.remove(path)
+
+
+def bench_flatten_polling(api, iterations):
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        result, duration = timed(api.get_flattened_annotations, 1, 1)
+        if not result:
+            raise RuntimeError("get_flattened_annotations failed")
+        latencies.append(duration)
+    return summarize("flatten_polling", latencies, time.perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="server latency per request")
+    parser.add_argument("--bandwidth-mb", type=float, default=None, help="per connection bandwidth in MB/s")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="probability of a 500 on fake S3 part PUTs")
+    parser.add_argument("--items", type=int, default=2000, help="number of items to page through")
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--create", type=int, default=200, help="number of items to create")
+    parser.add_argument("--upload-mb", type=int, default=64)
+    parser.add_argument("--upload-iterations", type=int, default=3)
+    parser.add_argument("--chunk-mb", type=int, default=5)
+    parser.add_argument("--many-files", type=int, default=40, help="number of files for upload_many")
+    parser.add_argument("--many-max-mb", type=int, default=32, help="size of the largest upload_many file")
+    parser.add_argument("--workers", type=int, default=8, help="upload_many workers")
+    parser.add_argument("--task-polls", type=int, default=1, help="status checks before a celery task is done")
+    parser.add_argument("--flatten-iterations", type=int, default=3)
+    parser.add_argument("--only", nargs="*", help="run only these benchmarks")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args(argv)
+
+    server = FakeSyncSketchServer(
+        latency=args.latency_ms / 1000.0,
+        bandwidth=args.bandwidth_mb * 1024 * 1024 if args.bandwidth_mb else None,
+        error_rate=args.error_rate,
+        task_polls=args.task_polls,
+        num_items=args.items,
+        seed=0,
+    )
+
+    benchmarks = [
+        ("list_paging", lambda api: bench_list_paging(api, args.page_size)),
+        ("item_creation", lambda api: bench_item_creation(api, args.create)),
+        (
+            "multipart_upload",
+            lambda api: bench_multipart_upload(api, args.upload_mb, args.upload_iterations, args.chunk_mb),
+        ),
+        ("upload_many", lambda api: bench_upload_many(api, args.many_files, args.many_max_mb, args.workers)),
+        ("flatten_polling", lambda api: bench_flatten_polling(api, args.flatten_iterations)),
+    ]
+
+    rows = []
+    with server:
+        api = SyncSketchAPI("bench", "bench-key", host=server.url, use_header_auth=True)
+        for name, bench in benchmarks:
+            if args.only and name not in args.only:
+                continue
+            rows.append(bench(api))
+
+    print_table(rows)
+    if args.json:
+        write_json(rows, args.json)
+    return rows
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+Compare response size and client time of an item listing with each field profile, against the local stand-in.
+
+    python benchmarks/bench_field_profiles.py --items 5000 --page-size 1000
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import argparse
+import time
+
+import benchutil
+from fake_server import FakeSyncSketchServer
+
+from syncsketch import SyncSketchAPI
+from syncsketch.fieldprofiles import FieldProfiles
+
+
+def full_item(item_id):
+    """
+    Fields of a full item response, including the nested objects and urls the listing view never reads.
+    """
+    url = "https://syncsketch-media.s3.amazonaws.com/media/%d" % item_id
+    return {
+        "type": "video",
+        "fps": 24.0,
+        "sortorder": item_id,
+        "description": "Comp v003, fixed edge halo on the left",
+        "creator": {"id": 7, "name": "Jane Artist", "email": "jane@example.com"},
+        "thumbnail_url": url + "/thumb.jpg",
+        "thumbnail_url_hd": url + "/thumb_hd.jpg",
+        "content": url + "/source.mov",
+        "content_url": url + "/source.mov",
+        "lowres_url": url + "/low.mp4",
+        "mp4_url": url + "/high.mp4",
+        "reviews": ["/api/v1/review/%d/" % review_id for review_id in range(3)],
+        "metadata": {"frames": 120, "colorspace": "rec709", "source": "/mnt/show/sq010/sh%04d/comp/v003" % item_id},
+        "width": 1920,
+        "height": 1080,
+        "duration": 5.0,
+        "size": 52428800,
+        "is_processing": False,
+        "modified": "2024-01-02T00:00:00",
+    }
+
+
+def run(api, page_size):
+    response_bytes = [0]
+    original_send = api._send
+
+    def send(method, url, **kwargs):
+        response = original_send(method, url, **kwargs)
+        response_bytes[0] += len(response.content)
+        return response
+
+    api._send = send
+
+    start = time.perf_counter()
+    offset = 0
+    rows = 0
+    while True:
+        response = api.get_media({"limit": page_size, "offset": offset})
+        rows += len(response["objects"])
+        if not response["meta"]["next"]:
+            break
+        offset += page_size
+    return rows, response_bytes[0], time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    rows = []
+    with FakeSyncSketchServer(num_items=args.items) as server:
+        for item_id, item in server.objects["item"].items():
+            item.update(full_item(item_id))
+
+        for profile in ("full", "listing", "minimal"):
+            api = SyncSketchAPI(
+                "user", "key", host=server.url, use_header_auth=True, field_profiles=FieldProfiles(default=profile)
+            )
+            best = None
+            for _ in range(args.repeat):
+                result = run(api, args.page_size)
+                best = result if best is None or result[2] < best[2] else best
+            count, num_bytes, wall = best
+            rows.append(
+                {
+                    "name": profile,
+                    "ops": count,
+                    "bytes_per_row": num_bytes / count,
+                    "mb": num_bytes / 1e6,
+                    "wall_s": wall,
+                }
+            )
+
+    benchutil.print_table(rows)
+    return rows
+
+
+if __name__ == "__main__":
+    main()
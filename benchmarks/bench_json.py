@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+Compare the JSON backends of syncsketch.jsoncodec on listing and tree sized payloads, against the previous
+``Response.json()`` decoding and ``json.dumps`` encoding.
+
+    python benchmarks/bench_json.py --items 5000
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import argparse
+import gc
+import json
+import time
+
+import benchutil
+import requests
+from bench_field_profiles import full_item
+from bench_overhead import make_item
+
+from syncsketch.jsoncodec import BACKENDS, get_codec
+
+
+def best_of(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            fn()
+            wall = time.perf_counter() - start
+        finally:
+            gc.enable()
+        best = wall if best is None or wall < best else best
+    return best
+
+
+def payloads(num_items):
+    items = []
+    for item_id in range(num_items):
+        item = make_item(item_id)
+        item.update(full_item(item_id))
+        items.append(item)
+    listing = {"meta": {"limit": num_items, "offset": 0, "total_count": num_items, "next": None}, "objects": items}
+    tree = [{"id": 1, "name": "Workspace", "projects": [{"id": 1, "name": "Project", "reviews": []}]}]
+    for review_id in range(10):
+        review_items = items[review_id::10]
+        tree[0]["projects"][0]["reviews"].append({"id": review_id, "name": "Review", "items": review_items})
+    sort_payload = {"items": [{"id": item_id, "sortorder": item_id} for item_id in range(num_items)]}
+    return [("listing", listing), ("tree", tree), ("sort_items", sort_payload)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    codecs = []
+    for name in BACKENDS:
+        try:
+            codecs.append(get_codec(name))
+        except ImportError:
+            print("%s is not installed, skipped" % name)
+
+    rows = []
+    for payload_name, payload in payloads(args.items):
+        content = json.dumps(payload).encode("utf-8")
+
+        def response_json():
+            response = requests.Response()
+            response._content = content
+            response.encoding = "utf-8"
+            return response.json()
+
+        rows.append(
+            {
+                "name": "%s_previous" % payload_name,
+                "mb": len(content) / 1e6,
+                "decode_ms": best_of(response_json, args.repeat) * 1000,
+                "encode_ms": best_of(lambda: json.dumps(payload), args.repeat) * 1000,
+            }
+        )
+        for codec in codecs:
+            rows.append(
+                {
+                    "name": "%s_%s" % (payload_name, codec.name),
+                    "mb": len(content) / 1e6,
+                    "decode_ms": best_of(lambda: codec.loads(content), args.repeat) * 1000,
+                    "encode_ms": best_of(lambda: codec.dumps(payload), args.repeat) * 1000,
+                }
+            )
+
+    benchutil.print_table(rows)
+    return rows
+
+
+if __name__ == "__main__":
+    main()
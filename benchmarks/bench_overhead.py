@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+"""
+Client overhead microbenchmarks and regression gate.
+
+Measures the Python time and memory each call spends in the client itself, i.e. the hot helpers used by
+``_get_json_response`` and the paginated listing paths, against an in-process transport stub that never touches
+the network.
+
+    # compare against the stored baseline, exits with 1 on a regression
+    python benchmarks/bench_overhead.py
+
+    # store new baseline numbers after an intended change
+    python benchmarks/bench_overhead.py --save-baseline
+
+Timings are normalized by a pure Python calibration loop, run interleaved with each case, so the baseline can be
+compared across machines.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import benchutil  # noqa: F401 (puts the in-tree package on sys.path)
+import requests
+
+from syncsketch import SyncSketchAPI
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline_overhead.json")
+
+PAGE_SIZE = 100
+NUM_PAGES = 20
+
+
+def make_item(item_id):
+    return {
+        "id": item_id,
+        "uuid": "0b7c4a5e-5c1f-4d1b-9a4e-%012d" % item_id,
+        "name": "sq010_sh%04d_comp_v003.mov" % item_id,
+        "status": "done",
+        "type": "video",
+        "fps": 24.0,
+        "creator": {"id": 7, "name": "Jane Artist", "email": "jane@example.com"},
+        "resource_uri": "/api/v1/item/%s/" % item_id,
+        "metadata": {"frames": 120, "colorspace": "rec709"},
+    }
+
+
+class StubTransport(object):
+    """
+    In-process transport. Answers every request from pre-serialized responses.
+    """
+
+    def __init__(self):
+        self.detail = make_item(1)
+        self.pages = {}
+        for page in range(NUM_PAGES):
+            offset = page * PAGE_SIZE
+            next_url = "/api/v1/item/?offset=%s" % (offset + PAGE_SIZE) if page + 1 < NUM_PAGES else None
+            objects = [make_item(offset + index) for index in range(PAGE_SIZE)]
+            meta = {"limit": PAGE_SIZE, "offset": offset, "total_count": NUM_PAGES * PAGE_SIZE, "next": next_url}
+            self.pages[offset] = json.dumps({"meta": meta, "objects": objects}).encode("utf-8")
+        self.detail_content = json.dumps(self.detail).encode("utf-8")
+
+    def request(self, method, url, params=None, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        response.encoding = "utf-8"
+        if params and "offset" in params:
+            response._content = self.pages[int(params["offset"])]
+        else:
+            response._content = self.detail_content
+        return response
+
+
+def iterate_pages(api):
+    count = 0
+    offset = 0
+    while True:
+        response = api.get_media({"active": 1, "limit": PAGE_SIZE, "offset": offset})
+        count += len(response["objects"])
+        if not response["meta"]["next"]:
+            return count
+        offset += PAGE_SIZE
+
+
+def build_cases(api):
+    post_data = {"reviewId": 1, "name": "shot.mov", "fps": 24, "status": "done", "metadata": {"frames": 120}}
+
+    return [
+        ("join_url_path", lambda: SyncSketchAPI.join_url_path(api.HOST, "/api/v1/item/", "123")),
+        ("unversioned_api_url", lambda: api._get_unversioned_api_url("/api/v1/item/123/")),
+        ("get_json_response_get", lambda: api._get_json_response("/api/v1/item/1/")),
+        ("get_json_response_post", lambda: api._get_json_response("/api/v1/item/", postData=post_data)),
+        ("get_item", lambda: api.get_item(1, fields=["id", "name", "status"])),
+        ("paginated_listing_%sx%s" % (NUM_PAGES, PAGE_SIZE), lambda: iterate_pages(api)),
+    ]
+
+
+def calibration_workload():
+    total = 0
+    data = {}
+    for i in range(5000):
+        data[str(i)] = i
+        total += len(data)
+    return total
+
+
+def best_time(fn, number):
+    start = time.perf_counter()
+    for _ in range(number):
+        fn()
+    return (time.perf_counter() - start) / number
+
+
+def measure(fn, min_time=0.5, repeat=10):
+    """
+    Return (best seconds per call, best seconds per calibration run, peak bytes allocated by a single call).
+
+    Case and calibration runs are interleaved so both see the same machine load.
+    """
+    fn()
+
+    number = 1
+    while best_time(fn, number) * number < min_time / repeat / 2:
+        number *= 2
+
+    best = calibration = float("inf")
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            best = min(best, best_time(fn, number))
+            calibration = min(calibration, best_time(calibration_workload, 1))
+    finally:
+        gc.enable()
+
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return best, calibration, max(0, peak - baseline)
+
+
+def run(min_time):
+    api = SyncSketchAPI("bench", "bench-key", use_header_auth=True, transport=StubTransport())
+    results = {}
+    for name, fn in build_cases(api):
+        seconds, calibration, peak_bytes = measure(fn, min_time=min_time)
+        results[name] = {
+            "us_per_call": seconds * 1e6,
+            "normalized": seconds / calibration,
+            "peak_alloc_bytes": peak_bytes,
+        }
+    return {"python": sys.version.split()[0], "cases": results}
+
+
+def compare(current, baseline, time_threshold, alloc_threshold):
+    regressions = []
+    print("%-32s %12s %12s %9s %14s %14s" % ("case", "us/call", "base us", "time", "peak alloc", "base alloc"))
+    for name, result in sorted(current["cases"].items()):
+        base = baseline["cases"].get(name)
+        if base is None:
+            print("%-32s %12.2f %12s" % (name, result["us_per_call"], "new"))
+            continue
+
+        time_ratio = result["normalized"] / base["normalized"]
+        alloc_limit = base["peak_alloc_bytes"] * (1 + alloc_threshold) + 1024
+        flags = []
+        if time_ratio > 1 + time_threshold:
+            flags.append("TIME")
+        if result["peak_alloc_bytes"] > alloc_limit:
+            flags.append("ALLOC")
+
+        print(
+            "%-32s %12.2f %12.2f %8.2fx %14d %14d %s"
+            % (
+                name,
+                result["us_per_call"],
+                base["us_per_call"],
+                time_ratio,
+                result["peak_alloc_bytes"],
+                base["peak_alloc_bytes"],
+                " ".join(flags),
+            )
+        )
+        if flags:
+            regressions.append((name, flags))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--time-threshold", type=float, default=0.50, help="allowed relative slowdown")
+    parser.add_argument("--alloc-threshold", type=float, default=0.10, help="allowed relative allocation growth")
+    parser.add_argument("--min-time", type=float, default=0.5, help="seconds to spend per case")
+    args = parser.parse_args(argv)
+
+    current = run(args.min_time)
+
+    if args.save_baseline:
+        benchutil.write_json(current, args.baseline)
+        print("Baseline written to %s" % args.baseline)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline at %s, run with --save-baseline first" % args.baseline)
+        return 1
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+
+    regressions = compare(current, baseline, args.time_threshold, args.alloc_threshold)
+    if regressions:
+        print("Regressions: %s" % ", ".join("%s (%s)" % (name, "/".join(flags)) for name, flags in regressions))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+Compare CPU time and memory of multipart uploads with memory-mapped part bodies against parts read into memory.
+
+Every mode uploads the same file with upload_file in a fresh subprocess, against the local stand-in server running
+in this process, so the peak RSS of the client is measured on its own. Unix only.
+
+    python benchmarks/bench_part_source.py --size-mb 1024 --chunk-mb 16 --workers 8
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from benchutil import print_table
+from fake_server import FakeSyncSketchServer
+
+# Peak RSS counts mapped file pages, which are page cache the kernel can drop at any time. The private (anonymous)
+# memory of the process is sampled from /proc on Linux, where it is available.
+CHILD_SCRIPT = """
+import json, resource, sys, threading, time
+sys.path.insert(0, %(root)r)
+import syncsketch.uploads
+from syncsketch import SyncSketchAPI
+
+def rss_anon_kb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("RssAnon:"):
+                    return int(line.split()[1])
+    except (IOError, OSError):
+        pass
+    return 0
+
+peak_anon = [rss_anon_kb()]
+done = threading.Event()
+
+def sample():
+    while not done.wait(0.005):
+        peak_anon[0] = max(peak_anon[0], rss_anon_kb())
+
+syncsketch.uploads.USE_MMAP = %(use_mmap)r
+api = SyncSketchAPI("bench", "bench-key", host=%(host)r, use_header_auth=True)
+
+sampler = threading.Thread(target=sample)
+sampler.daemon = True
+sampler.start()
+
+start = time.perf_counter()
+result = api.upload_file(1, %(path)r, chunk_size=%(chunk_size)d, max_workers=%(workers)d)
+wall = time.perf_counter() - start
+done.set()
+sampler.join()
+
+usage = resource.getrusage(resource.RUSAGE_SELF)
+print(json.dumps({"ok": result is not None, "wall_s": wall, "cpu_s": usage.ru_utime + usage.ru_stime,
+                  "max_rss_kb": usage.ru_maxrss, "peak_anon_kb": peak_anon[0]}))
+"""
+
+
+def run_mode(server, path, use_mmap, chunk_size, workers):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    script = CHILD_SCRIPT % dict(
+        root=root, use_mmap=use_mmap, host=server.url, path=path, chunk_size=chunk_size, workers=workers
+    )
+    output = subprocess.check_output([sys.executable, "-c", script])
+    result = json.loads(output.decode("utf-8").strip().splitlines()[-1])
+    if not result["ok"]:
+        raise RuntimeError("upload_file failed")
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=512)
+    parser.add_argument("--chunk-mb", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    with tempfile.NamedTemporaryFile(suffix=".mp4", delete=False) as f:
+        block = os.urandom(1024 * 1024)
+        for _ in range(args.size_mb):
+            f.write(block)
+
+    rows = []
+    try:
+        with FakeSyncSketchServer(num_items=0) as server:
+            for name, use_mmap in (("buffered", False), ("mmap", True)):
+                results = [
+                    run_mode(server, f.name, use_mmap, args.chunk_mb * 1024 * 1024, args.workers)
+                    for _ in range(args.repeat)
+                ]
+                best = min(results, key=lambda result: result["cpu_s"])
+                rows.append(
+                    {
+                        "name": name,
+                        "cpu_s": best["cpu_s"],
+                        "max_rss_mb": max(result["max_rss_kb"] for result in results) / 1024.0,
+                        "peak_anon_mb": max(result["peak_anon_kb"] for result in results) / 1024.0,
+                        "mb_per_s": args.size_mb / best["wall_s"],
+                        "wall_s": best["wall_s"],
+                    }
+                )
+    finally:
+        os.remove(f.name)
+
+    print_table(rows)
+    return rows
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+Compare the memory and conversion time of listing rows as dicts and as syncsketch.records records.
+
+The "realistic" rows have creators with database sized ids, which json decodes to a new int object every time.
+
+    python benchmarks/bench_records.py --rows 200000 --creators 50
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+
+import benchutil
+from bench_overhead import make_item
+
+from syncsketch.records import to_records
+
+
+def measure(fn):
+    """
+    Return (seconds per run, bytes still allocated by the result). Timed without tracemalloc, which slows it down.
+    """
+    gc.collect()
+    start = time.perf_counter()
+    fn()
+    wall = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = fn()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return wall, current
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--creators", type=int, default=50, help="distinct creators of the realistic rows")
+    args = parser.parse_args(argv)
+
+    def realistic_item(item_id):
+        item = make_item(item_id)
+        creator_id = 104729 + item_id % args.creators
+        item["creator"] = {"id": creator_id, "name": "Artist %d" % creator_id, "email": "%d@example.com" % creator_id}
+        return item
+
+    rows = []
+    for dataset, make_row in (("", make_item), ("realistic_", realistic_item)):
+        raw = json.dumps([make_row(i) for i in range(args.rows)])
+        for name, fn in (("dicts", lambda: json.loads(raw)), ("records", lambda: to_records(json.loads(raw)))):
+            wall, memory = measure(fn)
+            rows.append(
+                {"name": dataset + name, "mb": memory / 1e6, "bytes_per_row": memory / args.rows, "wall_s": wall}
+            )
+
+    benchutil.print_table(rows)
+    return rows
+
+
+if __name__ == "__main__":
+    main()
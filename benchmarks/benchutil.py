@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Shared helpers for the benchmark scripts.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import json
+import math
+import os
+import sys
+import time
+
+# make the in-tree package importable when running the scripts from a checkout
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def percentile(values, pct):
+    """
+    Nearest-rank percentile of `values`.
+
+    :param list[float] values: Samples
+    :param float pct: Percentile between 0 and 100
+    :rtype: float
+    """
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    rank = int(math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[max(0, min(len(ordered), rank) - 1)]
+
+
+def summarize(name, latencies, wall_time, num_bytes=None, ops=None):
+    """
+    Build a result row from per-operation latencies.
+
+    :param str name: Benchmark name
+    :param list[float] latencies: Per-operation durations in seconds
+    :param float wall_time: Total wall time in seconds
+    :param int num_bytes: (Optional) Bytes transferred, adds a MB/s column
+    :param int ops: (Optional) Number of operations, defaults to len(latencies)
+    :rtype: dict
+    """
+    ops = len(latencies) if ops is None else ops
+    result = {
+        "name": name,
+        "ops": ops,
+        "wall_s": wall_time,
+        "ops_per_s": ops / wall_time if wall_time else float("nan"),
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+    if num_bytes is not None:
+        result["mb_per_s"] = num_bytes / wall_time / (1024 * 1024) if wall_time else float("nan")
+    return result
+
+
+def timed(fn, *args, **kwargs):
+    """
+    Call `fn` and return (result, duration in seconds).
+    """
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def print_table(rows):
+    columns = ["name", "ops", "ops_per_s", "p50_ms", "p99_ms", "mb_per_s", "wall_s"]
+    extra = sorted(set(column for row in rows for column in row) - set(columns))
+    columns = [column for column in columns if any(column in row for row in rows)] + extra
+    print("  ".join("%18s" % column for column in columns))
+    for row in rows:
+        cells = []
+        for column in columns:
+            value = row.get(column, "")
+            cells.append("%18.2f" % value if isinstance(value, float) else "%18s" % value)
+        print("  ".join(cells))
+
+
+def write_json(rows, path):
+    with open(path, "w") as f:
+        json.dump(rows, f, indent=2, sort_keys=True)
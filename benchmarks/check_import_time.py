@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+Check that importing the client stays cheap, with ``python -X importtime`` in fresh interpreters.
+
+For every scenario it reports the import time spent after interpreter startup and fails (exit code 1) when it is
+over the budget, or when a module that should only load on first use was imported.
+
+    python benchmarks/check_import_time.py
+    python benchmarks/check_import_time.py --runs 10 --budget-scale 2
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+import benchutil
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# modules that load on first use, never on import or for a simple call with a custom transport
+DEFERRED = ["requests", "urllib3", "concurrent.futures", "opentelemetry", "mimetypes", "orjson", "ujson", "json"]
+
+STUB_TRANSPORT = """
+class StubResponse(object):
+    status_code = 200
+    ok = True
+    content = b"{}"
+
+class StubTransport(object):
+    def request(self, method, url, **kwargs):
+        return StubResponse()
+"""
+
+# name, code, budget in milliseconds, deferred modules that must not be imported
+SCENARIOS = [
+    ("import_package", "import syncsketch", 5, DEFERRED + ["syncsketch.syncsketch"]),
+    ("import_client", "from syncsketch import SyncSketchAPI", 40, DEFERRED),
+    (
+        "is_connected",
+        STUB_TRANSPORT
+        + "from syncsketch import SyncSketchAPI\n"
+        + "SyncSketchAPI('user', 'key', transport=StubTransport()).is_connected()",
+        40,
+        DEFERRED,
+    ),
+]
+
+MARKER = "--- syncsketch import check ---"
+
+PROLOGUE = "import sys\nbefore = set(sys.modules)\nsys.stderr.write(%r + '\\n')\n" % MARKER
+EPILOGUE = "\nnew_modules = sorted(set(sys.modules) - before)\nimport json\nprint(json.dumps(new_modules))\n"
+
+
+def run_scenario(code):
+    """
+    Run `code` in a fresh interpreter, return (import milliseconds after startup, names of newly imported modules).
+    """
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROLOGUE + code + EPILOGUE],
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    stderr = process.stderr.split(MARKER, 1)[1]
+
+    total_us = 0
+    for line in stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package", nested imports are indented
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|", 2)
+        if cumulative.strip().isdigit() and not name[1:].startswith(" "):
+            total_us += int(cumulative)
+    new_modules = set(json.loads(process.stdout.strip().splitlines()[-1]))
+    return total_us / 1000.0, new_modules
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per scenario, the fastest counts")
+    parser.add_argument("--budget-scale", type=float, default=1.0, help="multiply the budgets, for slow machines")
+    args = parser.parse_args(argv)
+
+    rows = []
+    failed = False
+    for name, code, budget_ms, deferred in SCENARIOS:
+        runs = [run_scenario(code) for _ in range(args.runs)]
+        import_ms = min(ms for ms, _ in runs)
+        loaded = sorted(
+            module
+            for module in set.union(*(modules for _, modules in runs))
+            if any(module == prefix or module.startswith(prefix + ".") for prefix in deferred)
+        )
+        budget_ms *= args.budget_scale
+        ok = import_ms <= budget_ms and not loaded
+        failed = failed or not ok
+        rows.append(
+            {
+                "name": name,
+                "import_ms": import_ms,
+                "budget_ms": budget_ms,
+                "deferred_loaded": ",".join(loaded) or "-",
+                "result": "ok" if ok else "FAIL",
+            }
+        )
+
+    benchutil.print_table(rows)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,395 @@
+# -*- coding: utf-8 -*-
+"""
+Local stand-in for the SyncSketch server, built on the standard library only.
+
+It implements the endpoints the python client talks to closely enough to benchmark it: paginated ``/api/v1/*``
+listings and details, item creation, the ``/uploads/*`` multipart upload flow, a fake S3 target for the signed
+part urls and the ``downloads/*`` celery task endpoints. Latency, bandwidth and errors can be injected.
+
+.. code:: python
+
+    from fake_server import FakeSyncSketchServer
+
+    with FakeSyncSketchServer(latency=0.02, bandwidth=50 * 1024 * 1024) as server:
+        s = SyncSketchAPI("user", "key", host=server.url, use_header_auth=True)
+        s.get_projects()
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import gzip
+import hashlib
+import itertools
+import json
+import random
+import re
+import threading
+import time
+import uuid
+
+try:
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from urllib.parse import parse_qs, urlsplit
+except ImportError:
+    raise ImportError("The benchmark suite requires Python 3.7+")
+
+LISTING_ENTITIES = ("account", "project", "review", "item", "frame", "simpleperson")
+
+
+class _Route(object):
+    def __init__(self, method, pattern, handler):
+        self.method = method
+        self.pattern = re.compile("^" + pattern + "$")
+        self.handler = handler
+
+
+class FakeSyncSketchServer(object):
+    """
+    Threaded fake SyncSketch server.
+
+    :param float latency: Seconds to wait before answering each request
+    :param int bandwidth: Bytes per second per connection for request and response bodies, None for unlimited
+    :param float error_rate: Probability to answer a request with a 500 error
+    :param tuple error_paths: Path prefixes error injection applies to, e.g. ("/s3/",), None for all paths
+    :param int task_polls: Number of status checks a celery task stays in "processing"
+    :param int num_items: Number of items pre-populated for listings
+    :param int seed: Seed for the error injection
+    :param bool compress_responses: Gzip JSON responses of at least 1KB when the client accepts gzip
+    """
+
+    def __init__(
+        self,
+        latency=0.0,
+        bandwidth=None,
+        error_rate=0.0,
+        error_paths=("/s3/",),
+        task_polls=1,
+        num_items=1000,
+        seed=None,
+        compress_responses=False,
+        host="127.0.0.1",
+        port=0,
+    ):
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.error_rate = error_rate
+        self.error_paths = error_paths
+        self.task_polls = task_polls
+        self.random = random.Random(seed)
+        self.compress_responses = compress_responses
+
+        self.lock = threading.Lock()
+        self.ids = itertools.count(1)
+        self.objects = dict((entity, {}) for entity in LISTING_ENTITIES)
+        self.uploads = {}
+        self.tasks = {}
+        self.request_count = 0
+        # body bytes on the wire, after compression
+        self.bytes_received = 0
+        self.bytes_sent = 0
+
+        for _ in range(num_items):
+            self.create_object("item", {"name": "shot_%04d.mov" % len(self.objects["item"]), "status": "done"})
+
+        self.routes = [
+            _Route("GET", r"/api/v1/person/connected/", self.handle_connected),
+            _Route("GET", r"/api/v1/person/tree/", self.handle_tree),
+            _Route("GET", r"/api/v1/(\w+)/", self.handle_list),
+            _Route("GET", r"/api/v1/(\w+)/(\d+)/", self.handle_detail),
+            _Route("POST", r"/api/v1/(\w+)/", self.handle_create),
+            _Route("PATCH", r"/api/v1/(\w+)/(\d+)/", self.handle_update),
+            _Route("POST", r"/api/v2/bulk-delete-items/", self.handle_bulk_delete),
+            _Route("POST", r"/api/v2/move-review-items/", self.handle_move_items),
+            _Route("PUT", r"/api/v2/review/(\d+)/sort_items/", self.handle_sort_items),
+            _Route("POST", r"/api/v2/add-users/", self.handle_add_users),
+            _Route("POST", r"/uploads/stats/upload-start/", self.handle_upload_start),
+            _Route("POST", r"/uploads/multipart-upload/", self.handle_multipart_init),
+            _Route("GET", r"/uploads/multipart-upload/([^/]+)/sign-part/(\d+)/", self.handle_sign_part),
+            _Route("POST", r"/uploads/multipart-upload/([^/]+)/complete/", self.handle_multipart_complete),
+            _Route("POST", r"/uploads/multipart-upload/([^/]+)/abort/", self.handle_multipart_abort),
+            _Route("PUT", r"/s3/([^/]+)/(\d+)", self.handle_s3_put),
+            _Route("GET", r"/s3/files/([^/]+)", self.handle_s3_get),
+            _Route("POST", r"/api/v2/downloads/(flattenedSketches|greasePencil)/(\d+)/(\d+)/", self.handle_task_start),
+            _Route("GET", r"/api/v2/downloads/(flattenedSketches|greasePencil)/([^/]+)/", self.handle_task_status),
+        ]
+
+        server = self
+
+        class Handler(_RequestHandler):
+            fake = server
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return "http://%s:%s" % (host, port)
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.thread:
+            self.thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    """
+    State helpers
+    """
+
+    def create_object(self, entity, data):
+        with self.lock:
+            object_id = next(self.ids)
+            obj = {
+                "id": object_id,
+                "uuid": str(uuid.uuid4()),
+                "resource_uri": "/api/v1/%s/%s/" % (entity, object_id),
+                "created": "2024-01-01T00:00:00",
+                "active": True,
+            }
+            obj.update(data)
+            self.objects.setdefault(entity, {})[object_id] = obj
+        return obj
+
+    def should_fail(self, path):
+        if not self.error_rate:
+            return False
+        if self.error_paths is not None and not any(path.startswith(prefix) for prefix in self.error_paths):
+            return False
+        with self.lock:
+            return self.random.random() < self.error_rate
+
+    """
+    Handlers, each returns (status, body, headers)
+    """
+
+    def handle_connected(self, request):
+        return 200, {"connected": True}, None
+
+    def handle_tree(self, request):
+        items = list(self.objects["item"].values())
+        tree = [{"id": 1, "name": "Workspace", "projects": [{"id": 1, "name": "Project", "reviews": []}]}]
+        if request.query.get("fetchItems"):
+            tree[0]["projects"][0]["reviews"].append({"id": 1, "name": "Review", "items": items})
+        return 200, tree, None
+
+    def handle_list(self, request, entity):
+        with self.lock:
+            objects = sorted(self.objects.get(entity, {}).values(), key=lambda obj: obj["id"])
+        limit = int(request.query.get("limit", 20))
+        offset = int(request.query.get("offset", 0))
+        page = objects[offset : offset + limit]
+        next_url = None
+        if offset + limit < len(objects):
+            next_url = "/api/v1/%s/?limit=%s&offset=%s" % (entity, limit, offset + limit)
+        meta = {"limit": limit, "offset": offset, "total_count": len(objects), "next": next_url}
+        return 200, {"meta": meta, "objects": [self.project_fields(request, obj) for obj in page]}, None
+
+    def handle_detail(self, request, entity, object_id):
+        obj = self.objects.get(entity, {}).get(int(object_id))
+        if obj is None:
+            return 404, {"error": "not found"}, None
+        return 200, self.project_fields(request, obj), None
+
+    @staticmethod
+    def project_fields(request, obj):
+        fields = request.query.get("fields")
+        if not fields:
+            return obj
+        return dict((field, obj[field]) for field in fields.split(",") if field in obj)
+
+    def handle_create(self, request, entity):
+        return 201, self.create_object(entity, request.json() or {}), None
+
+    def handle_update(self, request, entity, object_id):
+        obj = self.objects.get(entity, {}).get(int(object_id))
+        if obj is None:
+            return 404, {"error": "not found"}, None
+        with self.lock:
+            obj.update(request.json() or {})
+        return 202, obj, None
+
+    def handle_bulk_delete(self, request):
+        item_ids = (request.json() or {}).get("item_ids", [])
+        with self.lock:
+            for item_id in item_ids:
+                obj = self.objects["item"].get(item_id)
+                if obj:
+                    obj["active"] = False
+        return 200, {"deleted": len(item_ids)}, None
+
+    def handle_move_items(self, request):
+        return 200, {"moved": len((request.json() or {}).get("item_data", []))}, None
+
+    def handle_sort_items(self, request, review_id):
+        return 200, {"updated_items": len((request.json() or {}).get("items", []))}, None
+
+    def handle_add_users(self, request):
+        users = json.loads((request.json() or {}).get("users") or "[]")
+        return 200, {"added": len(users)}, None
+
+    def handle_upload_start(self, request):
+        data = request.json() or {}
+        item = self.create_object("item", {"name": data.get("item_name"), "status": "uploading"})
+        return 200, {"item_id": item["id"], "item_uuid": item["uuid"]}, None
+
+    def handle_multipart_init(self, request):
+        upload_id = uuid.uuid4().hex
+        with self.lock:
+            self.uploads[upload_id] = {"parts": {}, "status": "uploading"}
+        return 200, {"uploadId": upload_id, "key": "uploads/%s" % upload_id}, None
+
+    def handle_sign_part(self, request, upload_id, part_number):
+        if upload_id not in self.uploads:
+            return 404, {"error": "unknown upload"}, None
+        return 200, {"url": "%s/s3/%s/%s" % (self.url, upload_id, part_number)}, None
+
+    def handle_s3_put(self, request, upload_id, part_number):
+        upload = self.uploads.get(upload_id)
+        if upload is None:
+            return 404, b"NoSuchUpload", None
+        etag = '"%s"' % hashlib.md5(request.body).hexdigest()
+        with self.lock:
+            upload["parts"][int(part_number)] = len(request.body)
+        return 200, b"", {"ETag": etag}
+
+    def handle_s3_get(self, request, name):
+        return 200, b"\0" * 1024 * 1024, {"Content-Type": "application/zip"}
+
+    def handle_multipart_complete(self, request, upload_id):
+        upload = self.uploads.get(upload_id)
+        parts = (request.json() or {}).get("parts", [])
+        if upload is None or len(parts) != len(upload["parts"]):
+            return 400, {"error": "part mismatch"}, None
+        upload["status"] = "done"
+        return 200, {"status": "done"}, None
+
+    def handle_multipart_abort(self, request, upload_id):
+        with self.lock:
+            self.uploads.pop(upload_id, None)
+        return 200, {"status": "aborted"}, None
+
+    def handle_task_start(self, request, task_type, review_id, item_id):
+        task_id = str(uuid.uuid4())
+        with self.lock:
+            self.tasks[task_id] = {"type": task_type, "polls": 0}
+        return 200, task_id, None
+
+    def handle_task_status(self, request, task_type, task_id):
+        task = self.tasks.get(task_id)
+        if task is None:
+            return 404, {"status": "failed"}, None
+        with self.lock:
+            task["polls"] += 1
+            done = task["polls"] > self.task_polls
+        if not done:
+            return 200, {"status": "processing"}, None
+        if task_type == "greasePencil":
+            data = {"fileName": task_id, "s3Path": "%s/s3/files/%s.zip" % (self.url, task_id)}
+        else:
+            data = [{"url": "%s/s3/files/%s.png" % (self.url, task_id)}]
+        return 200, {"status": "done", "data": data}, None
+
+
+class _Request(object):
+    def __init__(self, method, path, query, headers, body):
+        self.method = method
+        self.path = path
+        self.query = query
+        self.headers = headers
+        self.body = body
+
+    def json(self):
+        if not self.body:
+            return None
+        return json.loads(self.body.decode("utf-8"))
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    fake = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        chunks = []
+        while length > 0:
+            chunk = self.rfile.read(min(length, 64 * 1024))
+            if not chunk:
+                break
+            chunks.append(chunk)
+            length -= len(chunk)
+            self._throttle(len(chunk))
+        return b"".join(chunks)
+
+    def _throttle(self, num_bytes):
+        if self.fake.bandwidth:
+            time.sleep(num_bytes / self.fake.bandwidth)
+
+    def _write_body(self, body):
+        view = memoryview(body)
+        for offset in range(0, len(view), 64 * 1024):
+            chunk = view[offset : offset + 64 * 1024]
+            self.wfile.write(chunk)
+            self._throttle(len(chunk))
+
+    def _handle(self):
+        fake = self.fake
+        url = urlsplit(self.path)
+        query = dict((key, values[-1]) for key, values in parse_qs(url.query).items())
+        body = self._read_body()
+        with fake.lock:
+            fake.request_count += 1
+            fake.bytes_received += len(body)
+
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        request = _Request(self.command, url.path, query, self.headers, body)
+
+        if fake.latency:
+            time.sleep(fake.latency)
+
+        status, body, headers = 404, {"error": "no route"}, None
+        if fake.should_fail(url.path):
+            status, body = 500, {"error": "injected failure"}
+        else:
+            for route in fake.routes:
+                match = route.pattern.match(url.path)
+                if route.method == self.command and match:
+                    status, body, headers = route.handler(request, *match.groups())
+                    break
+
+        headers = dict(headers or {})
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode("utf-8")
+            headers.setdefault("Content-Type", "application/json")
+            accepted = [encoding.strip() for encoding in self.headers.get("Accept-Encoding", "").split(",")]
+            if fake.compress_responses and "gzip" in accepted and len(body) >= 1024:
+                body = gzip.compress(body, 6)
+                headers["Content-Encoding"] = "gzip"
+
+        with fake.lock:
+            fake.bytes_sent += len(body)
+
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self._write_body(body)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _handle
@@ -6,7 +6,28 @@
 
 from __future__ import absolute_import
 
-from .syncsketch import SyncSketchAPI
+import sys
+
+if sys.version_info >= (3, 7):
+    # the client module is loaded on first access of syncsketch.SyncSketchAPI, so importing the package, e.g. for
+    # __version__ or a submodule, stays cheap when DCC tools load it at startup
+
+    def __getattr__(name):
+        if name == "SyncSketchAPI":
+            from .syncsketch import SyncSketchAPI
+
+            return SyncSketchAPI
+        if name == "syncsketch":
+            import importlib
+
+            return importlib.import_module(".syncsketch", __name__)
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+    def __dir__():
+        return sorted(set(globals()) | {"SyncSketchAPI", "syncsketch"})
+
+else:
+    from .syncsketch import SyncSketchAPI
 
 __version__ = "1.0.11.2"
 __author__ = "SyncSketch Dev Team"
@@ -0,0 +1,629 @@
+# -*- coding: utf-8 -*-
+"""
+Local upload agent, so short lived processes such as render farm tasks can hand off uploads and exit.
+
+The agent is a long running process that owns one warm :class:`syncsketch.SyncSketchAPI` with pooled connections.
+It accepts upload and update jobs over a Unix socket, or a localhost port where there are no Unix sockets, runs at
+most ``--jobs`` of them at a time within one bandwidth limit, and keeps their results so callers can check later.
+
+Start the agent, credentials can also come from SYNCSKETCH_USER and SYNCSKETCH_API_KEY:
+
+.. code:: bash
+
+    python -m syncsketch.agent --user artist@example.com --api-key KEY --jobs 4 --upload-rate 50000000
+
+Hand off a job from the farm task:
+
+.. code:: python
+
+    from syncsketch.agent import AgentClient
+
+    agent = AgentClient()
+    job_id = agent.submit("upload_file", review_id, "/mnt/renders/sh010_comp_v003.mov")
+
+    # later, from anywhere on the same machine
+    job = agent.status(job_id)
+    print(job["status"], job["result"] or job["error"])
+
+On a TCP address every request has to carry a token. The agent generates one at startup unless ``--token`` is
+given, and writes it to a file in ~/.syncsketch that only the current user can read, where AgentClient finds it.
+
+Jobs are kept in memory only, they are lost when the agent stops. See :mod:`syncsketch.uploadqueue` for jobs that
+survive restarts.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import binascii
+import hmac
+import json
+import os
+import re
+import socket
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+
+try:
+    # Python 3
+    import socketserver
+    from queue import Empty, Queue
+except ImportError:
+    # Python 2
+    import SocketServer as socketserver
+    from Queue import Empty, Queue
+
+# client methods that can run as jobs
+JOB_METHODS = ("upload_file", "add_media", "add_media_v2", "add_item", "update_item", "update_review")
+
+# job methods whose second argument is a local file path
+FILE_METHODS = ("upload_file", "add_media", "add_media_v2")
+
+CONFIG_DIR = os.path.join(os.path.expanduser("~"), ".syncsketch")
+DEFAULT_SOCKET = os.path.join(CONFIG_DIR, "agent.sock")
+DEFAULT_PORT = 38573
+
+# longest accepted request line
+MAX_MESSAGE_SIZE = 1024 * 1024
+
+_TCP_ADDRESS = re.compile(r"^([\w.\-]+):(\d+)$")
+
+
+def default_address():
+    """
+    Return the default agent address, a Unix socket in ~/.syncsketch, or a localhost port on Windows.
+    """
+    if hasattr(socket, "AF_UNIX"):
+        return DEFAULT_SOCKET
+    return ("127.0.0.1", DEFAULT_PORT)
+
+
+def parse_address(address):
+    """
+    Return a Unix socket path or a (host, port) tuple.
+
+    :param address: Socket path, "host:port" or (host, port), the default address when None
+    """
+    if address is None:
+        return default_address()
+    if isinstance(address, (tuple, list)):
+        return (address[0], int(address[1]))
+    match = _TCP_ADDRESS.match(address)
+    if match:
+        return (match.group(1), int(match.group(2)))
+    return os.path.expanduser(address)
+
+
+def token_path(address):
+    """
+    Return the file the agent on a TCP address writes its generated token to.
+
+    :param tuple address: (host, port)
+    :rtype: str
+    """
+    return os.path.join(CONFIG_DIR, "agent-{}.token".format(address[1]))
+
+
+def read_token(address):
+    """
+    Return the token of the agent on a TCP address, None if it has no token file or it can not be read.
+
+    :param tuple address: (host, port)
+    :rtype: Optional[str]
+    """
+    try:
+        with open(token_path(address)) as f:
+            return f.read().strip() or None
+    except (IOError, OSError):
+        return None
+
+
+def _write_token(path, token):
+    directory = os.path.dirname(path)
+    if not os.path.isdir(directory):
+        os.makedirs(directory, 0o700)
+    # readable by the current user only, also when the file is left over from an earlier agent
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        os.chmod(path, 0o600)
+        os.write(fd, token.encode("utf-8"))
+    finally:
+        os.close(fd)
+
+
+def _json_default(value):
+    # raw responses and other objects that are not JSON
+    status_code = getattr(value, "status_code", None)
+    if status_code is not None:
+        return {"status_code": status_code}
+    return str(value)
+
+
+def _encode(message):
+    return (json.dumps(message, default=_json_default) + "\n").encode("utf-8")
+
+
+class UploadAgent(object):
+    """
+    Runs upload and update jobs of one API client in background threads and serves them to other processes.
+    """
+
+    def __init__(self, api, address=None, max_jobs=4, token=None, keep_finished=1000):
+        """
+        :param syncsketch.SyncSketchAPI api: API client that runs the jobs
+        :param address: (Optional) Socket path, "host:port" or (host, port) to listen on, see default_address
+        :param int max_jobs: (Optional) Maximum number of jobs running at the same time
+        :param str token: (Optional) Secret that every request has to send. Always required on a TCP address, a
+            generated one is written to token_path(address) when omitted
+        :param int keep_finished: (Optional) Number of finished jobs kept for status requests
+        """
+        self.api = api
+        self.address = parse_address(address)
+        self.max_jobs = max_jobs
+        self.token = token
+        self.keep_finished = keep_finished
+
+        # any local user, and any web page through the browser, can connect to a localhost port
+        self.token_file = None
+        if isinstance(self.address, tuple) and token is None:
+            self.token = binascii.hexlify(os.urandom(32)).decode("ascii")
+            self.token_file = token_path(self.address)
+
+        self._lock = threading.Lock()
+        # job id -> job, in submission order
+        self._jobs = OrderedDict()
+        self._queue = Queue()
+        self._workers = []
+        self._server = None
+        self._server_thread = None
+
+    """
+    Jobs
+    """
+
+    def submit(self, method, args=(), kwargs=None):
+        """
+        Queue a job.
+
+        :param str method: Client method, one of JOB_METHODS
+        :param list args: (Optional) Positional arguments of the method
+        :param dict kwargs: (Optional) Keyword arguments of the method
+        :return: Job id
+        :rtype: str
+        """
+        if method not in JOB_METHODS:
+            raise ValueError("{!r} can not run as a job, expected one of {}".format(method, ", ".join(JOB_METHODS)))
+
+        job_id = uuid.uuid4().hex
+        job = {
+            "id": job_id,
+            "method": method,
+            "args": list(args),
+            "kwargs": dict(kwargs or {}),
+            "status": "pending",
+            "result": None,
+            "error": None,
+            "submitted": time.time(),
+            "started": None,
+            "finished": None,
+        }
+        with self._lock:
+            self._jobs[job_id] = job
+        self._start_workers()
+        self._queue.put(job_id)
+        return job_id
+
+    def status(self, job_id):
+        """
+        Return a copy of a job, None if it is unknown.
+
+        :param str job_id: Job id
+        :rtype: Optional[dict]
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def jobs(self, status=None):
+        """
+        Return copies of all kept jobs, optionally only those with a status.
+
+        :param str status: (Optional) "pending", "running", "done" or "failed"
+        :rtype: list[dict]
+        """
+        with self._lock:
+            return [dict(job) for job in self._jobs.values() if status is None or job["status"] == status]
+
+    def _start_workers(self):
+        with self._lock:
+            while len(self._workers) < self.max_jobs:
+                worker = threading.Thread(target=self._work, name="syncsketch-agent-%d" % len(self._workers))
+                worker.daemon = True
+                worker.start()
+                self._workers.append(worker)
+
+    def _work(self):
+        while True:
+            job_id = self._queue.get()
+            if job_id is None:
+                return
+            self._run(job_id)
+
+    def _run(self, job_id):
+        with self._lock:
+            job = self._jobs[job_id]
+            job["status"] = "running"
+            job["started"] = time.time()
+
+        result = error = None
+        try:
+            result = getattr(self.api, job["method"])(*job["args"], **job["kwargs"])
+            if result is None or result is False:
+                # client methods print the reason and return None or False on failure
+                error = "{} failed".format(job["method"])
+        except Exception as e:
+            if self.api.debug:
+                traceback.print_exc()
+            error = "{}: {}".format(type(e).__name__, e)
+
+        with self._lock:
+            job["status"] = "failed" if error else "done"
+            job["result"] = result
+            job["error"] = error
+            job["finished"] = time.time()
+            self._prune()
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job["finished"] is not None]
+        for job_id in finished[: max(0, len(finished) - self.keep_finished)]:
+            del self._jobs[job_id]
+
+    """
+    Server
+    """
+
+    def handle(self, message):
+        """
+        Answer one request message.
+
+        :param dict message: {"op": "ping" | "submit" | "status" | "jobs" | "shutdown", ...}
+        :rtype: dict
+        """
+        if self.token is not None:
+            try:
+                valid = hmac.compare_digest(message.get("token").encode("utf-8"), self.token.encode("utf-8"))
+            except AttributeError:
+                # no token, or not a string
+                valid = False
+            if not valid:
+                return {"ok": False, "error": "invalid token"}
+
+        op = message.get("op")
+        if op == "ping":
+            return {"ok": True, "pid": os.getpid()}
+        if op == "submit":
+            try:
+                job_id = self.submit(message.get("method"), message.get("args") or (), message.get("kwargs"))
+            except ValueError as e:
+                return {"ok": False, "error": str(e)}
+            return {"ok": True, "job_id": job_id}
+        if op == "status":
+            job = self.status(message.get("job_id"))
+            if job is None:
+                return {"ok": False, "error": "unknown job"}
+            return {"ok": True, "job": job}
+        if op == "jobs":
+            return {"ok": True, "jobs": self.jobs(message.get("status"))}
+        if op == "shutdown":
+            # answer first, the server can not shut down from its own request thread
+            threading.Thread(target=self.shutdown).start()
+            return {"ok": True}
+        return {"ok": False, "error": "unknown op {!r}".format(op)}
+
+    def start(self):
+        """
+        Listen in a background thread.
+
+        :return: self
+        """
+        self._server = self._make_server()
+        if self.token_file is not None:
+            _write_token(self.token_file, self.token)
+        self._server_thread = threading.Thread(target=self._server.serve_forever, name="syncsketch-agent-server")
+        self._server_thread.daemon = True
+        self._server_thread.start()
+        return self
+
+    def serve_forever(self):
+        """
+        Listen until shutdown is requested or the process is interrupted.
+        """
+        self.start()
+        try:
+            while self._server_thread.is_alive():
+                self._server_thread.join(1)
+        except KeyboardInterrupt:
+            self.shutdown()
+
+    def shutdown(self, wait=True):
+        """
+        Stop listening and stop the workers after their current jobs. Pending jobs are not run, they fail with
+        a "cancelled" error.
+
+        :param bool wait: (Optional) Wait for running jobs to finish
+        """
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            if not isinstance(self.address, tuple) and os.path.exists(self.address):
+                os.remove(self.address)
+            if self.token_file is not None and os.path.exists(self.token_file):
+                os.remove(self.token_file)
+
+        with self._lock:
+            workers, self._workers = self._workers, []
+
+        # take the pending jobs off the queue, otherwise the workers would run them before they reach the sentinels
+        cancelled = []
+        sentinels = 0
+        while True:
+            try:
+                job_id = self._queue.get_nowait()
+            except Empty:
+                break
+            if job_id is None:
+                # left by an earlier shutdown for workers that are still busy
+                sentinels += 1
+            else:
+                cancelled.append(job_id)
+        with self._lock:
+            for job_id in cancelled:
+                job = self._jobs.get(job_id)
+                if job is not None:
+                    job["status"] = "failed"
+                    job["error"] = "cancelled, the agent was shut down"
+                    job["finished"] = time.time()
+            self._prune()
+
+        for _ in range(sentinels + len(workers)):
+            self._queue.put(None)
+        if wait:
+            for worker in workers:
+                if worker is not threading.current_thread():
+                    worker.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
+
+    def _make_server(self):
+        agent = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                while True:
+                    line = self.rfile.readline(MAX_MESSAGE_SIZE + 1)
+                    if not line:
+                        return
+                    if len(line) > MAX_MESSAGE_SIZE:
+                        self.wfile.write(_encode({"ok": False, "error": "message too large"}))
+                        return
+                    try:
+                        message = json.loads(line.decode("utf-8"))
+                    except ValueError:
+                        message = None
+                    if not isinstance(message, dict):
+                        # not a client of ours, e.g. an HTTP request from a browser, don't read any further
+                        return
+                    self.wfile.write(_encode(agent.handle(message)))
+
+        if isinstance(self.address, tuple):
+
+            class Server(socketserver.ThreadingMixIn, socketserver.TCPServer):
+                daemon_threads = True
+                allow_reuse_address = True
+
+            return Server(self.address, Handler)
+
+        directory = os.path.dirname(self.address)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory, 0o700)
+        if os.path.exists(self.address):
+            if AgentClient(self.address).ping():
+                raise RuntimeError("An agent is already listening on {}".format(self.address))
+            # left over from an agent that did not shut down
+            os.remove(self.address)
+
+        class UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+            daemon_threads = True
+
+        # only the current user may connect
+        umask = os.umask(0o177)
+        try:
+            return UnixServer(self.address, Handler)
+        finally:
+            os.umask(umask)
+
+
+class AgentClient(object):
+    """
+    Talks to a running UploadAgent. Like the API client, failed calls print the reason and return None.
+    """
+
+    def __init__(self, address=None, token=None, timeout=10):
+        """
+        :param address: (Optional) Agent address, see UploadAgent
+        :param str token: (Optional) Secret the agent was started with, read from token_path(address) on a TCP
+            address when omitted
+        :param float timeout: (Optional) Socket timeout in seconds
+        """
+        self.address = parse_address(address)
+        self.token = token
+        self.timeout = timeout
+
+    def _request(self, message, quiet=False):
+        token = self.token
+        if token is None and isinstance(self.address, tuple):
+            # read on every request, the agent writes a new token whenever it starts
+            token = read_token(self.address)
+        if token is not None:
+            message = dict(message, token=token)
+
+        family = socket.AF_INET if isinstance(self.address, tuple) else socket.AF_UNIX
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.address)
+            sock.sendall(_encode(message))
+            f = sock.makefile("rb")
+            try:
+                line = f.readline()
+            finally:
+                f.close()
+            response = json.loads(line.decode("utf-8")) if line else {"ok": False, "error": "no response"}
+        except (socket.error, ValueError) as e:
+            if not quiet:
+                print("SyncSketch agent at {} is not available: {}".format(self.address, e))
+            return None
+        finally:
+            sock.close()
+
+        if not response.get("ok"):
+            if not quiet:
+                print("SyncSketch agent error: {}".format(response.get("error")))
+            return None
+        return response
+
+    def ping(self):
+        """
+        :return: True if an agent is listening
+        :rtype: bool
+        """
+        return self._request({"op": "ping"}, quiet=True) is not None
+
+    def submit(self, method, *args, **kwargs):
+        """
+        Queue a client method call on the agent, e.g. ``submit("upload_file", review_id, filepath)``.
+        Relative file paths are resolved here, the agent runs in another directory.
+
+        :param str method: Client method, one of JOB_METHODS
+        :return: Job id, None if the agent could not be reached or refused the job
+        :rtype: Optional[str]
+        """
+        args = list(args)
+        if method in FILE_METHODS:
+            if len(args) > 1:
+                args[1] = os.path.abspath(args[1])
+            elif "filepath" in kwargs:
+                kwargs["filepath"] = os.path.abspath(kwargs["filepath"])
+
+        response = self._request({"op": "submit", "method": method, "args": args, "kwargs": kwargs})
+        return response["job_id"] if response else None
+
+    def status(self, job_id):
+        """
+        :param str job_id: Job id
+        :return: Job with "status" ("pending", "running", "done" or "failed"), "result" and "error"
+        :rtype: Optional[dict]
+        """
+        response = self._request({"op": "status", "job_id": job_id})
+        return response["job"] if response else None
+
+    def jobs(self, status=None):
+        """
+        :param str status: (Optional) Only jobs with this status
+        :rtype: Optional[list[dict]]
+        """
+        response = self._request({"op": "jobs", "status": status})
+        return response["jobs"] if response else None
+
+    def wait(self, job_id, timeout=None, poll_interval=1.0):
+        """
+        Wait until a job is done or failed.
+
+        :param str job_id: Job id
+        :param float timeout: (Optional) Seconds to wait, forever when omitted
+        :param float poll_interval: (Optional) Seconds between status checks
+        :return: The finished job, None on timeout or if the agent is gone
+        :rtype: Optional[dict]
+        """
+        deadline = time.time() + timeout if timeout is not None else None
+        while True:
+            job = self.status(job_id)
+            if job is None or job["status"] in ("done", "failed"):
+                return job
+            if deadline is not None and time.time() >= deadline:
+                print("Timed out waiting for job {}".format(job_id))
+                return None
+            time.sleep(poll_interval)
+
+    def shutdown(self):
+        """
+        Stop the agent after its running jobs. Jobs that have not started fail with a "cancelled" error.
+
+        :rtype: bool
+        """
+        return self._request({"op": "shutdown"}) is not None
+
+
+def _pooled_transport(pool_size):
+    import requests
+
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _add_client_arguments(parser):
+    parser.add_argument("--host", default=os.environ.get("SYNCSKETCH_HOST", "https://www.syncsketch.com"))
+    parser.add_argument("--user", default=os.environ.get("SYNCSKETCH_USER"))
+    parser.add_argument("--api-key", default=os.environ.get("SYNCSKETCH_API_KEY"))
+    parser.add_argument("--upload-rate", type=float, help="upload limit in bytes per second for all jobs")
+    parser.add_argument("--download-rate", type=float, help="download limit in bytes per second for all jobs")
+    parser.add_argument("--debug", action="store_true")
+
+
+def _client_from_arguments(parser, args, max_jobs):
+    from .bandwidth import BandwidthLimiter
+    from .syncsketch import SyncSketchAPI
+
+    if not args.user or not args.api_key:
+        parser.error("--user and --api-key, or SYNCSKETCH_USER and SYNCSKETCH_API_KEY, are required")
+
+    return SyncSketchAPI(
+        args.user,
+        args.api_key,
+        host=args.host,
+        use_header_auth=True,
+        debug=args.debug,
+        # room for the parallel parts of every running upload
+        transport=_pooled_transport(max_jobs * 8),
+        bandwidth=BandwidthLimiter(args.upload_rate, args.download_rate),
+    )
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="SyncSketch local upload agent")
+    parser.add_argument("--address", help="socket path or host:port, default %s" % (default_address(),))
+    parser.add_argument("--token", default=os.environ.get("SYNCSKETCH_AGENT_TOKEN"), help="secret clients must send")
+    parser.add_argument("--jobs", type=int, default=4, help="jobs running at the same time")
+    _add_client_arguments(parser)
+    args = parser.parse_args(argv)
+
+    api = _client_from_arguments(parser, args, args.jobs)
+    agent = UploadAgent(api, address=args.address, max_jobs=args.jobs, token=args.token)
+    print("SyncSketch agent listening on {}".format(agent.address))
+    agent.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
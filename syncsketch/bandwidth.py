@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+Client-wide bandwidth limits for uploads and downloads.
+
+Every :class:`syncsketch.SyncSketchAPI` has a :class:`BandwidthLimiter` in ``s.bandwidth``. It is unlimited by
+default. Limits are in bytes per second, apply to the sum of all transfers of all threads and can be changed at any
+time, also while transfers are running. Pass the same limiter to several clients to share one budget between them.
+
+.. code:: python
+
+    from syncsketch.bandwidth import BandwidthLimiter
+
+    s = SyncSketchAPI("username", "api-key", bandwidth=BandwidthLimiter(upload_rate=2 * 1024 * 1024))
+    s.upload_file(review_id, "/tmp/large.mov", max_workers=8)
+
+    # after hours
+    s.bandwidth.upload_rate = None
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import threading
+import time
+
+# Python 2 has no monotonic clock
+_clock = getattr(time, "monotonic", time.time)
+
+MIN_BURST = 64 * 1024
+
+
+class TokenBucket(object):
+    """
+    Thread safe token bucket. One token is one byte.
+
+    Consumers reserve their bytes up front and sleep until the bucket has refilled enough, so concurrent consumers
+    are served in the order they arrive and a single large read never starves.
+    """
+
+    def __init__(self, rate=None, burst=None):
+        """
+        :param float rate: (Optional) Bytes per second, None or 0 for unlimited
+        :param int burst: (Optional) Bytes that can be sent at once after an idle period, a quarter second of
+                          `rate` (at least 64 KB) when omitted
+        """
+        self._lock = threading.Lock()
+        self._last = _clock()
+        self.rate = None
+        self.burst = 0
+        self._tokens = 0
+        self.set_rate(rate, burst)
+
+    def set_rate(self, rate, burst=None):
+        """
+        Change the rate. Waits that are already running are not shortened, new consumers use the new rate. Bytes
+        that were reserved but not paid for yet at the old rate are still owed, so changing the limit does not let
+        a burst through.
+
+        :param float rate: Bytes per second, None or 0 for unlimited
+        :param int burst: (Optional) Burst size in bytes
+        """
+        with self._lock:
+            now = _clock()
+            was_limited = self.rate is not None
+            if was_limited:
+                self._refill(now)
+            self.rate = rate or None
+            self.burst = burst or (max(MIN_BURST, int(rate / 4)) if rate else 0)
+            if was_limited and self.rate is not None:
+                self._tokens = min(self._tokens, self.burst)
+            else:
+                # switching between unlimited and limited starts over with a full bucket
+                self._tokens = self.burst
+            self._last = now
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def consume(self, num_bytes):
+        """
+        Take `num_bytes` tokens, blocking until they are available.
+
+        :param int num_bytes: Bytes about to be sent or just received
+        :return: Seconds waited
+        :rtype: float
+        """
+        if not num_bytes or self.rate is None:
+            return 0.0
+
+        with self._lock:
+            if self.rate is None:
+                return 0.0
+            self._refill(_clock())
+            self._tokens -= num_bytes
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+class ThrottledReader(object):
+    """
+    File-like request body that takes tokens from a bucket for every block read from the wrapped body.
+    """
+
+    def __init__(self, body, bucket):
+        self._body = body
+        self._bucket = bucket
+
+    def __len__(self):
+        return len(self._body)
+
+    def read(self, size=-1):
+        data = self._body.read(size)
+        self._bucket.consume(len(data))
+        return data
+
+    def tell(self):
+        return self._body.tell()
+
+
+class BandwidthLimiter(object):
+    """
+    Separate upload and download budgets, shared by every thread that uses them.
+    """
+
+    def __init__(self, upload_rate=None, download_rate=None):
+        """
+        :param float upload_rate: (Optional) Upload limit in bytes per second, unlimited when omitted
+        :param float download_rate: (Optional) Download limit in bytes per second, unlimited when omitted
+        """
+        self.upload = TokenBucket(upload_rate)
+        self.download = TokenBucket(download_rate)
+
+    @property
+    def upload_rate(self):
+        return self.upload.rate
+
+    @upload_rate.setter
+    def upload_rate(self, rate):
+        self.upload.set_rate(rate)
+
+    @property
+    def download_rate(self):
+        return self.download.rate
+
+    @download_rate.setter
+    def download_rate(self, rate):
+        self.download.set_rate(rate)
+
+    def throttle_body(self, body):
+        """
+        Wrap a file-like request body so reading it is limited to the upload rate.
+
+        Other bodies, e.g. JSON strings, are returned unchanged.
+        """
+        if hasattr(body, "read") and hasattr(body, "__len__"):
+            return ThrottledReader(body, self.upload)
+        return body
+
+    def iter_content(self, response, chunk_size=64 * 1024):
+        """
+        Iterate over the body of a streamed response, limited to the download rate.
+
+        :param requests.Response response: Response of a request sent with stream=True
+        :param int chunk_size: (Optional) Bytes per chunk
+        """
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            if chunk:
+                self.download.consume(len(chunk))
+                yield chunk
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Compressed transfer of API requests and responses.
+
+Responses: the client asks for every content encoding the installed HTTP stack can decode, gzip and deflate always,
+brotli when ``brotli`` or ``brotlicffi`` is installed and zstd when ``zstandard`` is installed with urllib3 2.
+
+Requests: JSON bodies above a size threshold are gzip compressed when the client is created with
+``compress_requests``. Only enable it for servers that accept ``Content-Encoding: gzip`` request bodies.
+
+.. code:: python
+
+    from syncsketch.compression import RequestCompression
+
+    s = SyncSketchAPI(user, api_key, compress_requests=True)
+    # or tuned
+    s = SyncSketchAPI(user, api_key, compress_requests=RequestCompression(min_size=64 * 1024, level=1))
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import zlib
+
+DEFAULT_MIN_SIZE = 16 * 1024
+DEFAULT_LEVEL = 6
+
+# decoders urllib3 uses for encodings beyond gzip and deflate
+OPTIONAL_DECODERS = ("brotli", "brotlicffi", "zstandard")
+
+_accept_encoding = None
+
+
+def _installed(module):
+    try:
+        from importlib.util import find_spec
+    except ImportError:
+        # Python 2, assume it is and let urllib3 decide
+        return True
+    return find_spec(module) is not None
+
+
+def accept_encoding():
+    """
+    Return the Accept-Encoding header value listing every encoding the installed decoders support.
+
+    :rtype: str
+    """
+    global _accept_encoding
+    if _accept_encoding is None:
+        ACCEPT_ENCODING = "gzip,deflate"
+        # only pay for importing urllib3 here if there is more than gzip and deflate to ask for
+        if any(_installed(module) for module in OPTIONAL_DECODERS):
+            try:
+                # urllib3 adds br and zstd when their decoders are importable
+                from urllib3.util.request import ACCEPT_ENCODING
+            except ImportError:
+                pass
+        _accept_encoding = ", ".join(encoding.strip() for encoding in ACCEPT_ENCODING.split(","))
+    return _accept_encoding
+
+
+def gzip_compress(data, level=DEFAULT_LEVEL):
+    """
+    Return `data` in the gzip format. Unlike gzip.compress, also available on Python 2.
+
+    :param bytes data: Data to compress
+    :param int level: (Optional) Compression level from 1 (fastest) to 9 (smallest)
+    :rtype: bytes
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+class RequestCompression(object):
+    """
+    Gzip compression of request bodies above a size threshold.
+    """
+
+    encoding = "gzip"
+
+    def __init__(self, min_size=DEFAULT_MIN_SIZE, level=DEFAULT_LEVEL):
+        """
+        :param int min_size: (Optional) Bodies smaller than this many bytes are sent as they are
+        :param int level: (Optional) Compression level from 1 (fastest) to 9 (smallest)
+        """
+        self.min_size = min_size
+        self.level = level
+
+    def compress(self, body, headers):
+        """
+        Return the body to send, compressed when it is large enough, and set Content-Encoding in `headers` then.
+
+        :param bytes body: Encoded request body
+        :param dict headers: Request headers, updated in place
+        :rtype: bytes
+        """
+        if body is None or len(body) < self.min_size:
+            return body
+
+        compressed = gzip_compress(body, self.level)
+        if len(compressed) >= len(body):
+            return body
+
+        headers["Content-Encoding"] = self.encoding
+        return compressed
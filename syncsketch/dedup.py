@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+"""
+Opt-in content-hash deduplication for uploads.
+
+:class:`MediaDeduplicator` sits in front of :meth:`syncsketch.SyncSketchAPI.upload_file` or
+:meth:`syncsketch.SyncSketchAPI.add_media`. It hashes every file, skips files whose hash is already stored in the
+metadata of an item in the target review and stores the hash on every item it uploads. Hashes are cached on disk
+keyed on path, size and mtime, so unchanged files are not hashed again, and hashing runs in worker threads so it
+overlaps with the uploads.
+
+.. code:: python
+
+    from syncsketch.dedup import HashCache, MediaDeduplicator
+
+    dedup = MediaDeduplicator(s, cache=HashCache("~/.syncsketch_hashes.json"))
+    for filepath, item, duplicate in dedup.upload(review_id, paths):
+        print(filepath, item["id"] if item else None, "skipped" if duplicate else "uploaded")
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import hashlib
+import json
+import os
+import threading
+from io import open
+
+from .fileutil import atomic_write_json
+
+try:
+    # Python 3
+    from queue import Queue
+except ImportError:
+    # Python 2
+    from Queue import Queue
+
+HASH_ALGORITHM = "sha256"
+HASH_BLOCK_SIZE = 1024 * 1024
+METADATA_KEY = "content_sha256"
+
+
+def hash_file(filepath, algorithm=HASH_ALGORITHM, block_size=HASH_BLOCK_SIZE):
+    """
+    Hash the contents of a file.
+
+    :param str filepath: Path of the file
+    :param str algorithm: (Optional) hashlib algorithm name
+    :param int block_size: (Optional) Read size in bytes
+    :return: Hex digest
+    :rtype: str
+    """
+    digest = hashlib.new(algorithm)
+    with open(filepath, "rb") as f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class HashCache(object):
+    """
+    Thread safe cache of file hashes keyed on absolute path, size and mtime, optionally persisted as JSON.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path=None, algorithm=HASH_ALGORITHM):
+        """
+        :param str path: (Optional) JSON file to load and save the cache, in memory only when omitted
+        :param str algorithm: (Optional) hashlib algorithm name
+        """
+        self.path = os.path.expanduser(path) if path else None
+        self.algorithm = algorithm
+        self._lock = threading.Lock()
+        self._entries = {}
+
+        if self.path and os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == self.VERSION and data.get("algorithm") == algorithm:
+                self._entries = data.get("entries", {})
+
+    def get_hash(self, filepath):
+        """
+        Return the hash of a file, computing it only if the file changed since it was last hashed.
+
+        :param str filepath: Path of the file
+        :rtype: str
+        """
+        key = os.path.abspath(filepath)
+        stat = os.stat(filepath)
+        signature = [stat.st_size, stat.st_mtime]
+
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry and entry[:2] == signature:
+            return entry[2]
+
+        digest = hash_file(filepath, self.algorithm)
+        with self._lock:
+            self._entries[key] = signature + [digest]
+        return digest
+
+    def save(self):
+        """
+        Write the cache to its JSON file, if it has one.
+        """
+        if not self.path:
+            return
+
+        with self._lock:
+            data = {"version": self.VERSION, "algorithm": self.algorithm, "entries": dict(self._entries)}
+
+        atomic_write_json(self.path, data)
+
+
+class MediaDeduplicator(object):
+    """
+    Skip uploads of files that are already in a review, based on a content hash stored in item metadata.
+    """
+
+    def __init__(self, api, cache=None, max_workers=4, metadata_key=METADATA_KEY):
+        """
+        :param syncsketch.SyncSketchAPI api: API client
+        :param HashCache cache: (Optional) Hash cache, an in memory cache is used when omitted
+        :param int max_workers: (Optional) Number of hashing threads
+        :param str metadata_key: (Optional) Key of the hash in the item metadata
+        """
+        self.api = api
+        self.cache = cache or HashCache()
+        self.max_workers = max_workers
+        self.metadata_key = metadata_key
+
+    def get_review_hashes(self, review_id):
+        """
+        Return the content hashes of all items in a review.
+
+        :param int review_id: Review ID
+        :return: Mapping of hash to item data, None if the items could not be fetched
+        :rtype: Optional[dict[str, dict]]
+        """
+        items = self.api._get_all_review_items(review_id, ["id", "uuid", "name", "metadata"])
+        if items is None:
+            return None
+        hashes = {}
+        for item in items:
+            digest = (item.get("metadata") or {}).get(self.metadata_key)
+            if digest:
+                hashes[digest] = item
+        return hashes
+
+    def _hash_in_background(self, paths):
+        """
+        Hash `paths` in worker threads, returns a Queue of (filepath, hash or exception).
+        """
+        results = Queue()
+        remaining = iter(paths)
+        lock = threading.Lock()
+
+        def worker():
+            while True:
+                with lock:
+                    filepath = next(remaining, None)
+                if filepath is None:
+                    return
+                try:
+                    results.put((filepath, self.cache.get_hash(filepath)))
+                except Exception as e:
+                    results.put((filepath, e))
+
+        for _ in range(max(1, min(self.max_workers, len(paths)))):
+            thread = threading.Thread(target=worker)
+            thread.daemon = True
+            thread.start()
+
+        return results
+
+    def upload(self, review_id, paths, method="upload_file", **kwargs):
+        """
+        Upload the files that are not in the review yet.
+
+        This is a generator, results are yielded as each file is handled in the order hashing finishes.
+        Use ``list(...)`` to wait for all files.
+
+        :param int review_id: Review ID
+        :param list[str] paths: Paths of the files on disk
+        :param str method: (Optional) Upload method of the API client, "upload_file" or "add_media"
+        :param kwargs: Additional arguments for the upload method, e.g. noConvertFlag
+        :return: Generator of (filepath, item data or None on failure, True if the upload was skipped) tuples
+        :rtype: Iterator[tuple[str, Optional[dict], bool]]
+        """
+        upload = getattr(self.api, method)
+        paths = list(paths)
+        known = self.get_review_hashes(review_id)
+        if known is None:
+            # without the hashes of the review every file could be a duplicate, upload none
+            print("Failed to fetch the content hashes of review {}".format(review_id))
+            for filepath in paths:
+                yield filepath, None, False
+            return
+        hashes = self._hash_in_background(paths)
+
+        try:
+            for _ in paths:
+                filepath, digest = hashes.get()
+
+                if isinstance(digest, Exception):
+                    print("Failed to hash {}: {}".format(filepath, digest))
+                    yield filepath, None, False
+                    continue
+
+                if digest in known:
+                    yield filepath, known[digest], True
+                    continue
+
+                item = upload(review_id, filepath, **kwargs)
+                if not item or "id" not in item:
+                    yield filepath, None, False
+                    continue
+
+                metadata = dict(item.get("metadata") or {})
+                metadata[self.metadata_key] = digest
+                self.api.update_item(item["id"], {"metadata": metadata})
+                item["metadata"] = metadata
+
+                known[digest] = item
+                yield filepath, item, False
+        finally:
+            self.cache.save()
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+Thread pool for the concurrent requests of :class:`syncsketch.SyncSketchAPI`. The client imports this module on
+first use, so ``import syncsketch`` does not load ``concurrent.futures``.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import threading
+
+try:
+    # Python 3
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:
+    # Python 2
+    from Queue import Queue
+
+    # Define a simple ThreadPoolExecutor-like class for Python 2
+    class ThreadPoolExecutor(object):
+        def __init__(self, max_workers):
+            self.max_workers = max_workers
+            self.tasks = Queue()
+            self.results = {}
+            self.workers = []
+
+        def submit(self, fn, *args, **kwargs):
+            task_id = len(self.results)
+            self.tasks.put((task_id, fn, args, kwargs))
+            self.results[task_id] = None
+            return task_id
+
+        def _worker(self):
+            while not self.tasks.empty():
+                try:
+                    task_id, fn, args, kwargs = self.tasks.get(block=False)
+                    self.results[task_id] = fn(*args, **kwargs)
+                except:
+                    pass
+
+        def __enter__(self):
+            for _ in range(self.max_workers):
+                worker = threading.Thread(target=self._worker)
+                worker.daemon = True
+                worker.start()
+                self.workers.append(worker)
+            return self
+
+        def __exit__(self, exc_type, exc_val, exc_tb):
+            for worker in self.workers:
+                worker.join()
+
+        def result(self, task_id):
+            return self.results.get(task_id)
@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+"""
+Named field projections for the getters of :class:`syncsketch.SyncSketchAPI`.
+
+Every getter with a ``fields`` argument also takes the name of a profile, e.g. ``fields="minimal"``. A client can set
+the profile used when ``fields`` is omitted, for all entity types or per type:
+
+.. code:: python
+
+    from syncsketch.fieldprofiles import FieldProfiles
+
+    s = SyncSketchAPI(user, api_key, field_profiles=FieldProfiles(default="listing", defaults={"user": "minimal"}))
+    s.get_items_by_review_id(review_id)                  # "listing" fields
+    s.get_items_by_review_id(review_id, fields="full")   # all fields
+    s.get_items_by_review_id(review_id, fields=["id"])   # explicit fields as before
+
+To tune the profiles, sample which fields a workload actually reads:
+
+.. code:: python
+
+    from syncsketch.fieldprofiles import FieldSampler
+
+    s.field_sampler = FieldSampler()
+    run_workload(s)
+    s.field_sampler.print_report()
+    print(s.field_sampler.suggest("item"))
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import re
+import threading
+from collections import Counter
+
+# profile that sends no ``fields`` parameter, so the server returns complete objects
+FULL = "full"
+
+DEFAULT_PROFILES = {
+    "account": {
+        "minimal": ["id", "name"],
+        "listing": ["id", "name", "uuid", "created", "active"],
+    },
+    "project": {
+        "minimal": ["id", "name"],
+        "listing": ["id", "name", "uuid", "description", "account", "created", "active", "is_archived"],
+    },
+    "review": {
+        "minimal": ["id", "name", "project"],
+        "listing": ["id", "name", "uuid", "project", "description", "reviewURL", "created", "sortorder", "active"],
+    },
+    "item": {
+        "minimal": ["id", "name"],
+        "listing": ["id", "name", "uuid", "type", "status", "sortorder", "created", "creator", "thumbnail_url", "fps"],
+    },
+    "user": {
+        "minimal": ["id", "email"],
+        "listing": ["id", "email", "username", "first_name", "last_name"],
+    },
+}
+
+# REST endpoints of the entity types, e.g. simpleperson for users
+ENDPOINT_ENTITIES = {
+    "account": "account",
+    "project": "project",
+    "review": "review",
+    "item": "item",
+    "simpleperson": "user",
+    "person": "user",
+}
+
+_ENDPOINT = re.compile(r"/api/v\d+/(\w+)/")
+
+
+def entity_for_url(url):
+    """
+    Return the entity type of a REST url, e.g. "item" for ".../api/v1/item/12/", or None.
+
+    :param str url: Request url
+    :rtype: Optional[str]
+    """
+    match = _ENDPOINT.search(url)
+    return ENDPOINT_ENTITIES.get(match.group(1)) if match else None
+
+
+class FieldProfiles(object):
+    """
+    Field profiles per entity type and the profile used when a getter is called without ``fields``.
+    """
+
+    def __init__(self, default=FULL, defaults=None, profiles=None):
+        """
+        :param str default: (Optional) Profile used when ``fields`` is omitted, "full" (all fields) by default
+        :param dict defaults: (Optional) Entity type -> profile, overrides `default` per type
+        :param dict profiles: (Optional) Entity type -> profile name -> field list, added to or replacing the
+            built-in profiles
+        """
+        self.default = default
+        self.defaults = dict(defaults or {})
+        self.profiles = dict((entity, dict(named)) for entity, named in DEFAULT_PROFILES.items())
+        for entity, named in (profiles or {}).items():
+            self.profiles.setdefault(entity, {}).update(named)
+
+    def fields(self, entity, profile):
+        """
+        Return the fields of a profile, None for "full".
+
+        :param str entity: Entity type, e.g. "item"
+        :param str profile: Profile name
+        :rtype: Optional[list[str]]
+        """
+        if profile == FULL:
+            return None
+        try:
+            return list(self.profiles[entity][profile])
+        except KeyError:
+            raise ValueError("No field profile {!r} for {}".format(profile, entity))
+
+    def resolve(self, entity, fields):
+        """
+        Return the fields to request: `fields` itself when it is a field list, the fields of the profile when it
+        names one, and the fields of the default profile of the entity type when it is omitted.
+
+        :param str entity: Entity type, e.g. "item"
+        :param fields: Field list, comma separated fields, profile name or None
+        :rtype: Optional[list[str]|str]
+        """
+        if not fields:
+            return self.fields(entity, self.defaults.get(entity, self.default))
+        if isinstance(fields, (list, tuple, int, bool)):
+            return fields
+        if fields == FULL or fields in self.profiles.get(entity, {}):
+            return self.fields(entity, fields)
+        return fields
+
+
+class FieldSampler(object):
+    """
+    Records which fields of API responses are read, per entity type. Thread safe.
+
+    Set it as ``field_sampler`` of a client, responses of GET requests are then returned as dicts that count the
+    fields read by key or with ``get``. Nested objects are counted as "entity.field", e.g. "item.creator". Responses
+    converted with ``as_records=True`` are not sampled.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # entity type -> Counter of fields read
+        self._reads = {}
+        # entity type -> number of objects returned
+        self._objects = Counter()
+
+    def wrap(self, entity, data):
+        """
+        Return a response with its objects replaced by sampled dicts.
+
+        :param str entity: Entity type of the response
+        :param data: Decoded JSON response
+        """
+        if isinstance(data, dict) and isinstance(data.get("objects"), list) and isinstance(data.get("meta"), dict):
+            return dict(data, objects=self._wrap(entity, data["objects"]))
+        return self._wrap(entity, data)
+
+    def _wrap(self, path, value):
+        if isinstance(value, list):
+            return [self._wrap(path, element) for element in value]
+        if isinstance(value, dict):
+            with self._lock:
+                self._objects[path] += 1
+            items = ((key, self._wrap(path + "." + key, element)) for key, element in value.items())
+            return SampledDict(self, path, items)
+        return value
+
+    def record(self, path, field):
+        with self._lock:
+            self._reads.setdefault(path, Counter())[field] += 1
+
+    def report(self):
+        """
+        Return the fields read so far, with the number of reads and of objects returned per entity type.
+
+        :return: {entity: {"objects": int, "fields": {field: reads}}}
+        :rtype: dict
+        """
+        with self._lock:
+            return dict(
+                (path, {"objects": count, "fields": dict(self._reads.get(path, {}))})
+                for path, count in self._objects.items()
+            )
+
+    def suggest(self, entity):
+        """
+        Return the fields of an entity type that were read, as a profile for FieldProfiles.
+
+        :param str entity: Entity type, e.g. "item"
+        :rtype: list[str]
+        """
+        with self._lock:
+            fields = set(self._reads.get(entity, {}))
+        return ["id"] + sorted(fields - {"id"})
+
+    def print_report(self):
+        for path, stats in sorted(self.report().items()):
+            fields = sorted(stats["fields"].items(), key=lambda item: -item[1])
+            print(
+                "{}: {} objects, fields read: {}".format(
+                    path, stats["objects"], ", ".join("%s (%d)" % item for item in fields) or "none"
+                )
+            )
+
+    def reset(self):
+        with self._lock:
+            self._reads.clear()
+            self._objects.clear()
+
+
+class SampledDict(dict):
+    """
+    Response object that tells its FieldSampler which fields are read.
+    """
+
+    __slots__ = ("_sampler", "_path")
+
+    def __init__(self, sampler, path, items):
+        dict.__init__(self, items)
+        self._sampler = sampler
+        self._path = path
+
+    def __getitem__(self, key):
+        self._sampler.record(self._path, key)
+        return dict.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        self._sampler.record(self._path, key)
+        return dict.get(self, key, default)
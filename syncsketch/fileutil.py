@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+"""
+File helpers shared by the modules that keep state on disk.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import json
+import os
+from io import open
+
+
+def atomic_write_json(path, data):
+    """
+    Write `data` as compact JSON to `path`, so a crash leaves either the old or the new file, never none or half.
+
+    :param str path: Path of the JSON file
+    :param data: JSON serializable data
+    """
+    text = json.dumps(data, separators=(",", ":"))
+    if isinstance(text, bytes):
+        # Python 2
+        text = text.decode("utf-8")
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+    if hasattr(os, "replace"):
+        os.replace(tmp_path, path)
+    else:
+        # Python 2, rename does not overwrite on Windows
+        if os.path.exists(path):
+            os.remove(path)
+        os.rename(tmp_path, path)
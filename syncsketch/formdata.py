@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+Streaming multipart/form-data request bodies used by :meth:`syncsketch.SyncSketchAPI.add_media` and
+:meth:`syncsketch.SyncSketchAPI.add_media_v2`.
+
+``requests`` builds a multipart body in memory when it is given ``files=...``. :class:`MultipartFormData` instead
+produces the body while it is sent, reading files from disk in small blocks, so memory use does not depend on the
+file size. The total length is known up front and sent as Content-Length.
+
+.. code:: python
+
+    body = MultipartFormData({"name": "shot.mov"}, {"reviewFile": "/tmp/shot.mov"})
+    with body:
+        requests.post(url, data=body, headers={"Content-Type": body.content_type})
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import binascii
+import os
+from io import open
+
+DEFAULT_BLOCK_SIZE = 256 * 1024
+
+CRLF = b"\r\n"
+
+
+def _to_bytes(value):
+    if isinstance(value, bytes):
+        return value
+    if not isinstance(value, type(u"")):
+        value = u"%s" % value
+    return value.encode("utf-8")
+
+
+def _quote_param(value):
+    # same escaping as browsers and urllib3 use for names in a Content-Disposition header
+    value = _to_bytes(value)
+    return value.replace(b'"', b"%22").replace(b"\r", b"%0D").replace(b"\n", b"%0A")
+
+
+class MultipartFormData(object):
+    """
+    Read only file-like multipart/form-data body that streams files from disk.
+
+    Pass it as ``data`` to requests together with its :attr:`content_type` header. Fields are sent before files,
+    in the order given. Each file is opened when the encoder reaches it and closed as soon as it is read, or when
+    :meth:`close` is called.
+    """
+
+    def __init__(self, fields=None, files=None, boundary=None, block_size=DEFAULT_BLOCK_SIZE, callback=None):
+        """
+        :param fields: (Optional) Form fields, a dict or list of (name, value) tuples
+        :param files: (Optional) Files, a dict or list of (name, file) tuples where file is a path or a
+                      (filename, path) or (filename, path, content_type) tuple
+        :param str boundary: (Optional) Multipart boundary, random when omitted
+        :param int block_size: (Optional) Size of the blocks files are read in
+        :param callback: (Optional) Called with (bytes read, total bytes) every time the body is read
+        """
+        self.boundary = boundary or binascii.hexlify(os.urandom(16)).decode("ascii")
+        self.block_size = block_size
+        self.callback = callback
+
+        boundary_line = b"--" + _to_bytes(self.boundary) + CRLF
+
+        # (header bytes, path or None, file size or value bytes)
+        self._parts = []
+        for name, value in self._items(fields):
+            header = boundary_line + b'Content-Disposition: form-data; name="' + _quote_param(name) + b'"'
+            self._parts.append((header + CRLF + CRLF, None, _to_bytes(value)))
+
+        for name, value in self._items(files):
+            if isinstance(value, (tuple, list)):
+                filename, filepath = value[0], value[1]
+                content_type = value[2] if len(value) > 2 else None
+            else:
+                filename, filepath, content_type = os.path.basename(value), value, None
+
+            header = boundary_line + b'Content-Disposition: form-data; name="' + _quote_param(name) + b'"'
+            header += b'; filename="' + _quote_param(filename) + b'"'
+            if content_type:
+                header += CRLF + b"Content-Type: " + _to_bytes(content_type)
+            self._parts.append((header + CRLF + CRLF, filepath, os.stat(filepath).st_size))
+
+        self._trailer = b"--" + _to_bytes(self.boundary) + b"--" + CRLF
+
+        self._length = len(self._trailer)
+        for header, filepath, body in self._parts:
+            self._length += len(header) + (body if filepath else len(body)) + len(CRLF)
+
+        self._chunks = self._iter_chunks()
+        self._buffer = b""
+        self._offset = 0
+        self._position = 0
+        self._file = None
+
+    @staticmethod
+    def _items(values):
+        if not values:
+            return []
+        return list(values.items()) if hasattr(values, "items") else list(values)
+
+    @property
+    def content_type(self):
+        """
+        Value for the Content-Type header of the request.
+
+        :rtype: str
+        """
+        return "multipart/form-data; boundary=%s" % self.boundary
+
+    def _iter_chunks(self):
+        for header, filepath, body in self._parts:
+            yield header
+
+            if filepath is None:
+                yield body
+            else:
+                self._file = open(filepath, "rb")
+                try:
+                    remaining = body
+                    while remaining:
+                        block = self._file.read(min(self.block_size, remaining))
+                        if not block:
+                            raise IOError("{} changed size while it was being uploaded".format(filepath))
+                        remaining -= len(block)
+                        yield block
+                finally:
+                    self._file.close()
+                    self._file = None
+
+            yield CRLF
+
+        yield self._trailer
+
+    def __len__(self):
+        return self._length
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = self._length
+
+        chunks = []
+        wanted = size
+        while wanted > 0:
+            if self._offset >= len(self._buffer):
+                # empty blocks, such as an empty field value, are skipped
+                self._buffer = next(self._chunks, None)
+                self._offset = 0
+                if self._buffer is None:
+                    self._buffer = b""
+                    break
+                continue
+            # slice from an offset so the rest of the block is not copied on every read
+            chunk = self._buffer[self._offset : self._offset + wanted]
+            self._offset += len(chunk)
+            wanted -= len(chunk)
+            chunks.append(chunk)
+
+        data = b"".join(chunks)
+        self._position += len(data)
+        if self.callback is not None and data:
+            self.callback(self._position, self._length)
+        return data
+
+    def tell(self):
+        return self._position
+
+    def close(self):
+        """
+        Stop encoding and close the file that is being read, if any.
+        """
+        self._chunks.close()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
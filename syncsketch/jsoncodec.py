@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""
+Pluggable JSON encoding and decoding for API requests and responses.
+
+The client uses the fastest installed backend: ``orjson``, then ``ujson``, then the standard library. Responses are
+decoded straight from the response bytes and request bodies are encoded to UTF-8 bytes, without a text round trip.
+Values the fast backend can not encode, e.g. integers larger than 64 bits, fall back to the standard library.
+
+.. code:: python
+
+    s = SyncSketchAPI(user, api_key)                        # fastest installed backend
+    s = SyncSketchAPI(user, api_key, json_backend="json")   # always the standard library
+    print(s.json_codec.name)
+"""
+
+from __future__ import absolute_import, division, print_function
+
+# backends in order of preference
+BACKENDS = ("orjson", "ujson", "json")
+
+
+class JSONCodec(object):
+    """
+    Standard library backend, and base class of the others.
+    """
+
+    name = "json"
+
+    def __init__(self):
+        # imported when the client needs its first codec, not with the package
+        import json
+
+        self._json = json
+
+    def dumps(self, obj):
+        """
+        Encode `obj` as UTF-8 JSON.
+
+        :rtype: bytes
+        """
+        return self._json.dumps(obj).encode("utf-8")
+
+    def loads(self, data):
+        """
+        Decode JSON from bytes or text.
+        """
+        if isinstance(data, bytes) and str is not bytes:
+            # Python 3.6+ json.loads takes bytes, older versions need text
+            data = data.decode("utf-8")
+        return self._json.loads(data)
+
+    def dumps_text(self, obj):
+        """
+        Encode `obj` as a JSON string, e.g. for a JSON value nested in another JSON payload.
+
+        :rtype: str
+        """
+        return self.dumps(obj).decode("utf-8")
+
+
+class OrjsonCodec(JSONCodec):
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        JSONCodec.__init__(self)
+        self._orjson = orjson
+        self._option = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj):
+        try:
+            return self._orjson.dumps(obj, option=self._option)
+        except TypeError:
+            return JSONCodec.dumps(self, obj)
+
+    def loads(self, data):
+        try:
+            return self._orjson.loads(data)
+        except ValueError:
+            return JSONCodec.loads(self, data)
+
+
+class UjsonCodec(JSONCodec):
+    name = "ujson"
+
+    def __init__(self):
+        import ujson
+
+        JSONCodec.__init__(self)
+        self._ujson = ujson
+
+    def dumps(self, obj):
+        try:
+            return self._ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False).encode("utf-8")
+        except (TypeError, OverflowError):
+            return JSONCodec.dumps(self, obj)
+
+    def loads(self, data):
+        try:
+            return self._ujson.loads(data)
+        except ValueError:
+            return JSONCodec.loads(self, data)
+
+
+_CODECS = {"orjson": OrjsonCodec, "ujson": UjsonCodec, "json": JSONCodec}
+
+
+def get_codec(name=None):
+    """
+    Return a JSON codec by backend name, or the fastest installed one.
+
+    :param str name: (Optional) "orjson", "ujson" or "json"
+    :rtype: JSONCodec
+    """
+    if name is not None:
+        try:
+            return _CODECS[name]()
+        except KeyError:
+            raise ValueError("Unknown JSON backend {!r}, expected one of {}".format(name, ", ".join(BACKENDS)))
+
+    for backend in BACKENDS:
+        try:
+            return _CODECS[backend]()
+        except ImportError:
+            continue
+    return JSONCodec()
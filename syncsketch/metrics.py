@@ -0,0 +1,309 @@
+# -*- coding: utf-8 -*-
+"""
+Optional in-process metrics for the SyncSketch API client.
+
+Pass a :class:`MetricsRegistry` to :class:`syncsketch.SyncSketchAPI` to collect per-endpoint request counts,
+error counts, latency histograms and upload / polling statistics. The registry can be exported as a plain dict
+snapshot or in the Prometheus text exposition format.
+
+.. code:: python
+
+    from syncsketch import SyncSketchAPI
+    from syncsketch.metrics import MetricsRegistry
+
+    metrics = MetricsRegistry()
+    s = SyncSketchAPI("username", "api-key", use_header_auth=True, metrics=metrics)
+    s.get_projects()
+
+    print(metrics.to_prometheus())
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import re
+import threading
+from bisect import bisect_left
+
+try:
+    # Python 3
+    from urllib.parse import urlsplit
+except ImportError:
+    # Python 2
+    from urlparse import urlsplit
+
+# Upper bounds in seconds. The last bucket (+Inf) is implicit.
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+METRIC_TYPES = {
+    "syncsketch_requests_total": ("counter", "Number of HTTP requests sent, by method and endpoint."),
+    "syncsketch_request_errors_total": (
+        "counter",
+        "Number of HTTP requests that raised or returned a status code >= 400.",
+    ),
+    "syncsketch_request_duration_seconds": ("histogram", "HTTP request latency in seconds."),
+    "syncsketch_upload_bytes_total": ("counter", "Number of bytes uploaded in multipart upload parts."),
+    "syncsketch_upload_seconds_total": ("counter", "Wall time spent uploading multipart upload parts."),
+    "syncsketch_upload_throughput_bytes_per_second": ("gauge", "Throughput of the last finished upload."),
+    "syncsketch_upload_parts_total": ("counter", "Number of multipart upload parts uploaded."),
+    "syncsketch_upload_parts_retried_total": ("counter", "Number of multipart upload part retries."),
+    "syncsketch_task_poll_seconds_total": ("counter", "Time spent polling server side tasks, by task."),
+    "syncsketch_task_polls_total": ("counter", "Number of server side task status requests, by task."),
+}
+
+# numeric ids, uuids / celery task ids and opaque tokens like multipart upload ids
+_ID_SEGMENT_RE = re.compile(r"^(\d+|[0-9a-fA-F-]{16,}|.{32,})$")
+
+
+def endpoint_label(url, host=None):
+    """
+    Reduce a request url to a low cardinality endpoint label.
+
+    The host and query string are dropped and path segments that look like ids, uuids or task ids are
+    replaced with ``:id``. Urls on a different host than `host`, e.g. signed S3 urls, are grouped by
+    their host only.
+
+    >>> endpoint_label("https://www.syncsketch.com/api/v1/project/123/?limit=1")
+    "/api/v1/project/:id/"
+
+    :param str url: Full url or path
+    :param str host: (Optional) SyncSketch host the client talks to
+    :return: Endpoint label
+    :rtype: str
+    """
+    parts = urlsplit(url)
+
+    if host and parts.netloc and parts.netloc != urlsplit(host).netloc:
+        return parts.netloc
+
+    return "/".join(
+        ":id" if _ID_SEGMENT_RE.match(segment) else segment for segment in (parts.path or "/").split("/")
+    )
+
+
+class _Histogram(object):
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def snapshot(self):
+        cumulative = 0
+        buckets = []
+        for upper_bound, count in zip(list(self.buckets) + [float("inf")], self.counts):
+            cumulative += count
+            buckets.append((upper_bound, cumulative))
+
+        return {"buckets": buckets, "sum": self.sum, "count": self.count}
+
+
+class MetricsRegistry(object):
+    """
+    Thread safe registry of counters, gauges and fixed bucket histograms.
+    """
+
+    def __init__(self, latency_buckets=DEFAULT_LATENCY_BUCKETS):
+        """
+        :param tuple[float] latency_buckets: (Optional) Sorted histogram upper bounds in seconds
+        """
+        self.latency_buckets = tuple(sorted(latency_buckets))
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._gauges = {}
+        self._histograms = {}
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted(labels.items()))
+
+    def inc(self, name, value=1, **labels):
+        """
+        Increment a counter.
+
+        :param str name: Metric name
+        :param float value: Amount to add
+        :param labels: Metric labels
+        """
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        """
+        Set a gauge.
+
+        :param str name: Metric name
+        :param float value: New value
+        :param labels: Metric labels
+        """
+        key = self._key(name, labels)
+        with self._lock:
+            self._gauges[key] = value
+
+    def observe(self, name, value, **labels):
+        """
+        Add an observation to a histogram.
+
+        :param str name: Metric name
+        :param float value: Observed value
+        :param labels: Metric labels
+        """
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram(self.latency_buckets)
+            histogram.observe(value)
+
+    def record_request(self, method, url, duration, status_code=None, error=False, host=None):
+        """
+        Record a single HTTP request.
+
+        :param str method: HTTP method
+        :param str url: Request url
+        :param float duration: Request duration in seconds
+        :param int status_code: (Optional) Response status code, None if the request raised
+        :param bool error: (Optional) Count the request as an error regardless of status code
+        :param str host: (Optional) SyncSketch host, requests to other hosts are labeled by host only
+        """
+        labels = dict(method=method.upper(), endpoint=endpoint_label(url, host))
+        self.inc("syncsketch_requests_total", **labels)
+        self.observe("syncsketch_request_duration_seconds", duration, **labels)
+
+        if error or status_code is None or status_code >= 400:
+            self.inc("syncsketch_request_errors_total", **labels)
+
+    def record_upload(self, num_bytes, duration, num_parts=0):
+        """
+        Record a finished upload.
+
+        :param int num_bytes: Number of bytes uploaded
+        :param float duration: Upload duration in seconds
+        :param int num_parts: (Optional) Number of uploaded parts
+        """
+        self.inc("syncsketch_upload_bytes_total", num_bytes)
+        self.inc("syncsketch_upload_seconds_total", duration)
+        self.inc("syncsketch_upload_parts_total", num_parts)
+        if duration > 0:
+            self.set("syncsketch_upload_throughput_bytes_per_second", num_bytes / duration)
+
+    def record_part_retry(self):
+        """
+        Record a retried multipart upload part.
+        """
+        self.inc("syncsketch_upload_parts_retried_total")
+
+    def record_poll(self, task, duration):
+        """
+        Record the time spent waiting for a single server side task status check.
+
+        :param str task: Task name, e.g. "flattenedSketches"
+        :param float duration: Time spent in seconds, including the wait before the check
+        """
+        self.inc("syncsketch_task_polls_total", task=task)
+        self.inc("syncsketch_task_poll_seconds_total", duration, task=task)
+
+    def reset(self):
+        """
+        Drop all recorded values.
+        """
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+    def snapshot(self):
+        """
+        Return a plain dict copy of all metrics.
+
+        .. code:: python
+
+            # Example response
+            {
+                "counters": {"syncsketch_requests_total": [{"labels": {...}, "value": 3}]},
+                "gauges": {...},
+                "histograms": {
+                    "syncsketch_request_duration_seconds": [
+                        {"labels": {...}, "buckets": [(0.005, 0), ..., (inf, 3)], "sum": 0.42, "count": 3}
+                    ]
+                },
+            }
+
+        :return: Snapshot of all metrics
+        :rtype: dict
+        """
+        result = {"counters": {}, "gauges": {}, "histograms": {}}
+
+        with self._lock:
+            for (name, labels), value in self._counters.items():
+                result["counters"].setdefault(name, []).append({"labels": dict(labels), "value": value})
+
+            for (name, labels), value in self._gauges.items():
+                result["gauges"].setdefault(name, []).append({"labels": dict(labels), "value": value})
+
+            for (name, labels), histogram in self._histograms.items():
+                entry = histogram.snapshot()
+                entry["labels"] = dict(labels)
+                result["histograms"].setdefault(name, []).append(entry)
+
+        return result
+
+    def to_prometheus(self):
+        """
+        Export all metrics in the Prometheus text exposition format (version 0.0.4).
+
+        :return: Exposition text
+        :rtype: str
+        """
+        snapshot = self.snapshot()
+        lines = []
+
+        def format_labels(labels, extra=None):
+            items = sorted(labels.items())
+            if extra:
+                items.append(extra)
+            if not items:
+                return ""
+            return "{%s}" % ",".join('%s="%s"' % (key, _escape_label(value)) for key, value in items)
+
+        def describe(name, default_type):
+            metric_type, help_text = METRIC_TYPES.get(name, (default_type, ""))
+            if help_text:
+                lines.append("# HELP %s %s" % (name, help_text))
+            lines.append("# TYPE %s %s" % (name, metric_type))
+
+        for group, metric_type in (("counters", "counter"), ("gauges", "gauge")):
+            for name in sorted(snapshot[group]):
+                describe(name, metric_type)
+                for entry in snapshot[group][name]:
+                    lines.append(
+                        "%s%s %s" % (name, format_labels(entry["labels"]), _format_value(entry["value"]))
+                    )
+
+        for name in sorted(snapshot["histograms"]):
+            describe(name, "histogram")
+            for entry in snapshot["histograms"][name]:
+                for upper_bound, count in entry["buckets"]:
+                    lines.append(
+                        "%s_bucket%s %s"
+                        % (name, format_labels(entry["labels"], ("le", _format_value(upper_bound))), count)
+                    )
+                lines.append("%s_sum%s %s" % (name, format_labels(entry["labels"]), _format_value(entry["sum"])))
+                lines.append("%s_count%s %s" % (name, format_labels(entry["labels"]), entry["count"]))
+
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(value)
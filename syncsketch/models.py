@@ -0,0 +1,328 @@
+# -*- coding: utf-8 -*-
+"""
+Optional lazy object layer over :class:`syncsketch.SyncSketchAPI`.
+
+A :class:`Session` hands out :class:`Project`, :class:`Review`, :class:`Item` and :class:`Frame` objects. Every
+entity is loaded at most once per session (identity map), related collections are fetched page by page on first
+access, and fields that were not loaded yet are fetched on demand, using the ``fields`` projection of the REST API.
+When a field is missing on an entity that came from a collection, it is fetched for the whole collection at once.
+
+.. code:: python
+
+    from syncsketch.models import Session
+
+    session = Session(s)
+    for project in session.projects():
+        for review in project.reviews:
+            for item in review.items:
+                print(project.name, review.name, item.name, len(item.frames(review)))
+
+    # the same object, nothing is fetched again
+    assert session.review(review.id) is review
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import re
+import threading
+
+# maximum number of ids per batched request
+BATCH_SIZE = 100
+
+_RESOURCE_ID = re.compile(r"/api/v\d+/\w+/(\d+)/?$")
+
+
+def resource_id(value):
+    """
+    Return the id of a related entity from its resource uri, id or nested dict, None if there is none.
+
+    :param value: e.g. "/api/v1/project/12/", 12 or {"id": 12, ...}
+    :rtype: Optional[int]
+    """
+    if isinstance(value, dict):
+        value = value.get("id", value.get("resource_uri"))
+    if isinstance(value, int):
+        return value
+    if value:
+        match = _RESOURCE_ID.search(str(value))
+        if match:
+            return int(match.group(1))
+    return None
+
+
+class Entity(object):
+    """
+    Base class of the lazy entities. Fields are read as attributes or by key, e.g. ``review.name`` or
+    ``review["name"]``.
+    """
+
+    # REST endpoint of the entity type, set on the subclasses
+    endpoint = None
+
+    def __init__(self, session, entity_id):
+        self._session = session
+        self.id = entity_id
+        self._data = {"id": entity_id}
+        # True once all fields were loaded
+        self._complete = False
+        # entities loaded in the same listing, missing fields are fetched for all of them at once
+        self._siblings = None
+        self._collections = {}
+
+    def __repr__(self):
+        name = self._data.get("name")
+        return "<%s %s%s>" % (type(self).__name__, self.id, " %r" % name if name else "")
+
+    def _merge(self, data, complete=False):
+        self._data.update(data)
+        if complete:
+            self._complete = True
+
+    def _get_field(self, name):
+        if name not in self._data and not self._complete:
+            self._session._fetch_field(self, name)
+        return self._data[name]
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return self._get_field(name)
+        except KeyError:
+            raise AttributeError("{} has no field {!r}".format(type(self).__name__, name))
+
+    def __getitem__(self, name):
+        return self._get_field(name)
+
+    def get(self, name, default=None):
+        try:
+            return self._get_field(name)
+        except KeyError:
+            return default
+
+    def load(self, fields=None):
+        """
+        Fetch fields of this entity now, all fields when `fields` is omitted. Loaded fields are fetched again.
+
+        :param list[str] fields: (Optional) Fields to fetch
+        :return: self
+        """
+        self._session._fetch([self], fields)
+        return self
+
+    def to_dict(self):
+        """
+        Return the fields loaded so far.
+
+        :rtype: dict
+        """
+        return dict(self._data)
+
+    def _collection(self, name, load):
+        with self._session._lock:
+            if name not in self._collections:
+                self._collections[name] = load()
+            return self._collections[name]
+
+
+class Project(Entity):
+    endpoint = "/api/v1/project/"
+
+    @property
+    def reviews(self):
+        """
+        Reviews of the project, fetched on first access.
+
+        :rtype: list[Review]
+        """
+        return self._collection(
+            "reviews",
+            lambda: self._session._load_pages(
+                Review,
+                lambda limit, offset: self._session.api.get_reviews_by_project_id(self.id, limit=limit, offset=offset),
+            ),
+        )
+
+
+class Review(Entity):
+    endpoint = "/api/v1/review/"
+
+    @property
+    def project(self):
+        """
+        :rtype: Optional[Project]
+        """
+        project_id = resource_id(self.get("project"))
+        return self._session.project(project_id) if project_id is not None else None
+
+    @property
+    def items(self):
+        """
+        Items of the review, fetched on first access.
+
+        :rtype: list[Item]
+        """
+
+        def load():
+            rows = self._session.api._get_all_review_items(self.id, None)
+            return self._session._wrap(Item, rows or [])
+
+        return self._collection("items", load)
+
+
+class Item(Entity):
+    endpoint = "/api/v1/item/"
+
+    def frames(self, review=None):
+        """
+        Sketches and comments of the item, fetched once per review.
+
+        :param review: (Optional) Review or review id to get the annotations of, RECOMMENDED
+        :rtype: list[Frame]
+        """
+        review_id = review.id if isinstance(review, Review) else review
+
+        def load():
+            response = self._session.api.get_annotations(self.id, review_id=review_id or False)
+            return self._session._wrap(Frame, (response or {}).get("objects", []))
+
+        return self._collection(("frames", review_id), load)
+
+
+class Frame(Entity):
+    endpoint = "/api/v1/frame/"
+
+    @property
+    def item(self):
+        """
+        :rtype: Optional[Item]
+        """
+        item_id = resource_id(self.get("item"))
+        return self._session.item(item_id) if item_id is not None else None
+
+
+class Session(object):
+    """
+    Identity map and factory of lazy entities for one API client. Thread safe.
+    """
+
+    def __init__(self, api, page_size=100):
+        """
+        :param syncsketch.SyncSketchAPI api: API client
+        :param int page_size: (Optional) Number of entities per page when a collection is fetched
+        """
+        self.api = api
+        self.page_size = page_size
+        self._lock = threading.RLock()
+        # (entity class, id) -> entity
+        self._identity = {}
+
+    def get(self, cls, entity_id, data=None, complete=False):
+        """
+        Return the entity of a type and id, creating it on first use. Nothing is fetched.
+
+        :param type cls: Project, Review, Item or Frame
+        :param int entity_id: Entity id
+        :param dict data: (Optional) Known fields to merge into the entity
+        :param bool complete: (Optional) `data` has all fields of the entity
+        :rtype: Entity
+        """
+        with self._lock:
+            entity = self._identity.get((cls, entity_id))
+            if entity is None:
+                entity = self._identity[(cls, entity_id)] = cls(self, entity_id)
+            if data:
+                entity._merge(data, complete)
+            return entity
+
+    def project(self, project_id):
+        return self.get(Project, project_id)
+
+    def review(self, review_id):
+        return self.get(Review, review_id)
+
+    def item(self, item_id):
+        return self.get(Item, item_id)
+
+    def frame(self, frame_id):
+        return self.get(Frame, frame_id)
+
+    def projects(self, **kwargs):
+        """
+        Return all projects the user has access to, see SyncSketchAPI.get_projects for the arguments.
+
+        :rtype: list[Project]
+        """
+        kwargs.pop("limit", None)
+        kwargs.pop("offset", None)
+        return self._load_pages(
+            Project, lambda limit, offset: self.api.get_projects(limit=limit, offset=offset, **kwargs)
+        )
+
+    def clear(self):
+        """
+        Forget all entities, so everything is fetched again.
+        """
+        with self._lock:
+            self._identity.clear()
+
+    def _wrap(self, cls, rows):
+        entities = [self.get(cls, row["id"], row) for row in rows if isinstance(row, dict) and "id" in row]
+        for entity in entities:
+            entity._siblings = entities
+        return entities
+
+    def _load_pages(self, cls, fetch_page):
+        rows = []
+        offset = 0
+        while True:
+            response = fetch_page(self.page_size, offset)
+            if not isinstance(response, dict):
+                break
+            rows.extend(response.get("objects", []))
+            if not response.get("meta", {}).get("next"):
+                break
+            offset += self.page_size
+        return self._wrap(cls, rows)
+
+    def _fetch_field(self, entity, name):
+        """
+        Fetch a missing field, for all siblings of the entity that miss it in one request per batch. Falls back to
+        loading the entity completely if the field did not come back.
+        """
+        siblings = entity._siblings or [entity]
+        with self._lock:
+            missing = [other for other in siblings if name not in other._data and not other._complete]
+        if entity not in missing:
+            missing.append(entity)
+
+        self._fetch(missing, [name])
+
+        if name not in entity._data and not entity._complete:
+            self._fetch([entity], None)
+
+    def _fetch(self, entities, fields):
+        """
+        Fetch `fields` (all fields when None) of entities of one type, batched by id.
+        """
+        cls = type(entities[0])
+        if len(entities) == 1:
+            get_params = {}
+            if fields:
+                self.api._update_params("fields", list(fields) + ["id"], get_params)
+            data = self.api._get_json_response("%s%s/" % (cls.endpoint, entities[0].id), getData=get_params)
+            if isinstance(data, dict) and data.get("id") == entities[0].id:
+                self.get(cls, entities[0].id, data, complete=not fields)
+            return
+
+        for start in range(0, len(entities), BATCH_SIZE):
+            batch = entities[start : start + BATCH_SIZE]
+            get_params = {"id__in": ",".join(str(entity.id) for entity in batch), "limit": len(batch)}
+            if fields:
+                self.api._update_params("fields", list(fields) + ["id"], get_params)
+            response = self.api._get_json_response(cls.endpoint, getData=get_params)
+
+            wanted = set(entity.id for entity in batch)
+            for row in (response or {}).get("objects", []):
+                if isinstance(row, dict) and row.get("id") in wanted:
+                    self.get(cls, row["id"], row, complete=not fields)
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""
+Helpers for :meth:`syncsketch.SyncSketchAPI.reorder_review_items`, which sorts the items of a review and only
+sends the sortorder values that have to change.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import bisect
+import re
+
+_DIGITS = re.compile(r"(\d+)")
+
+
+def natural_sort_key(value):
+    """
+    Sort key that orders numbers in strings by value and ignores case, e.g. "sh2" before "SH10".
+
+    :param str value: String to sort
+    :rtype: tuple
+    """
+    parts = _DIGITS.split(value.lower() if value else "")
+    # (0, number) and (1, text) pairs never compare a number with a string
+    return tuple((0, int(part)) if i % 2 else (1, part) for i, part in enumerate(parts) if part)
+
+
+def item_name_key(item):
+    """
+    Default reorder key, the natural sort key of the item name.
+    """
+    return natural_sort_key(item.get("name"))
+
+
+def sortorder_changes(items):
+    """
+    Return the fewest sortorder updates that put `items` in the given order.
+
+    Items keep their current sortorder when it is already in the right place relative to the items that keep
+    theirs and there are enough free sortorder values in between for the moved items. Kept items are a longest
+    non-decreasing subsequence of sortorder - position, found in O(n log n), and the moved items get consecutive
+    values right after the kept item before them. Sortorder values stay non-negative integers.
+
+    :param list[dict] items: Items with "id" and current "sortorder", in the target order
+    :return: Changed items as [{"id": int, "sortorder": int}], in the target order
+    :rtype: list[dict]
+    """
+    # candidates that can keep their sortorder: it is an int and leaves room for the items before it
+    slack = []
+    for position, item in enumerate(items):
+        sortorder = item.get("sortorder")
+        if isinstance(sortorder, int) and sortorder >= position:
+            slack.append((position, sortorder - position))
+
+    # longest non-decreasing subsequence of slack, tails[k] is the smallest tail of a subsequence of length k + 1
+    tails = []
+    tail_index = []
+    previous = {}
+    for position, value in slack:
+        k = bisect.bisect_right(tails, value)
+        if k == len(tails):
+            tails.append(value)
+            tail_index.append(position)
+        else:
+            tails[k] = value
+            tail_index[k] = position
+        previous[position] = tail_index[k - 1] if k else None
+
+    kept = set()
+    position = tail_index[-1] if tail_index else None
+    while position is not None:
+        kept.add(position)
+        position = previous[position]
+
+    changes = []
+    next_sortorder = 0
+    for position, item in enumerate(items):
+        if position in kept:
+            next_sortorder = item["sortorder"] + 1
+            continue
+        if item.get("sortorder") != next_sortorder:
+            changes.append({"id": item["id"], "sortorder": next_sortorder})
+        next_sortorder += 1
+
+    return changes
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""
+Progress reporting for long running transfers.
+
+Methods that upload or download files take a ``progress_callback``. It is called with a :class:`Progress` at most
+every quarter second while the transfer runs, and always once at the end with status "done" or "failed".
+
+.. code:: python
+
+    def on_progress(progress):
+        print("{status}: {bytes_done}/{total_bytes} bytes, {smoothed_rate:.0f} B/s, eta {eta}".format(
+            **progress._asdict()))
+
+    s.upload_file(review_id, "/tmp/large.mov", progress_callback=on_progress)
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import threading
+import time
+from collections import namedtuple
+
+# Python 2 has no monotonic clock
+_clock = getattr(time, "monotonic", time.time)
+
+DEFAULT_MIN_INTERVAL = 0.25
+
+Progress = namedtuple(
+    "Progress",
+    [
+        # "uploading", "downloading", "waiting" (for a server side task), "done" or "failed"
+        "status",
+        "bytes_done",
+        # None when unknown
+        "total_bytes",
+        "parts_done",
+        "total_parts",
+        # bytes per second since the previous update
+        "rate",
+        # exponentially smoothed bytes per second
+        "smoothed_rate",
+        # seconds left at the smoothed rate, None when unknown
+        "eta",
+        "elapsed",
+    ],
+)
+
+
+class ProgressReporter(object):
+    """
+    Thread safe progress counter that calls a callback with a :class:`Progress` at a limited rate.
+
+    The callback is called from the thread that made the update, one call at a time, so keep it quick.
+    """
+
+    def __init__(
+        self,
+        callback,
+        total_bytes=None,
+        total_parts=None,
+        status="uploading",
+        min_interval=DEFAULT_MIN_INTERVAL,
+        smoothing=0.3,
+    ):
+        """
+        :param callback: Called with a Progress
+        :param int total_bytes: (Optional) Size of the transfer, if known
+        :param int total_parts: (Optional) Number of parts of the transfer
+        :param str status: (Optional) Initial status
+        :param float min_interval: (Optional) Minimum seconds between two calls of the callback
+        :param float smoothing: (Optional) Weight of the latest rate in the smoothed rate, between 0 and 1
+        """
+        self.callback = callback
+        self.total_bytes = total_bytes
+        self.total_parts = total_parts
+        self.status = status
+        self.min_interval = min_interval
+        self.smoothing = smoothing
+
+        self.bytes_done = 0
+        self.parts_done = 0
+        self.smoothed_rate = 0.0
+
+        self._lock = threading.Lock()
+        self._start = self._last_time = _clock()
+        self._last_bytes = 0
+        self._finished = False
+
+    def update(self, num_bytes=0, parts=0, status=None, force=False):
+        """
+        Add transferred bytes (negative to take back the bytes of a failed attempt) and completed parts.
+
+        :param int num_bytes: (Optional) Bytes transferred since the last update
+        :param int parts: (Optional) Parts completed since the last update
+        :param str status: (Optional) New status
+        :param bool force: (Optional) Call the callback even if the last call was less than min_interval ago
+        """
+        with self._lock:
+            self.bytes_done += num_bytes
+            self.parts_done += parts
+            if status is not None:
+                self.status = status
+
+            now = _clock()
+            if self._finished or not (force or now - self._last_time >= self.min_interval):
+                return
+            self._emit(now)
+
+    def set_total(self, total_bytes=None, total_parts=None):
+        with self._lock:
+            if total_bytes is not None:
+                self.total_bytes = total_bytes
+            if total_parts is not None:
+                self.total_parts = total_parts
+
+    def finish(self, ok=True):
+        """
+        Report the final state, once.
+
+        :param bool ok: (Optional) False if the transfer failed
+        """
+        with self._lock:
+            if self._finished:
+                return
+            self.status = "done" if ok else "failed"
+            self._emit(_clock())
+            self._finished = True
+
+    def _emit(self, now):
+        interval = now - self._last_time
+        rate = (self.bytes_done - self._last_bytes) / interval if interval > 0 else 0.0
+        if self._last_bytes == 0 and self.smoothed_rate == 0.0:
+            self.smoothed_rate = rate
+        else:
+            self.smoothed_rate = self.smoothing * rate + (1 - self.smoothing) * self.smoothed_rate
+
+        eta = None
+        if self.total_bytes is not None and self.smoothed_rate > 0:
+            eta = max(0, self.total_bytes - self.bytes_done) / self.smoothed_rate
+
+        self._last_time = now
+        self._last_bytes = self.bytes_done
+
+        progress = Progress(
+            self.status,
+            self.bytes_done,
+            self.total_bytes,
+            self.parts_done,
+            self.total_parts,
+            rate,
+            self.smoothed_rate,
+            eta,
+            now - self._start,
+        )
+        try:
+            self.callback(progress)
+        except Exception as e:
+            print("Progress callback failed: {}".format(e))
+
+    def wrap(self, body):
+        """
+        Wrap a file-like request body so the bytes read from it are reported.
+
+        :rtype: CountingReader
+        """
+        return CountingReader(body, self)
+
+
+class CountingReader(object):
+    """
+    File-like request body that reports every block read from the wrapped body to a ProgressReporter.
+    """
+
+    def __init__(self, body, reporter):
+        self._body = body
+        self._reporter = reporter
+        self.bytes_read = 0
+
+    def __len__(self):
+        return len(self._body)
+
+    def read(self, size=-1):
+        data = self._body.read(size)
+        self.bytes_read += len(data)
+        self._reporter.update(len(data))
+        return data
+
+    def tell(self):
+        return self._body.tell()
+
+    def close(self):
+        if hasattr(self._body, "close"):
+            self._body.close()
+
+    def rollback(self):
+        """
+        Take back the reported bytes, e.g. before a failed part is retried.
+        """
+        self._reporter.update(-self.bytes_read)
+        self.bytes_read = 0
@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+"""
+Compact read only records for large result sets.
+
+``get_media``, ``get_items_by_review_id`` and ``get_tree`` take ``as_records=True`` to return rows as
+:class:`Record` objects instead of dicts. Rows with the same fields share one generated ``__slots__`` class, so a
+row stores only its values. Repeated short strings such as statuses and types, and repeated nested objects such as
+the creator of many items, are stored once.
+
+Records read like the dicts they replace, by key or by attribute:
+
+.. code:: python
+
+    items = s.get_media({"reviews__id": review_id, "limit": 1000}, as_records=True)["objects"]
+    item = items[0]
+    item["name"] == item.name
+    item.get("thumbnail_url")
+    item.creator.name
+    item.to_dict()  # plain dicts, e.g. for json.dumps
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import keyword
+import re
+import threading
+
+try:
+    # Python 2
+    string_types = (str, unicode)  # noqa: F821
+    integer_types = (int, long)  # noqa: F821
+except NameError:
+    # Python 3
+    string_types = (str,)
+    integer_types = (int,)
+
+# values nested records are compared by, other values (lists, records) by identity
+_SCALAR_TYPES = (type(None), bool, float) + integer_types + string_types
+
+# strings up to this length are stored once per conversion, longer ones are usually unique (urls, descriptions)
+MAX_SHARED_STRING_LENGTH = 64
+
+_IDENTIFIER = re.compile(r"^[A-Za-z][A-Za-z0-9_]*$")
+
+
+class Record(object):
+    """
+    Base class of the generated record types. Behaves like a read only dict with attribute access.
+
+    Nested records can be shared by many rows, don't modify them, use :meth:`to_dict` for a mutable copy.
+    """
+
+    __slots__ = ()
+
+    # set on the generated classes
+    _fields = ()
+    _slot_names = ()
+    _slots = {}
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, self._slots[key])
+        except KeyError:
+            raise KeyError(key)
+
+    def __getattr__(self, name):
+        # only called for fields whose names are not valid attribute names, e.g. getattr(record, "x-y")
+        slot = self._slots.get(name)
+        if slot is None or slot == name:
+            raise AttributeError(name)
+        return getattr(self, slot)
+
+    def get(self, key, default=None):
+        slot = self._slots.get(key)
+        return default if slot is None else getattr(self, slot)
+
+    def keys(self):
+        return list(self._fields)
+
+    def values(self):
+        return [getattr(self, slot) for slot in self._slot_names]
+
+    def items(self):
+        return list(zip(self._fields, self.values()))
+
+    def __contains__(self, key):
+        return key in self._slots
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __len__(self):
+        return len(self._fields)
+
+    def __eq__(self, other):
+        if isinstance(other, (Record, dict)):
+            return self.to_dict() == (other.to_dict() if isinstance(other, Record) else other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "Record(%s)" % ", ".join("%s=%r" % item for item in self.items())
+
+    def to_dict(self):
+        """
+        Return the record, and all records nested in it, as plain dicts.
+
+        :rtype: dict
+        """
+        return dict((field, _to_plain(value)) for field, value in self.items())
+
+
+_reserved = set(dir(Record))
+_record_types = {}
+_record_types_lock = threading.Lock()
+
+
+def record_type(fields):
+    """
+    Return the record class for a tuple of field names, creating it on first use.
+
+    :param tuple fields: Field names in order
+    :rtype: type
+    """
+    cls = _record_types.get(fields)
+    if cls is not None:
+        return cls
+
+    slot_names = []
+    for index, field in enumerate(fields):
+        if _IDENTIFIER.match(field) and not keyword.iskeyword(field) and field not in _reserved:
+            slot_names.append(str(field))
+        else:
+            slot_names.append("_f%d" % index)
+
+    with _record_types_lock:
+        cls = _record_types.get(fields)
+        if cls is None:
+            cls = _record_types[fields] = type(
+                str("Record"),
+                (Record,),
+                {
+                    "__slots__": tuple(slot_names),
+                    "_fields": fields,
+                    "_slot_names": tuple(slot_names),
+                    "_slots": dict(zip(fields, slot_names)),
+                },
+            )
+    return cls
+
+
+def to_records(data):
+    """
+    Convert dicts, also nested in lists and other dicts, to records.
+
+    :param data: JSON data
+    :return: The same structure with records instead of dicts
+    """
+    # shared strings and floats, and nested records with the same values, e.g. the creator of many items
+    shared = {}
+
+    def convert(value, nested):
+        if isinstance(value, dict):
+            cls = record_type(tuple(value))
+            values = [convert(field_value, True) for field_value in value.values()]
+
+            key = None
+            if nested:
+                # scalars are compared by type and value, so True, 1 and 1.0 stay apart while equal ids that json
+                # decoded to different int objects match, nested records are already the same object here
+                key = (cls,) + tuple(
+                    (type(field_value), field_value) if isinstance(field_value, _SCALAR_TYPES) else id(field_value)
+                    for field_value in values
+                )
+                record = shared.get(key)
+                if record is not None:
+                    return record
+
+            record = cls.__new__(cls)
+            for slot, field_value in zip(cls._slot_names, values):
+                setattr(record, slot, field_value)
+            if key is not None:
+                shared[key] = record
+            return record
+        if isinstance(value, list):
+            return [convert(element, nested) for element in value]
+        if isinstance(value, float) or (
+            isinstance(value, string_types) and len(value) <= MAX_SHARED_STRING_LENGTH
+        ):
+            return shared.setdefault(value, value)
+        return value
+
+    return convert(data, False)
+
+
+def listing_to_records(response):
+    """
+    Convert the "objects" of a listing response to records, leaving "meta" a plain dict.
+
+    :param dict response: Listing response
+    :rtype: dict
+    """
+    if isinstance(response, dict) and isinstance(response.get("objects"), list):
+        response = dict(response)
+        response["objects"] = to_records(response["objects"])
+    return response
+
+
+def _to_plain(value):
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [_to_plain(element) for element in value]
+    return value
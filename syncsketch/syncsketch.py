@@ -6,13 +6,22 @@
 
 from __future__ import absolute_import, division, print_function
 
-import json
-import mimetypes
 import os
+import threading
 import time
 from io import open
 
-import requests
+from .bandwidth import BandwidthLimiter
+from .compression import RequestCompression, accept_encoding
+from .fieldprofiles import FieldProfiles, entity_for_url
+from .formdata import MultipartFormData
+from .jsoncodec import get_codec
+from .metrics import endpoint_label
+from .ordering import item_name_key, sortorder_changes
+from .progress import ProgressReporter
+from .records import listing_to_records, to_records
+from .tracing import Tracer, trace_public_methods
+from .uploads import DEFAULT_CHUNK_SIZE, MultipartUpload, UploadScheduler
 
 try:
     # Python 2
@@ -21,58 +30,31 @@ except ImportError:
     # Python 3
     from urllib.parse import urlencode
 
-# Import appropriate threading/queue modules for Python 2/3 compatibility
 try:
     # Python 3
     from queue import Queue
-    from concurrent.futures import ThreadPoolExecutor
 except ImportError:
     # Python 2
     from Queue import Queue
-    import threading
-
-    # Define a simple ThreadPoolExecutor-like class for Python 2
-    class ThreadPoolExecutor(object):
-        def __init__(self, max_workers):
-            self.max_workers = max_workers
-            self.tasks = Queue()
-            self.results = {}
-            self.workers = []
-
-        def submit(self, fn, *args, **kwargs):
-            task_id = len(self.results)
-            self.tasks.put((task_id, fn, args, kwargs))
-            self.results[task_id] = None
-            return task_id
-
-        def _worker(self):
-            while not self.tasks.empty():
-                try:
-                    task_id, fn, args, kwargs = self.tasks.get(block=False)
-                    self.results[task_id] = fn(*args, **kwargs)
-                except:
-                    pass
 
-        def __enter__(self):
-            for _ in range(self.max_workers):
-                worker = threading.Thread(target=self._worker)
-                worker.daemon = True
-                worker.start()
-                self.workers.append(worker)
-            return self
 
-        def __exit__(self, exc_type, exc_val, exc_tb):
-            for worker in self.workers:
-                worker.join()
+# bulk item requests with more items are split into batches
+BULK_BATCH_SIZE = 500
+
 
-        def result(self, task_id):
-            return self.results.get(task_id)
+def thread_pool(max_workers):
+    """
+    Return a ThreadPoolExecutor, loading concurrent.futures on first use to keep ``import syncsketch`` fast.
+    """
+    from .executor import ThreadPoolExecutor
 
+    return ThreadPoolExecutor(max_workers)
 
 # NOTE - PLEASE INSTALL THE REQUEST MODULE FOR UPLOADING MEDIA
 # http://docs.python-requests.org/en/latest/user/install/#install
 
 
+@trace_public_methods
 class SyncSketchAPI:
     """
     Convenience API to communicate with the SyncSketch Service for collaborative online reviews
@@ -87,6 +69,14 @@ class SyncSketchAPI:
         debug=False,
         api_version="v1",
         use_header_auth=False,
+        metrics=None,
+        tracer_provider=None,
+        transport=None,
+        bandwidth=None,
+        field_profiles=None,
+        field_sampler=None,
+        compress_requests=False,
+        json_backend=None,
     ):
         """
         Setup the SyncSketch API class.
@@ -98,6 +88,14 @@ class SyncSketchAPI:
         :param bool debug: (Optional) Print debug information
         :param str api_version: (Optional) The version of the API to use
         :param bool use_header_auth: (Optional) Use header authentication instead of query parameters
+        :param syncsketch.metrics.MetricsRegistry metrics: (Optional) Registry to record request, upload and polling metrics in
+        :param tracer_provider: (Optional) OpenTelemetry TracerProvider for tracing spans, defaults to the global provider
+        :param transport: (Optional) Object with a requests.request compatible `request` method used to send all HTTP requests, e.g. from syncsketch.transport. Defaults to the requests module
+        :param syncsketch.bandwidth.BandwidthLimiter bandwidth: (Optional) Upload and download limits, can be shared between clients. Defaults to an unlimited limiter in `self.bandwidth`
+        :param syncsketch.fieldprofiles.FieldProfiles field_profiles: (Optional) Named field profiles and the profile getters use when `fields` is omitted. Defaults to all fields
+        :param syncsketch.fieldprofiles.FieldSampler field_sampler: (Optional) Record which fields of GET responses are read, to tune the field profiles
+        :param bool|syncsketch.compression.RequestCompression compress_requests: (Optional) Gzip JSON request bodies larger than 16KB, or pass a RequestCompression to tune the threshold and level. Only for servers that accept compressed request bodies
+        :param str json_backend: (Optional) "orjson", "ujson" or "json", defaults to the fastest installed, see syncsketch.jsoncodec
         :return: SyncSketchAPI
         :rtype: SyncSketchAPI
         """
@@ -125,8 +123,46 @@ class SyncSketchAPI:
 
         self.api_version = api_version
         self.debug = debug
+        self.metrics = metrics
+        self.tracer = Tracer(tracer_provider)
+        # the requests module is imported on the first request, see transport
+        self._transport = transport
+        self.bandwidth = bandwidth or BandwidthLimiter()
+        self.field_profiles = field_profiles or FieldProfiles()
+        self.field_sampler = field_sampler
+        if compress_requests is True:
+            compress_requests = RequestCompression()
+        self.request_compression = compress_requests or None
+        # the JSON backend is imported on the first request body or response, see json_codec
+        self._json_backend = json_backend
+        self._json_codec = None
         self.HOST = host.rstrip("/")
 
+    @property
+    def json_codec(self):
+        """
+        syncsketch.jsoncodec.JSONCodec that encodes request bodies and decodes responses.
+        """
+        if self._json_codec is None:
+            self._json_codec = get_codec(self._json_backend)
+        return self._json_codec
+
+    @property
+    def transport(self):
+        """
+        Object with a requests.request compatible `request` method that sends all HTTP requests, the requests module
+        unless another transport was passed.
+        """
+        if self._transport is None:
+            import requests
+
+            self._transport = requests
+        return self._transport
+
+    @transport.setter
+    def transport(self, transport):
+        self._transport = transport
+
     def get_api_base_url(self, api_version=None):
         return self.join_url_path(self.HOST, "/api/{}/".format(api_version or self.api_version))
 
@@ -159,6 +195,52 @@ class SyncSketchAPI:
             return path
         return self.join_url_path(self.HOST, path)
 
+    def _record_request(self, method, url, start_time, response=None):
+        if self.metrics is None:
+            return
+
+        self.metrics.record_request(
+            method,
+            url,
+            time.time() - start_time,
+            status_code=response.status_code if response is not None else None,
+            host=self.HOST,
+        )
+
+    def _send(self, method, url, **kwargs):
+        """
+        Internal method. Send a single HTTP request, recording metrics and a tracing span for it.
+
+        File-like request bodies are read at the upload rate of `self.bandwidth`. Response bodies count against the
+        download rate once they are received, streamed responses should be read with `self.bandwidth.iter_content`.
+        """
+        start_time = time.time()
+        r = None
+        attributes = {"http.method": method.upper(), "http.url": url.split("?", 1)[0]}
+
+        if kwargs.get("data") is not None:
+            kwargs["data"] = self.bandwidth.throttle_body(kwargs["data"])
+
+        with self.tracer.span("HTTP %s %s" % (method.upper(), endpoint_label(url, self.HOST)), attributes) as span:
+            try:
+                r = self.transport.request(method, url, **kwargs)
+                span.set_attribute("http.status_code", r.status_code)
+                if not kwargs.get("stream"):
+                    self.bandwidth.download.consume(len(r.content or b""))
+                return r
+            finally:
+                self._record_request(method, url, start_time, r)
+
+    def _json_body(self, payload, headers):
+        """
+        Internal method. Encode a JSON request body, gzip compressed when request compression is on and the body is
+        large enough, in which case Content-Encoding is set in `headers`.
+        """
+        body = self.json_codec.dumps(payload)
+        if self.request_compression is None:
+            return body
+        return self.request_compression.compress(body, headers)
+
     def _get_json_response(
         self,
         url,
@@ -177,6 +259,8 @@ class SyncSketchAPI:
         # Update headers with custom content-type
         headers = self.headers.copy()
         headers["Content-Type"] = content_type
+        # ask for every response encoding the installed decoders support, e.g. br when brotli is installed
+        headers["Accept-Encoding"] = accept_encoding()
 
         if getData:
             params.update(getData)
@@ -184,22 +268,25 @@ class SyncSketchAPI:
         method = method or "get"
         if postData or method == "post":
             method = "post"
-            r = requests.post(
+            r = self._send(
+                method,
                 url,
                 params=params,
-                data=json.dumps(postData) if postData else None,
+                data=self._json_body(postData, headers) if postData else None,
                 headers=headers,
             )
         elif patchData or method == "patch":
             method = "patch"
-            r = requests.patch(url, params=params, json=patchData, headers=headers)
+            body = self._json_body(patchData, headers) if patchData is not None else None
+            r = self._send(method, url, params=params, data=body, headers=headers)
         elif putData or method == "put":
             method = "put"
-            r = requests.put(url, params=params, json=putData, headers=headers)
+            body = self._json_body(putData, headers) if putData is not None else None
+            r = self._send(method, url, params=params, data=body, headers=headers)
         elif method == "delete":
-            r = requests.delete(url, params=params, headers=headers)
+            r = self._send(method, url, params=params, headers=headers)
         else:
-            r = requests.get(url, params=params, headers=headers)
+            r = self._send(method, url, params=params, headers=headers)
 
         if self.debug:
             print(
@@ -217,7 +304,7 @@ class SyncSketchAPI:
             return r
 
         try:
-            return r.json()
+            data = self.json_codec.loads(r.content)
         except Exception as e:
             if self.debug:
                 print(e)
@@ -226,8 +313,17 @@ class SyncSketchAPI:
 
             return {"objects": []}
 
-    @staticmethod
-    def _update_params(key, value, params):
+        if self.field_sampler is not None and method == "get":
+            entity = entity_for_url(url)
+            if entity:
+                data = self.field_sampler.wrap(entity, data)
+        return data
+
+    def _update_params(self, key, value, params, entity=None):
+        if entity is not None:
+            # apply the field profile named by value, or the default profile when value is omitted
+            value = self.field_profiles.resolve(entity, value)
+
         if value:
             if isinstance(value, (list, tuple)):
                 value = ",".join(value)
@@ -255,17 +351,21 @@ class SyncSketchAPI:
             return r
         return r.status_code == 200
 
-    def get_tree(self, withItems=False, raw_response=False):
+    def get_tree(self, withItems=False, raw_response=False, as_records=False):
         """
         Get nested tree of account, projects, reviews and optionally items for the current user
 
         :param bool withItems: Include items in the response
         :param bool raw_response: Get whole response from REST API.
+        :param bool as_records: (Optional) Return compact read only records instead of dicts, see syncsketch.records
         :return: Tree data
         :rtype: dict
         """
         get_params = {"fetchItems": 1} if withItems else {}
-        return self._get_json_response("/api/v1/person/tree/", getData=get_params, raw_response=raw_response)
+        response = self._get_json_response("/api/v1/person/tree/", getData=get_params, raw_response=raw_response)
+        if as_records and not raw_response:
+            return to_records(response)
+        return response
 
     """
     Workspace / Account
@@ -275,13 +375,13 @@ class SyncSketchAPI:
         """
         Get a list of workspaces the user has access to
 
-        :param list|str|int|bool fields: fields to fetch from backend
+        :param list|str|int|bool fields: fields to fetch from backend, or a field profile name such as "minimal", "listing" or "full"
         :param bool raw_response: Get whole response from REST API.
         :return: List of workspaces the user has access to
         :rtype: list[dict]
         """
         get_params = {"active": 1}
-        self._update_params("fields", fields, get_params)
+        self._update_params("fields", fields, get_params, entity="account")
 
         return self._get_json_response("/api/v1/account/", getData=get_params, raw_response=raw_response)
 
@@ -354,7 +454,7 @@ class SyncSketchAPI:
         :param bool include_connections: if true, include full user connections on the project object
         :param int limit: limit the number of results
         :param int offset: offset the results
-        :param list|str|int|bool fields: fields to fetch from backend
+        :param list|str|int|bool fields: fields to fetch from backend, or a field profile name such as "minimal", "listing" or "full"
         :param bool raw_response: Get whole response from REST API.
         :return: Dict with meta information and an array of found projects
         :rtype: list[dict]
@@ -367,7 +467,7 @@ class SyncSketchAPI:
             "offset": offset,
         }
 
-        self._update_params("fields", fields, get_params)
+        self._update_params("fields", fields, get_params, entity="project")
 
         if include_connections:
             get_params["withFullConnections"] = True
@@ -389,13 +489,13 @@ class SyncSketchAPI:
         Get a list of projects by name
 
         :param str name: Name to search for
-        :param list|str|int|bool fields: fields to fetch from backend
+        :param list|str|int|bool fields: fields to fetch from backend, or a field profile name such as "minimal", "listing" or "full"
         :param bool raw_response: Get whole response from REST API.
         :return: List of projects
         :rtype: list[dict]
         """
         get_params = {"name__istartswith": name}
-        self._update_params("fields", fields, get_params)
+        self._update_params("fields", fields, get_params, entity="project")
 
         return self._get_json_response("/api/v1/project/", getData=get_params, raw_response=raw_response)
 
@@ -404,13 +504,13 @@ class SyncSketchAPI:
         Get single project by id
 
         :param int project_id: Project id
-        :param list|str|int|bool fields: fields to fetch from backend
+        :param list|str|int|bool fields: fields to fetch from backend, or a field profile name such as "minimal", "listing" or "full"
         :param bool raw_response: Get whole response from REST API.
         :return: Project data
         :rtype: dict
         """
         get_params = {}
-        self._update_params("fields", fields, get_params)
+        self._update_params("fields", fields, get_params, entity="project")
 
         return self._get_json_response(
             "/api/v1/project/%s/" % project_id,
@@ -580,7 +680,7 @@ class SyncSketchAPI:
         :param int project_id: SyncSketch project id
         :param int limit: Limit the number of results
         :param int offset: Offset the results
-        :param list|str|int|bool fields: fields to fetch from backend
+        :param list|str|int|bool fields: fields to fetch from backend, or a field profile name such as "minimal", "listing" or "full"
         :param bool raw_response: Get whole response from REST API.
         :return: Dict with meta information and an array of found projects
         :rtype: dict
@@ -592,7 +692,7 @@ class SyncSketchAPI:
             "limit": limit,
             "offset": offset,
         }
-        self._update_params("fields", fields, get_params)
+        self._update_params("fields", fields, get_params, entity="review")
 
         return self._get_json_response("/api/v1/review/", getData=get_params, raw_response=raw_response)
 
@@ -603,7 +703,7 @@ class SyncSketchAPI:
         :param str name: Name of the review
         :param int limit: Limit the number of results
         :param int offset: Offset the results
-        :param list|str|int|bool fields: fields to fetch from backend
+        :param list|str|int|bool fields: fields to fetch from backend, or a field profile name such as "minimal", "listing" or "full"
         :param bool raw_response: Get whole response from REST API.
         :return: Dict with meta information and an array of found projects
         """
@@ -613,7 +713,7 @@ class SyncSketchAPI:
             "limit": limit,
             "offset": offset,
         }
-        self._update_params("fields", fields, get_params)
+        self._update_params("fields", fields, get_params, entity="review")
 
         return self._get_json_response("/api/v1/review/", getData=get_params, raw_response=raw_response)
 
@@ -622,13 +722,13 @@ class SyncSketchAPI:
         Get single review by id.
 
         :param review_id: Number
-        :param list|str|int|bool fields: fields to fetch from backend
+        :param list|str|int|bool fields: fields to fetch from backend, or a field profile name such as "minimal", "listing" or "full"
         :param bool raw_response: Get whole response from REST API.
         :return: Review Data
         :rtype: dict
         """
         get_params = {}
-        self._update_params("fields", fields, get_params)
+        self._update_params("fields", fields, get_params, entity="review")
         return self._get_json_response(
             "/api/v1/review/%s/" % review_id,
             getData=get_params,
@@ -641,13 +741,13 @@ class SyncSketchAPI:
         UUID can be found in the review URL e.g. syncsketch.com/sketch/<uuid>/
 
         :param str uuid: UUID of the review.
-        :param list|str|int|bool fields: fields to fetch from backend
+        :param list|str|int|bool fields: fields to fetch from backend, or a field profile name such as "minimal", "listing" or "full"
         :param bool raw_response: Get whole response from REST API.
         :return: Review dict
         :rtype: dict
         """
         get_params = {"uuid": uuid}
-        self._update_params("fields", fields, get_params)
+        self._update_params("fields", fields, get_params, entity="review")
 
         response = self._get_json_response("/api/v1/review/", getData=get_params, raw_response=raw_response)
 
@@ -721,6 +821,89 @@ class SyncSketchAPI:
             raw_response=raw_response,
         )
 
+    def _get_all_review_items(self, review_id, fields, page_size=1000):
+        """
+        Internal method. Return all active items of a review, following every page, or None on failure.
+        """
+        items = []
+        get_params = {"reviews__id": review_id, "active": 1, "limit": page_size, "offset": 0}
+        self._update_params("fields", fields, get_params, entity="item")
+        while True:
+            response = self._get_json_response("/api/v1/item/", getData=get_params)
+            if not response or "objects" not in response:
+                print("Failed to fetch the items of review {}".format(review_id))
+                return None
+            items.extend(response["objects"])
+            if not response.get("meta", {}).get("next"):
+                return items
+            get_params["offset"] += page_size
+
+    def reorder_review_items(self, review_id, key=item_name_key, reverse=False, fields=None, dry_run=False):
+        """
+        Sort the items of a review by `key` and send only the sortorder values that change.
+
+        The current order is fetched with all pages of the review items. Keys are computed once per item, items
+        with equal keys keep their current relative order. Moving one item in a large review therefore updates
+        only that item, or the few items between it and the next free sortorder value.
+
+        .. code:: python
+
+            # natural sort by name, "sh2" before "sh10"
+            s.reorder_review_items(review_id)
+
+            # by a metadata field
+            s.reorder_review_items(review_id, key=lambda item: item["metadata"].get("cut_order", 0),
+                                   fields=["id", "sortorder", "metadata"])
+
+        :param int review_id: Review ID
+        :param key: (Optional) Function returning the sort key for an item dict, natural sort of the name by default
+        :param bool reverse: (Optional) Sort descending
+        :param list[str] fields: (Optional) Item fields `key` needs, "id", "name" and "sortorder" by default
+        :param bool dry_run: (Optional) Only compute the changes
+        :return: {"changes": [{"id": int, "sortorder": int}], "response": sort_review_items response or None}
+        :rtype: dict
+        """
+        fields = list(fields or ["id", "name", "sortorder"])
+        for field in ("id", "sortorder"):
+            if field not in fields:
+                fields.append(field)
+
+        items = self._get_all_review_items(review_id, fields)
+        if items is None:
+            return None
+
+        # current order first, so the stable sort keeps it for equal keys
+        items.sort(key=lambda item: (item.get("sortorder") is None, item.get("sortorder") or 0))
+        items.sort(key=key, reverse=reverse)
+
+        changes = sortorder_changes(items)
+        if dry_run or not changes:
+            return {"changes": changes, "response": None}
+
+        return {"changes": changes, "response": self.sort_review_items(review_id, changes)}
+
+    def _restore_review_item_order(self, review_id, item_ids):
+        """
+        Internal method. Put the items `item_ids` of a review in that order, reusing the sortorder values they
+        already have, so the other items of the review keep their place. Only changed values are sent.
+        """
+        items = self._get_all_review_items(review_id, ["id", "sortorder"])
+        if items is None:
+            print("Failed to restore the item order of review {}".format(review_id))
+            return None
+
+        sortorders = dict((item["id"], item.get("sortorder")) for item in items)
+        item_ids = [item_id for item_id in item_ids if sortorders.get(item_id) is not None]
+        slots = sorted(sortorders[item_id] for item_id in item_ids)
+        changes = [
+            {"id": item_id, "sortorder": sortorder}
+            for item_id, sortorder in zip(item_ids, slots)
+            if sortorders[item_id] != sortorder
+        ]
+        if not changes:
+            return None
+        return self.sort_review_items(review_id, changes)
+
     def archive_review(self, review_id, raw_response=True):
         """
         Archive a review
@@ -846,13 +1029,13 @@ class SyncSketchAPI:
 
         :param int item_id:
         :param dict data:
-        :param list|str|int|bool fields: fields to fetch from backend
+        :param list|str|int|bool fields: fields to fetch from backend, or a field profile name such as "minimal", "listing" or "full"
         :param bool raw_response: Get whole response from REST API.
         :return: Item data
         :rtype: dict
         """
-        get_params = data if data else {}
-        self._update_params("fields", fields, get_params)
+        get_params = dict(data or {})
+        self._update_params("fields", fields, get_params, entity="item")
 
         return self._get_json_response(
             "/api/v1/item/{}/".format(item_id),
@@ -935,6 +1118,7 @@ class SyncSketchAPI:
         file_name="",
         noConvertFlag=False,
         itemParentId=False,
+        progress_callback=None,
     ):
         """
         Convenience function to upload a file to a review. It will automatically create
@@ -947,6 +1131,7 @@ class SyncSketchAPI:
         :param str file_name: The name of the file. Please make sure to pass the correct file extension
         :param bool noConvertFlag: the video you are uploading is already in a browser compatible format
         :param int itemParentId: (Optional) set when you want to add a new version of an item. itemParentId is the id of the item you want to upload a new version for
+        :param progress_callback: (Optional) Called with a syncsketch.progress.Progress while the file is uploaded, see syncsketch.progress
         :return: Item data
         :rtype: dict
         """
@@ -964,19 +1149,25 @@ class SyncSketchAPI:
             urlencode(get_params),
         )
 
-        files = {"reviewFile": open(filepath, "rb")}
-        r = requests.post(
-            uploadURL,
-            files=files,
-            data=dict(artist=artist_name, name=file_name),
-            headers=self.headers,
-        )
+        body = MultipartFormData([("artist", artist_name), ("name", file_name)], {"reviewFile": filepath})
+        headers = dict(self.headers, **{"Content-Type": body.content_type})
+        progress = ProgressReporter(progress_callback, total_bytes=len(body)) if progress_callback else None
+        with body:
+            try:
+                r = self._send("post", uploadURL, data=progress.wrap(body) if progress else body, headers=headers)
+            except Exception:
+                if progress:
+                    progress.finish(ok=False)
+                raise
+
+        if progress:
+            progress.finish(ok=r.ok)
 
         if self.debug:
             print("URL: %s, params: %s" % (uploadURL, get_params))
 
         try:
-            return json.loads(r.text)
+            return self.json_codec.loads(r.content)
         except Exception:
             print(r.text)
 
@@ -1008,84 +1199,60 @@ class SyncSketchAPI:
             urlencode(get_params),
         )
 
-        r = requests.post(
+        r = self._send(
+            "post",
             upload_url,
-            {"media_url": media_url, "artist": artist_name},
+            data={"media_url": media_url, "artist": artist_name},
             headers=self.headers,
         )
 
         try:
-            return json.loads(r.text)
+            return self.json_codec.loads(r.content)
         except Exception:
             print(r.text)
 
-    def upload_file(
-        self,
-        review_id,
-        filepath,
-        file_name="",
-        item_uuid=None,
-        noConvertFlag=False,
-        chunk_size=5 * 1024 * 1024,
-        max_workers=None,
-    ):
+    def _default_upload_workers(self):
         """
-        Upload a file to a review using multipart upload.
-        This uses direct to s3 multipart upload to upload large files in chunks.
-
-        :param int review_id: Required review_id
-        :param str filepath: Path for the file on disk e.g /tmp/movie.webm
-        :param str file_name: The name of the file. Please make sure to pass the correct file extension
-        :param str item_uuid: Optional UUID for the item. If not provided, a new one will be generated by the server
-        :param bool noConvertFlag: The video you are uploading is already in a browser compatible format
-        :param int chunk_size: Size of each chunk in bytes for multipart upload (default: 5MB)
-        :param int max_workers: Maximum number of parallel upload workers (default: auto-detected based on system capabilities)
-        :return: A dict containing item information including "id" and "uuid" or None on failure
-        :rtype: Optional[dict]
+        Internal method. Determine the optimal number of upload workers based on system capabilities.
         """
-        if not self.headers:
-            print("upload_file failed. use_header_auth must be set to true.")
-            return None
-
-        # Determine optimal number of workers based on system capabilities
-        if max_workers is None:
-            try:
-                import multiprocessing
+        try:
+            import multiprocessing
 
-                cpu_count = multiprocessing.cpu_count()
-                # Set max_workers based on CPU count, but capped between 2 and 8
-                # For network-bound operations, we don't want to overload with too many threads
-                max_workers = max(2, min(cpu_count * 2, 8))
-                if self.debug:
-                    print(
-                        "Auto-detected {max_workers} workers based on {cpu_count} CPU cores".format(
-                            max_workers=max_workers, cpu_count=cpu_count
-                        )
+            cpu_count = multiprocessing.cpu_count()
+            # Set max_workers based on CPU count, but capped between 2 and 8
+            # For network-bound operations, we don't want to overload with too many threads
+            max_workers = max(2, min(cpu_count * 2, 8))
+            if self.debug:
+                print(
+                    "Auto-detected {max_workers} workers based on {cpu_count} CPU cores".format(
+                        max_workers=max_workers, cpu_count=cpu_count
                     )
-            except (ImportError, NotImplementedError):
-                # Fall back to 4 if we can't determine CPU count
-                max_workers = 4
-                if self.debug:
-                    print("Could not detect CPU count, defaulting to 4 workers")
+                )
+        except (ImportError, NotImplementedError):
+            # Fall back to 4 if we can't determine CPU count
+            max_workers = 4
+            if self.debug:
+                print("Could not detect CPU count, defaulting to 4 workers")
 
-        # Get file information
-        file_size = os.stat(filepath).st_size
-        if not file_name:
-            file_name = os.path.basename(filepath)
-        elif not os.path.splitext(file_name)[1]:
-            file_name += os.path.splitext(filepath)[1]
+        return max_workers
 
-        content_type = mimetypes.guess_type(filepath, strict=False)[0]
+    def _start_multipart_upload(self, upload):
+        """
+        Internal method. Create the item and initialize the multipart upload for a MultipartUpload.
 
+        :param syncsketch.uploads.MultipartUpload upload:
+        :return: True on success
+        :rtype: bool
+        """
         # Step 1: Start the upload process
         start_upload_data = {
-            "review_id": review_id,
-            "item_name": file_name,
+            "review_id": upload.review_id,
+            "item_name": upload.file_name,
             "item_data": {
                 "upload_type": "s3",
-                "uuid": item_uuid,
-                "size": file_size,
-                "content_type": content_type,
+                "uuid": upload.item_uuid,
+                "size": upload.file_size,
+                "content_type": upload.content_type,
             },
         }
 
@@ -1098,24 +1265,24 @@ class SyncSketchAPI:
 
         if not start_upload_response.ok:
             print("Failed to start multipart upload: {}".format(start_upload_response.text))
-            return None
+            return False
 
-        start_upload_data = start_upload_response.json()
+        start_upload_data = self.json_codec.loads(start_upload_response.content)
 
-        item_id = start_upload_data.get("item_id")
+        upload.item_id = start_upload_data.get("item_id")
 
         # The server may generate and return a UUID if one was not provided
-        item_uuid = start_upload_data.get("item_uuid", item_uuid)
+        upload.item_uuid = start_upload_data.get("item_uuid", upload.item_uuid)
 
         # Step 2: Initialize multipart upload
         multipart_init_data = {
-            "review_id": review_id,
+            "review_id": upload.review_id,
             "item_data": {
-                "name": file_name,
-                "uuid": item_uuid,
-                "noConvertFlag": noConvertFlag,
-                "size": file_size,
-                "content_type": content_type,
+                "name": upload.file_name,
+                "uuid": upload.item_uuid,
+                "noConvertFlag": upload.noConvertFlag,
+                "size": upload.file_size,
+                "content_type": upload.content_type,
             },
         }
 
@@ -1128,49 +1295,56 @@ class SyncSketchAPI:
 
         if not multipart_response.ok:
             print("Failed to initialize multipart upload: {}".format(multipart_response.text))
-            return None
+            return False
 
-        multipart_data = multipart_response.json()
+        multipart_data = self.json_codec.loads(multipart_response.content)
 
         # Extract necessary information for uploading parts
-        upload_id = multipart_data.get("uploadId")
-        upload_key = multipart_data.get("key")
+        upload.upload_id = multipart_data.get("uploadId")
+        upload.upload_key = multipart_data.get("key")
 
-        if not all([upload_id, upload_key]):
+        if not all([upload.upload_id, upload.upload_key]):
             print("Missing required multipart upload information")
-            return None
+            return False
 
-        # Step 3: Prepare chunks for parallel upload
-        chunks = []
-        with open(filepath, "rb") as f:
-            part_number = 1
-            while True:
-                chunk = f.read(chunk_size)
-                if not chunk:
-                    break
-                chunks.append((part_number, chunk))
-                part_number += 1
+        upload.start_time = time.time()
 
-        total_parts = len(chunks)
         if self.debug:
-            print("Prepared {total_parts} chunks for parallel upload".format(total_parts=total_parts))
+            print("Prepared {total_parts} chunks for parallel upload".format(total_parts=upload.total_parts))
+
+        return True
+
+    def _upload_multipart_part(self, upload, part_number):
+        """
+        Internal method. Upload a single part of a MultipartUpload with retry.
+
+        :param syncsketch.uploads.MultipartUpload upload:
+        :param int part_number: 1 based part number
+        :return: {"PartNumber": int, "ETag": str} or None on failure
+        :rtype: Optional[dict]
+        """
+        total_parts = upload.total_parts
 
-        # Define function to upload a single part with retry
-        def upload_part(part_number, chunk_data):
+        attributes = {"syncsketch.part_number": part_number, "syncsketch.part_bytes": upload.part_size(part_number)}
+        with self.tracer.span("upload_part", attributes) as span:
             max_retries = 3
             retry_delay = 1  # Start with 1 second delay
 
             for attempt in range(1, max_retries + 1):
+                span.set_attribute("syncsketch.attempt", attempt)
+                if attempt > 1 and self.metrics is not None:
+                    self.metrics.record_part_retry()
+
                 try:
                     # Request a signed URL for this part
                     sign_part_url = "/uploads/multipart-upload/{upload_id}/sign-part/{part_number}/".format(
-                        upload_id=upload_id, part_number=part_number
+                        upload_id=upload.upload_id, part_number=part_number
                     )
 
                     sign_part_response = self._get_json_response(
                         url=sign_part_url,
                         method="get",
-                        getData={"key": upload_key},
+                        getData={"key": upload.upload_key},
                         raw_response=True,
                     )
 
@@ -1189,7 +1363,7 @@ class SyncSketchAPI:
                             continue
                         return None
 
-                    part_url = sign_part_response.json().get("url")
+                    part_url = self.json_codec.loads(sign_part_response.content).get("url")
                     if not part_url:
                         if self.debug:
                             print(
@@ -1204,12 +1378,30 @@ class SyncSketchAPI:
                             continue
                         return None
 
-                    # Upload the part
-                    part_response = requests.put(
-                        part_url,
-                        data=chunk_data,
-                        headers={"Content-Type": content_type},
-                    )
+                    # Upload the part, streamed from a memory-mapped view of the file where possible
+                    part_body = upload.part_body(part_number)
+                    if upload.progress is not None:
+                        part_body = upload.progress.wrap(part_body)
+                    try:
+                        part_response = self._send(
+                            "put",
+                            part_url,
+                            data=part_body,
+                            headers={"Content-Type": upload.content_type},
+                        )
+                    except Exception:
+                        if upload.progress is not None:
+                            part_body.rollback()
+                        raise
+                    finally:
+                        part_body.close()
+
+                    if upload.progress is not None:
+                        if part_response.ok and part_response.headers.get("ETag"):
+                            upload.progress.update(parts=1)
+                        else:
+                            # the part is sent again on the next attempt
+                            part_body.rollback()
 
                     if not part_response.ok:
                         if self.debug:
@@ -1271,16 +1463,130 @@ class SyncSketchAPI:
             # If we get here, all retries failed
             return None
 
-        # Step 4: Upload parts in parallel
-        uploaded_parts = []
+    def _abort_multipart_upload(self, upload):
+        """
+        Internal method. Abort a MultipartUpload after a failed part.
+        """
+        print("Failed to upload all parts successfully. Aborting upload.")
+        abort_url = "/uploads/multipart-upload/{upload_id}/abort/".format(upload_id=upload.upload_id)
+        abort_response = self._get_json_response(
+            url=abort_url,
+            method="post",
+            getData={"key": upload.upload_key},
+            raw_response=True,
+        )
+
+        if not abort_response.ok and self.debug:
+            print("Failed to abort multipart upload: {}".format(abort_response.text))
+
+    def _complete_multipart_upload(self, upload):
+        """
+        Internal method. Complete a MultipartUpload once all parts are uploaded.
+
+        :param syncsketch.uploads.MultipartUpload upload:
+        :return: Item data or None on failure
+        :rtype: Optional[dict]
+        """
+        if self.metrics is not None:
+            self.metrics.record_upload(upload.file_size, time.time() - upload.start_time, num_parts=upload.total_parts)
+
+        # Step 5: Complete the multipart upload
+        complete_url = "/uploads/multipart-upload/{upload_id}/complete/".format(upload_id=upload.upload_id)
+        # Parts sorted by part number to ensure correct order
+        complete_data = {"parts": upload.completed_parts}
+
+        complete_response = self._get_json_response(
+            url=complete_url,
+            method="post",
+            getData={"key": upload.upload_key},
+            postData=complete_data,
+            raw_response=True,
+        )
+
+        if not complete_response.ok:
+            print("Failed to complete multipart upload: {}".format(complete_response.text))
+            return None
+
+        # Get the item data
+        return self.get_item(upload.item_id)
+
+    def upload_file(
+        self,
+        review_id,
+        filepath,
+        file_name="",
+        item_uuid=None,
+        noConvertFlag=False,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        max_workers=None,
+        progress_callback=None,
+        checkpoint=None,
+    ):
+        """
+        Upload a file to a review using multipart upload.
+        This uses direct to s3 multipart upload to upload large files in chunks.
+
+        :param int review_id: Required review_id
+        :param str filepath: Path for the file on disk e.g /tmp/movie.webm
+        :param str file_name: The name of the file. Please make sure to pass the correct file extension
+        :param str item_uuid: Optional UUID for the item. If not provided, a new one will be generated by the server
+        :param bool noConvertFlag: The video you are uploading is already in a browser compatible format
+        :param int chunk_size: Size of each chunk in bytes for multipart upload (default: 5MB)
+        :param int max_workers: Maximum number of parallel upload workers (default: auto-detected based on system capabilities)
+        :param progress_callback: (Optional) Called with a syncsketch.progress.Progress while the file is uploaded, see syncsketch.progress
+        :param checkpoint: (Optional) Object with load() and save(state) methods that keeps the upload state, so an upload interrupted by a crash resumes with its missing parts, see syncsketch.uploadqueue
+        :return: A dict containing item information including "id" and "uuid" or None on failure
+        :rtype: Optional[dict]
+        """
+        if not self.headers:
+            print("upload_file failed. use_header_auth must be set to true.")
+            return None
+
+        if max_workers is None:
+            max_workers = self._default_upload_workers()
+
+        upload = MultipartUpload(
+            review_id,
+            filepath,
+            file_name=file_name,
+            item_uuid=item_uuid,
+            noConvertFlag=noConvertFlag,
+            chunk_size=chunk_size,
+        )
+
+        progress = None
+        if progress_callback is not None:
+            progress = upload.progress = ProgressReporter(
+                progress_callback, total_bytes=upload.file_size, total_parts=upload.total_parts
+            )
+
+        resumed = checkpoint is not None and upload.restore(checkpoint.load())
+        if resumed:
+            upload.start_time = time.time()
+            if self.debug:
+                print("Resuming multipart upload, {}/{} parts uploaded".format(len(upload.parts), upload.total_parts))
+            if progress is not None:
+                progress.update(num_bytes=sum(upload.part_size(n) for n in upload.parts), parts=len(upload.parts))
+        elif not self._start_multipart_upload(upload):
+            if progress is not None:
+                progress.finish(ok=False)
+            return None
+        elif checkpoint is not None:
+            checkpoint.save(upload.state())
+
+        # Upload parts in parallel, each part is read from disk by the worker uploading it.
+        # Run the part uploads in the tracing context of this call so part spans are nested under it
+        upload_part = self.tracer.bind(self._upload_multipart_part)
         failed = False
 
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        with thread_pool(max_workers) as executor:
             futures = []
 
-            # Submit all upload tasks
-            for part_number, chunk in chunks:
-                future = executor.submit(upload_part, part_number, chunk)
+            # Submit all upload tasks, parts of a resumed upload are already uploaded
+            for part_number in range(1, upload.total_parts + 1):
+                if part_number in upload.parts:
+                    continue
+                future = executor.submit(upload_part, upload, part_number)
                 futures.append((part_number, future))
 
             # Collect results
@@ -1294,51 +1600,148 @@ class SyncSketchAPI:
                         failed = True
                         break
 
-                    uploaded_parts.append(result)
+                    upload.parts[part_number] = result
+                    if checkpoint is not None:
+                        checkpoint.save(upload.state())
                 except Exception as e:
                     print("Error uploading part {part_number}: {exc}".format(part_number=part_number, exc=str(e)))
                     failed = True
                     break
 
-        if failed or len(uploaded_parts) != total_parts:
-            print("Failed to upload all parts successfully. Aborting upload.")
-            # Abort the multipart upload
-            abort_url = "/uploads/multipart-upload/{upload_id}/abort/".format(upload_id=upload_id)
-            abort_response = self._get_json_response(
-                url=abort_url,
-                method="post",
-                getData={"key": upload_key},
-                raw_response=True,
-            )
-
-            if not abort_response.ok and self.debug:
-                print("Failed to abort multipart upload: {}".format(abort_response.text))
+        upload.close()
 
+        if failed or len(upload.parts) != upload.total_parts:
+            self._abort_multipart_upload(upload)
+            if checkpoint is not None:
+                checkpoint.save(None)
+            if progress is not None:
+                progress.finish(ok=False)
             return None
 
-        # Sort parts by part number to ensure correct order
-        uploaded_parts.sort(key=lambda x: x["PartNumber"])
+        result = self._complete_multipart_upload(upload)
+        # keep the state when only completing failed, a retry then just completes
+        if checkpoint is not None and result is not None:
+            checkpoint.save(None)
+        if progress is not None:
+            progress.finish(ok=result is not None)
+        return result
 
-        # Step 5: Complete the multipart upload
-        complete_url = "/uploads/multipart-upload/{upload_id}/complete/".format(upload_id=upload_id)
-        complete_data = {"parts": uploaded_parts}
+    def upload_many(
+        self,
+        review_id,
+        paths,
+        noConvertFlag=False,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        max_workers=None,
+    ):
+        """
+        Upload many files to a review using multipart upload, with one shared pool of workers for the parts of all
+        files. Small files are started early so they finish fast while the largest file keeps streaming.
 
-        complete_response = self._get_json_response(
-            url=complete_url,
-            method="post",
-            getData={"key": upload_key},
-            postData=complete_data,
-            raw_response=True,
-        )
+        This is a generator, results are yielded as each file finishes. Use ``list(...)`` to wait for all files.
 
-        if not complete_response.ok:
-            print("Failed to complete multipart upload: {}".format(complete_response.text))
-            return None
+        .. code:: python
 
-        # Get the item data
-        return self.get_item(item_id)
+            for filepath, item in s.upload_many(review_id, paths, max_workers=16):
+                if item is None:
+                    print("Failed to upload %s" % filepath)
+
+        :param int review_id: Required review_id
+        :param list[str] paths: Paths of the files on disk
+        :param bool noConvertFlag: The videos you are uploading are already in a browser compatible format
+        :param int chunk_size: Size of each chunk in bytes for multipart upload (default: 5MB)
+        :param int max_workers: Maximum number of parallel upload workers for all files (default: auto-detected based on system capabilities)
+        :return: Generator of (filepath, item data or None on failure) tuples
+        :rtype: Iterator[tuple[str, Optional[dict]]]
+        """
+        if not self.headers:
+            print("upload_many failed. use_header_auth must be set to true.")
+            return
+
+        if max_workers is None:
+            max_workers = self._default_upload_workers()
+
+        uploads = []
+        missing = []
+        for filepath in paths:
+            try:
+                uploads.append(MultipartUpload(review_id, filepath, noConvertFlag=noConvertFlag, chunk_size=chunk_size))
+            except OSError as e:
+                # a missing or unreadable file fails on its own, not the whole batch
+                print("Can not upload {}: {}".format(filepath, e))
+                missing.append(filepath)
+
+        for filepath in missing:
+            yield filepath, None
+        if not uploads:
+            return
+
+        scheduler = UploadScheduler(uploads, max_active=max_workers)
+        results = Queue()
+
+        def finish(upload):
+            result = None
+            try:
+                upload.close()
+
+                if scheduler.failed(upload):
+                    if upload.upload_id:
+                        self._abort_multipart_upload(upload)
+                else:
+                    result = self._complete_multipart_upload(upload)
+            except Exception as e:
+                print("Error finishing upload of {}: {}".format(upload.filepath, e))
+                result = None
+            finally:
+                # always hand out the next file and report this one, the caller waits for every result
+                scheduler.finish(upload)
+                results.put((upload.filepath, result))
+
+        def worker():
+            while True:
+                job = scheduler.next_job()
+                if job is None:
+                    return
+
+                kind, upload, part_number = job
+                if kind == UploadScheduler.START:
+                    try:
+                        ok = self._start_multipart_upload(upload)
+                    except Exception as e:
+                        print("Error starting upload of {}: {}".format(upload.filepath, e))
+                        ok = False
+                    ready = scheduler.start_done(upload, ok)
+                    if not ok or ready:
+                        finish(upload)
+                else:
+                    try:
+                        part = self._upload_multipart_part(upload, part_number)
+                    except Exception as e:
+                        print("Error uploading part {} of {}: {}".format(part_number, upload.filepath, e))
+                        part = None
+                    if scheduler.part_done(upload, part_number, part):
+                        finish(upload)
+
+        worker = self.tracer.bind(worker)
+        threads = []
+        for _ in range(max_workers):
+            thread = threading.Thread(target=worker)
+            thread.daemon = True
+            thread.start()
+            threads.append(thread)
 
-    def add_media_v2(self, review_id, filepath, file_name="", item_uuid=None, noConvertFlag=False):
+        try:
+            for _ in uploads:
+                yield results.get()
+        finally:
+            # the caller stopped iterating early, stop handing out work and abort the started uploads, uploads with
+            # work in flight are aborted by their worker when it returns
+            for upload in scheduler.cancel():
+                finish(upload)
+
+    def add_media_v2(
+        self, review_id, filepath, file_name="", item_uuid=None, noConvertFlag=False, progress_callback=None
+    ):
         """
         Similar to add_media method, but uploads the media file directly to SyncSketche's internal S3 instead of to
         the SyncSketch server. In some cases, using this method over add_media can improve upload performance and
@@ -1348,6 +1751,7 @@ class SyncSketchAPI:
         :param str filepath: path for the file on disk e.g /tmp/movie.webm.
         :param str file_name: The name of the file. Please make sure to pass the correct file extension.
         :param bool noConvertFlag: the video you are uploading is already in a browser compatible format.
+        :param progress_callback: (Optional) Called with a syncsketch.progress.Progress while the file is uploaded, see syncsketch.progress
         :return: A dict, containing "item_id" and "uuid" or None on failure.
         :rtype: Optional[dict]
         """
@@ -1364,10 +1768,14 @@ class SyncSketchAPI:
                 filepath=filepath,
                 file_name=file_name,
                 noConvertFlag=noConvertFlag,
+                progress_callback=progress_callback,
             )
             return {"id": result["id"], "uuid": result["uuid"]}
 
+        import mimetypes
+
         content_type = mimetypes.guess_type(filepath, strict=False)[0]
+        progress = ProgressReporter(progress_callback) if progress_callback else None
 
         url_response = self._get_s3_signed_url(
             review_id=review_id,
@@ -1380,14 +1788,33 @@ class SyncSketchAPI:
 
         if not url_response.ok:
             print("Failed to generate signed S3 url.\nAPI response:\n{}".format(url_response.text))
+            if progress:
+                progress.finish(ok=False)
             return None
 
-        url_response_data = url_response.json()
+        url_response_data = self.json_codec.loads(url_response.content)
         url = url_response_data["url"]
         fields = url_response_data["fields"]
 
-        with open(filepath, "rb") as file:
-            upload_response = requests.post(url, data=fields, files={"file": file})
+        # S3 expects the file after all policy fields
+        body = MultipartFormData(fields, {"file": filepath})
+        if progress:
+            progress.set_total(total_bytes=len(body))
+        with body:
+            try:
+                upload_response = self._send(
+                    "post",
+                    url,
+                    data=progress.wrap(body) if progress else body,
+                    headers={"Content-Type": body.content_type},
+                )
+            except Exception:
+                if progress:
+                    progress.finish(ok=False)
+                raise
+
+        if progress:
+            progress.finish(ok=upload_response.ok)
 
         if not upload_response.ok:
             print("Upload process failed while uploading file to S3.\nS3 response:\n{}".format(upload_response.text))
@@ -1432,7 +1859,7 @@ class SyncSketchAPI:
             raw_response=raw_response,
         )
 
-    def get_media(self, searchCriteria, fields=None, raw_response=False):
+    def get_media(self, searchCriteria, fields=None, raw_response=False, as_records=False):
         """
         This is a general search function. You can search media items by
 
@@ -1465,28 +1892,38 @@ class SyncSketchAPI:
         only deactivated and kept for a certain period of time before they are "purged" from the system.
 
         :param dict searchCriteria: Search params
-        :param list|str|int|bool fields: fields to fetch from backend
+        :param list|str|int|bool fields: fields to fetch from backend, or a field profile name such as "minimal", "listing" or "full"
         :param bool raw_response: Get whole response from REST API.
+        :param bool as_records: (Optional) Return the items as compact read only records instead of dicts, see syncsketch.records
         :return: List of media items
         :rtype: list[dict]
         """
-        self._update_params("fields", fields, searchCriteria)
+        # the field profile is added to a copy, the caller's criteria are left as they are
+        searchCriteria = dict(searchCriteria or {})
+        self._update_params("fields", fields, searchCriteria, entity="item")
 
-        return self._get_json_response("/api/v1/item/", getData=searchCriteria, raw_response=raw_response)
+        response = self._get_json_response("/api/v1/item/", getData=searchCriteria, raw_response=raw_response)
+        if as_records and not raw_response:
+            return listing_to_records(response)
+        return response
 
-    def get_items_by_review_id(self, review_id, fields=None, raw_response=False):
+    def get_items_by_review_id(self, review_id, fields=None, raw_response=False, as_records=False):
         """
         Get all items in a review
 
         :param int review_id: Review ID
-        :param list|str|int|bool fields: fields to fetch from backend
+        :param list|str|int|bool fields: fields to fetch from backend, or a field profile name such as "minimal", "listing" or "full"
         :param bool raw_response: Get whole response from REST API.
+        :param bool as_records: (Optional) Return the items as compact read only records instead of dicts, see syncsketch.records
         :return: List of media items
         :rtype: list[dict]
         """
         get_params = {"reviews__id": review_id, "active": 1}
-        self._update_params("fields", fields, get_params)
-        return self._get_json_response("/api/v1/item/", getData=get_params, raw_response=raw_response)
+        self._update_params("fields", fields, get_params, entity="item")
+        response = self._get_json_response("/api/v1/item/", getData=get_params, raw_response=raw_response)
+        if as_records and not raw_response:
+            return listing_to_records(response)
+        return response
 
     def delete_item(self, item_id, raw_response=False):
         """
@@ -1502,14 +1939,41 @@ class SyncSketchAPI:
             raw_response=raw_response,
         )
 
-    def bulk_delete_items(self, item_ids, raw_response=True):
+    def bulk_delete_items(self, item_ids, raw_response=True, batch_size=None, max_workers=4):
         """
         Delete multiple items by id.
 
+        With a `batch_size`, e.g. BULK_BATCH_SIZE, items are deleted in batches of at most that many, `max_workers`
+        batches at a time, and failed batches are retried. The result is then always a merged dict instead of a
+        single response:
+
+        .. code:: python
+
+            {
+                "succeeded": [1, 2, ...],  # ids of the items that were deleted
+                "failed": [...],  # ids of the items in batches that failed after all retries
+                "responses": [...],  # JSON response of every successful batch
+            }
+
         :param list[int] item_ids: List of item IDs to delete
         :param bool raw_response: Get whole response from REST API.
+        :param int batch_size: (Optional) Maximum number of items per request, one request for all items when omitted
+        :param int max_workers: (Optional) Maximum number of batches sent at the same time
         :return:
         """
+        if batch_size is not None and batch_size < 1:
+            raise ValueError("batch_size must be positive")
+
+        item_ids = list(item_ids)
+        if batch_size is not None:
+            return self._post_in_batches(
+                "/api/v2/bulk-delete-items/",
+                item_ids,
+                lambda batch: dict(item_ids=batch),
+                batch_size,
+                max_workers,
+            )
+
         return self._get_json_response(
             "/api/v2/bulk-delete-items/",
             postData=dict(item_ids=item_ids),
@@ -1517,18 +1981,85 @@ class SyncSketchAPI:
             raw_response=raw_response,
         )
 
+    def _post_in_batches(self, url, values, build_payload, batch_size, max_workers, max_retries=3):
+        """
+        Internal method. POST `values` in batches of `batch_size`, at most `max_workers` batches at a time.
+        Batches that fail with a connection error, a 429 or a 5xx response are retried with exponential backoff.
+
+        :param str url: Endpoint url
+        :param list values: Items to send
+        :param build_payload: Function that returns the JSON payload for a batch of values
+        :return: {"succeeded": list, "failed": list, "responses": list}
+        :rtype: dict
+        """
+        batches = [values[i : i + batch_size] for i in range(0, len(values), batch_size)]
+
+        def post_batch(batch):
+            retry_delay = 1
+            for attempt in range(1, max_retries + 1):
+                try:
+                    response = self._get_json_response(
+                        url, method="post", postData=build_payload(batch), raw_response=True
+                    )
+                    if response.ok:
+                        try:
+                            return self.json_codec.loads(response.content)
+                        except ValueError:
+                            return {}
+                    error = "{} {}".format(response.status_code, response.text)
+                    if response.status_code < 500 and response.status_code != 429:
+                        # the request itself is wrong, sending it again won't help
+                        print("Batch of {} items failed: {}".format(len(batch), error))
+                        return None
+                except Exception as e:
+                    error = str(e)
+
+                if self.debug:
+                    print("Attempt {}: batch of {} items failed: {}".format(attempt, len(batch), error))
+                if attempt < max_retries:
+                    time.sleep(retry_delay)
+                    retry_delay *= 2
+
+            print("Batch of {} items failed after {} attempts: {}".format(len(batch), max_retries, error))
+            return None
+
+        result = {"succeeded": [], "failed": [], "responses": []}
+
+        post_batch = self.tracer.bind(post_batch)
+        with thread_pool(max(1, max_workers)) as executor:
+            futures = [(batch, executor.submit(post_batch, batch)) for batch in batches]
+
+            for batch, future in futures:
+                try:
+                    # For Python 3's ThreadPoolExecutor
+                    response = future.result() if hasattr(future, "result") else executor.result(future)
+                except Exception as e:
+                    print("Error sending batch of {} items: {}".format(len(batch), e))
+                    response = None
+
+                if response is None:
+                    result["failed"].extend(batch)
+                else:
+                    result["succeeded"].extend(batch)
+                    result["responses"].append(response)
+
+        return result
+
     def connect_item_to_review(self, item_id, review_id):
         print("DEPRECATED.")
         print("A new improved method for this will be added soon.")
         return "Deprecated"
 
-    def move_items(self, new_review_id, item_data, raw_response=True):
+    def move_items(self, new_review_id, item_data, raw_response=True, batch_size=None, max_workers=4):
         """
         Move items from one review to another
 
         item_data should be a list of dictionaries with the old review id and the item id.
         The items in the list will be moved to the new review for the param new_review_id
 
+        Like bulk_delete_items, with a `batch_size` items are moved in concurrent, retried batches and the result
+        is always a merged dict with the "succeeded" and "failed" item_data entries and the batch "responses".
+
         .. code:: python
 
             # Example item_data
@@ -1543,8 +2074,22 @@ class SyncSketchAPI:
         :param int new_review_id: The review id to move the items to
         :param list[dict] item_data: List of dictionaries with the old review id and the item id
         :param bool raw_response: Get whole response from REST API.
+        :param int batch_size: (Optional) Maximum number of items per request, one request for all items when omitted
+        :param int max_workers: (Optional) Maximum number of batches sent at the same time
         :return:
         """
+        if batch_size is not None and batch_size < 1:
+            raise ValueError("batch_size must be positive")
+
+        item_data = list(item_data)
+        if batch_size is not None:
+            return self._post_in_batches(
+                "/api/v2/move-review-items/",
+                item_data,
+                lambda batch: {"new_review_id": new_review_id, "item_data": batch},
+                batch_size,
+                max_workers,
+            )
 
         return self._get_json_response(
             "/api/v2/move-review-items/",
@@ -1619,6 +2164,7 @@ class SyncSketchAPI:
         with_tracing_paper=False,
         return_as_base64=False,
         raw_response=False,
+        progress_callback=None,
     ):
         """
         Returns a list of sketches either as signed urls from s3 or base64 encoded strings.
@@ -1629,6 +2175,7 @@ class SyncSketchAPI:
         :param bool with_tracing_paper: Include tracing paper in the response
         :param bool return_as_base64: Return sketches as base64 encoded strings
         :param bool raw_response: Get whole response from REST API.
+        :param progress_callback: (Optional) Called with a syncsketch.progress.Progress while the server prepares the sketches, see syncsketch.progress
         :return: List of sketches as signed urls from s3 or base64 encoded strings
         """
         get_data = {
@@ -1641,8 +2188,8 @@ class SyncSketchAPI:
 
         url = "{}/api/v2/downloads/flattenedSketches/{}/{}/".format(self.HOST, review_id, item_id)
 
-        r = requests.post(url, params=get_data, headers=self.headers)
-        celery_task_id = r.json()
+        r = self._send("post", url, params=get_data, headers=self.headers)
+        celery_task_id = self.json_codec.loads(r.content)
 
         if self.debug:
             print("Flattened annotations download started with celery task ID: %s", celery_task_id)
@@ -1653,28 +2200,52 @@ class SyncSketchAPI:
             host=self.HOST, celery_task_id=celery_task_id
         )
 
-        r = requests.get(check_celery_url, params=self.api_params, headers=self.headers)
+        progress = ProgressReporter(progress_callback, status="waiting") if progress_callback else None
+
+        r = self._poll_task("flattenedSketches", check_celery_url)
 
         while request_processing:
             if self.debug:
                 print("Checking celery task status at: %s" % check_celery_url)
 
-            result = r.json()
+            result = self.json_codec.loads(r.content)
 
             if result.get("status") == "done":
+                if progress:
+                    progress.set_total(total_bytes=len(r.content))
+                    progress.update(len(r.content), status="downloading")
+                    progress.finish()
                 return result
 
             if result.get("status") == "failed":
+                if progress:
+                    progress.finish(ok=False)
                 return None
 
-            # wait a bit
-            time.sleep(1)
+            if progress:
+                progress.update()
 
-            # check the url again
-            r = requests.get(check_celery_url, params=self.api_params, headers=self.headers)
+            # check the url again after waiting a bit
+            r = self._poll_task("flattenedSketches", check_celery_url, delay=1)
         return
 
-    def get_grease_pencil_overlays(self, review_id, item_id, homedir=None):
+    def _poll_task(self, task, check_url, delay=0):
+        """
+        Internal method. Wait `delay` seconds and request the status of a server side (celery) task.
+        """
+        start_time = time.time()
+
+        if delay:
+            time.sleep(delay)
+
+        r = self._send("get", check_url, params=self.api_params, headers=self.headers)
+
+        if self.metrics is not None:
+            self.metrics.record_poll(task, time.time() - start_time)
+
+        return r
+
+    def get_grease_pencil_overlays(self, review_id, item_id, homedir=None, progress_callback=None):
         """
         Download overlay sketches for Maya Greasepencil.
 
@@ -1690,6 +2261,7 @@ class SyncSketchAPI:
         :param int review_id: Review ID
         :param int item_id: Item ID
         :param str homedir: Optional path to download the zip file to
+        :param progress_callback: (Optional) Called with a syncsketch.progress.Progress while the server prepares and while the zip file is downloaded, see syncsketch.progress
         :return: filePath to the zip file with the greasePencil data.
         """
         url = "%s/api/v2/downloads/greasePencil/%s/%s/" % (
@@ -1697,8 +2269,8 @@ class SyncSketchAPI:
             review_id,
             item_id,
         )
-        r = requests.post(url, params=self.api_params, headers=self.headers)
-        celery_task_id = r.json()
+        r = self._send("post", url, params=self.api_params, headers=self.headers)
+        celery_task_id = self.json_codec.loads(r.content)
 
         if self.debug:
             print("Grease Pencil download started with celery task ID: %s", celery_task_id)
@@ -1710,13 +2282,15 @@ class SyncSketchAPI:
             celery_task_id,
         )
 
-        r = requests.get(check_celery_url, params=self.api_params, headers=self.headers)
+        progress = ProgressReporter(progress_callback, status="waiting") if progress_callback else None
+
+        r = self._poll_task("greasePencil", check_celery_url)
 
         while request_processing:
             if self.debug:
                 print("Checking celery task status at: %s" % check_celery_url)
 
-            result = r.json()
+            result = self.json_codec.loads(r.content)
 
             if result.get("status") == "done":
                 data = result.get("data")
@@ -1725,24 +2299,33 @@ class SyncSketchAPI:
                 local_filename = "/tmp/%s.zip" % data["fileName"]
                 if homedir:
                     local_filename = os.path.join(homedir, "{}.zip".format(data["fileName"]))
-                r = requests.get(data["s3Path"], stream=True)
+                r = self._send("get", data["s3Path"], stream=True)
+                if progress:
+                    content_length = r.headers.get("Content-Length")
+                    progress.set_total(total_bytes=int(content_length) if content_length else None)
+                    progress.update(status="downloading", force=True)
                 with open(local_filename, "wb") as f:
-                    for chunk in r.iter_content(chunk_size=1024):
-                        if chunk:
-                            f.write(chunk)
+                    for chunk in self.bandwidth.iter_content(r):
+                        f.write(chunk)
+                        if progress:
+                            progress.update(len(chunk))
 
+                if progress:
+                    progress.finish()
                 request_processing = False
                 return local_filename
 
             if result.get("status") == "failed":
+                if progress:
+                    progress.finish(ok=False)
                 request_processing = False
                 return False
 
-            # wait a bit
-            time.sleep(1)
+            if progress:
+                progress.update()
 
-            # check the url again
-            r = requests.get(check_celery_url, params=self.api_params, headers=self.headers)
+            # check the url again after waiting a bit
+            r = self._poll_task("greasePencil", check_celery_url, delay=1)
         return
 
     """
@@ -1762,13 +2345,13 @@ class SyncSketchAPI:
         Name is a combined search and will search in first_name, last_name and email
 
         :param str name: Name to search for
-        :param list|str|int|bool fields: fields to fetch from backend
+        :param list|str|int|bool fields: fields to fetch from backend, or a field profile name such as "minimal", "listing" or "full"
         :param bool raw_response: Get whole response from REST API.
         :return: List of users
         :rtype: list[dict]
         """
         get_params = {"name": name}
-        self._update_params("fields", fields, get_params)
+        self._update_params("fields", fields, get_params, entity="user")
         return self._get_json_response("/api/v1/simpleperson/", getData=get_params, raw_response=raw_response)
 
     def get_user_by_email(self, email, fields=None, raw_response=True):
@@ -1776,17 +2359,17 @@ class SyncSketchAPI:
         Get user by email
 
         :param str email: Email to search for
-        :param list|str|int|bool fields: fields to fetch from backend
+        :param list|str|int|bool fields: fields to fetch from backend, or a field profile name such as "minimal", "listing" or "full"
         :param bool raw_response: Get whole response from REST API.
         :return: User data
         :rtype: dict
         """
         get_params = {"email__iexact": email}
-        self._update_params("fields", fields, get_params)
+        self._update_params("fields", fields, get_params, entity="user")
         response = self._get_json_response("/api/v1/simpleperson/", getData=get_params, raw_response=raw_response)
 
         try:
-            data = response.json()
+            data = self.json_codec.loads(response.content)
             return data.get("objects")[0]
         except:
             return None
@@ -1840,13 +2423,13 @@ class SyncSketchAPI:
         Get a user by ID
 
         :param int user_id:
-        :param list|str|int|bool fields: fields to fetch from backend
+        :param list|str|int|bool fields: fields to fetch from backend, or a field profile name such as "minimal", "listing" or "full"
         :param bool raw_response: Get whole response from REST API.
         :return: User data
         :rtype: dict
         """
         get_params = {}
-        self._update_params("fields", fields, get_params)
+        self._update_params("fields", fields, get_params, entity="user")
         return self._get_json_response(
             "/api/v1/simpleperson/%s/" % user_id,
             getData=get_params,
@@ -1878,7 +2461,7 @@ class SyncSketchAPI:
             "which": "account",
             "entity_id": workspace_id,
             "note": note,
-            "users": json.dumps(users),
+            "users": self.json_codec.dumps_text(users),
         }
 
         return self._get_json_response("/api/v2/add-users/", postData=post_data, raw_response=raw_response)
@@ -1904,7 +2487,7 @@ class SyncSketchAPI:
         post_data = {
             "which": "account",
             "entity_id": workspace_id,
-            "users": json.dumps(users),
+            "users": self.json_codec.dumps_text(users),
         }
 
         return self._get_json_response("/api/v2/remove-users/", postData=post_data, raw_response=raw_response)
@@ -1940,7 +2523,7 @@ class SyncSketchAPI:
             "which": "project",
             "entity_id": project_id,
             "note": note,
-            "users": json.dumps(users),
+            "users": self.json_codec.dumps_text(users),
         }
 
         return self._get_json_response("/api/v2/add-users/", postData=post_data, raw_response=raw_response)
@@ -1966,11 +2549,155 @@ class SyncSketchAPI:
         post_data = {
             "which": "project",
             "entity_id": project_id,
-            "users": json.dumps(users),
+            "users": self.json_codec.dumps_text(users),
         }
 
         return self._get_json_response("/api/v2/remove-users/", postData=post_data, raw_response=raw_response)
 
+    @staticmethod
+    def _parse_member_listing(listing):
+        """
+        Internal method. The list of members in a get_users_by_project_id response, a list or a dict with the list
+        in "objects" or "users". None for any other response, e.g. an error.
+        """
+        if isinstance(listing, dict):
+            if "objects" in listing:
+                listing = listing["objects"]
+            elif "users" in listing:
+                listing = listing["users"]
+            else:
+                return None
+        if not isinstance(listing, list) or not all(isinstance(member, dict) for member in listing):
+            return None
+        return listing
+
+    @staticmethod
+    def _member_permissions(members):
+        """
+        Internal method. Map lower case email to (email, permission) for a list of users, as returned by
+        get_users_by_project_id or passed to sync_project_members.
+        """
+        if isinstance(members, dict):
+            if "objects" in members or "users" in members:
+                members = members.get("objects", members.get("users"))
+            else:
+                # already a mapping of email to permission
+                return dict((email.lower(), (email, permission)) for email, permission in members.items())
+
+        permissions = {}
+        for member in members or []:
+            user = member.get("user") if isinstance(member.get("user"), dict) else member
+            email = user.get("email") or member.get("email")
+            if email:
+                permissions[email.lower()] = (email, member.get("permission") or member.get("role"))
+        return permissions
+
+    def sync_project_members(self, project_id, desired, note="", remove_missing=True, dry_run=False):
+        """
+        Make the members of a project match `desired`, sending only the differences.
+
+        Current members are read with get_users_by_project_id. New users and users with a different permission
+        are sent in one add_users_to_project call, users that are not in `desired` in one
+        remove_users_from_project call. Emails are compared case insensitively.
+
+        .. code:: python
+
+            s.sync_project_members(project_id, {"artist@studio.com": "member", "client@example.com": "viewer"})
+
+        Method output example:
+
+        .. code:: python
+
+            {
+                "added": [{"email": "client@example.com", "permission": "viewer"}],
+                "changed": [],
+                "removed": [{"email": "old@studio.com"}],
+                "unchanged": 12,
+                "responses": {"add": {...}, "remove": {...}},
+            }
+
+        :param int project_id: id of the project
+        :param desired: dict of email to permission, or a list of {"email": str, "permission": str}
+        :param str note: (Optional) message for the invitation email of new users
+        :param bool remove_missing: (Optional) Remove members that are not in `desired`
+        :param bool dry_run: (Optional) Only compute the changes
+        :return: Changes and responses, None if the current members could not be read
+        :rtype: Optional[dict]
+        """
+        # an unreadable listing must not look like a project without members, that would invite everybody again
+        response = self.get_users_by_project_id(project_id, raw_response=True)
+        if not response.ok:
+            print("Failed to get the users of project {}: {}".format(project_id, response.text))
+            return None
+        try:
+            current = self.json_codec.loads(response.content)
+        except ValueError:
+            print("Failed to read the users of project {}: {}".format(project_id, response.text))
+            return None
+        members = self._parse_member_listing(current)
+        if members is None:
+            print("Failed to get the users of project {}: {}".format(project_id, current))
+            return None
+
+        current = self._member_permissions(members)
+        desired = self._member_permissions(desired)
+
+        result = {"added": [], "changed": [], "removed": [], "unchanged": 0, "responses": {}}
+        for key in sorted(desired):
+            email, permission = desired[key]
+            if key not in current:
+                result["added"].append({"email": email, "permission": permission})
+            elif permission and permission != current[key][1]:
+                result["changed"].append({"email": email, "permission": permission})
+            else:
+                result["unchanged"] += 1
+
+        if remove_missing:
+            result["removed"] = [{"email": current[key][0]} for key in sorted(current) if key not in desired]
+
+        if dry_run:
+            return result
+
+        if result["added"] or result["changed"]:
+            result["responses"]["add"] = self.add_users_to_project(
+                project_id, result["added"] + result["changed"], note=note
+            )
+        if result["removed"]:
+            result["responses"]["remove"] = self.remove_users_from_project(project_id, result["removed"])
+
+        return result
+
+    def sync_many_project_members(self, desired_by_project, note="", remove_missing=True, dry_run=False, max_workers=4):
+        """
+        Run sync_project_members for many projects, `max_workers` projects at a time.
+
+        :param dict desired_by_project: project id to desired members, see sync_project_members
+        :param str note: (Optional) message for the invitation email of new users
+        :param bool remove_missing: (Optional) Remove members that are not in the desired members
+        :param bool dry_run: (Optional) Only compute the changes
+        :param int max_workers: (Optional) Maximum number of projects synced at the same time
+        :return: project id to the result of sync_project_members, None for projects that failed
+        :rtype: dict
+        """
+        sync = self.tracer.bind(self.sync_project_members)
+        results = {}
+
+        with thread_pool(max(1, max_workers)) as executor:
+            futures = [
+                (project_id, executor.submit(sync, project_id, desired, note, remove_missing, dry_run))
+                for project_id, desired in desired_by_project.items()
+            ]
+
+            for project_id, future in futures:
+                try:
+                    # For Python 3's ThreadPoolExecutor
+                    results[project_id] = future.result() if hasattr(future, "result") else executor.result(future)
+                except Exception as e:
+                    print("Error syncing the members of project {}: {}".format(project_id, e))
+                    results[project_id] = None
+
+        return results
+
     """
     Shotgrid API
     """
@@ -2095,6 +2822,150 @@ class SyncSketchAPI:
 
         return self._get_json_response(url, method="post", raw_response=raw_response)
 
+    @staticmethod
+    def _add_note_counts(totals, result):
+        """
+        Internal method. Add the sketch, comment and attachment counts of a note sync result to `totals`.
+        """
+        for source in (result, result.get("data")):
+            if isinstance(source, dict):
+                for key in totals:
+                    if isinstance(source.get(key), int):
+                        totals[key] += source[key]
+
+    def shotgrid_sync_item_notes(self, project_id, review_id, item_ids=None, max_workers=4):
+        """
+        Sync new notes of many items of a review to shotgrid, `max_workers` items at a time.
+
+        This is a generator, results are yielded as each item finishes.
+        Use ``list(...)`` to wait for all items.
+
+        .. code:: python
+
+            for item_id, result, totals in s.shotgrid_sync_item_notes(project_id, review_id):
+                print(item_id, "failed" if result is None else "synced", totals)
+
+        :param int project_id: SyncSketch project id
+        :param int review_id: SyncSketch review id
+        :param list[int] item_ids: (optional) Items to sync, all items of the review when omitted
+        :param int max_workers: (optional) Maximum number of items synced at the same time
+        :return: Generator of (item id, shotgrid_sync_new_item_notes result or None on failure, running totals of
+                 "sketches", "comments" and "attachments") tuples
+        :rtype: Iterator[tuple[int, Optional[dict], dict]]
+        """
+        if item_ids is None:
+            items = self._get_all_review_items(review_id, ["id"])
+            if items is None:
+                return
+            item_ids = [item["id"] for item in items]
+
+        results = Queue()
+
+        def sync_notes(item_id):
+            try:
+                result = self.shotgrid_sync_new_item_notes(project_id, review_id, item_id)
+                if not isinstance(result, dict) or result.get("sketch_upload_error"):
+                    print("Failed to sync the notes of item {}: {}".format(item_id, result))
+                    result = None
+            except Exception as e:
+                print("Error syncing the notes of item {}: {}".format(item_id, e))
+                result = None
+            results.put((item_id, result))
+
+        totals = {"sketches": 0, "comments": 0, "attachments": 0}
+        sync_notes = self.tracer.bind(sync_notes)
+
+        with thread_pool(max(1, max_workers)) as executor:
+            for item_id in item_ids:
+                executor.submit(sync_notes, item_id)
+
+            for _ in item_ids:
+                item_id, result = results.get()
+                if result is not None:
+                    self._add_note_counts(totals, result)
+                yield item_id, result, dict(totals)
+
+    def shotgrid_sync_notes_for_reviews(self, review_ids, poll_interval=2, timeout=None, max_poll_errors=5):
+        """
+        Start shotgrid review note syncs for many reviews and wait for all of them with one shared poller.
+
+        This is a generator, results are yielded as each review sync finishes.
+        Use ``list(...)`` to wait for all reviews.
+
+        .. code:: python
+
+            for review_id, result, totals in s.shotgrid_sync_notes_for_reviews(review_ids):
+                print(review_id, result["status"] if result else "failed", totals)
+
+        :param list[int] review_ids: SyncSketch review ids
+        :param float poll_interval: (optional) Seconds between two polls of the running syncs
+        :param float timeout: (optional) Seconds after which syncs that are still running are given up
+        :param int max_poll_errors: (optional) Checks of a sync that may fail in a row, e.g. with a connection
+                                    error, before it is given up
+        :return: Generator of (review id, final progress information or None on failure, running totals of
+                 "sketches", "comments" and "attachments") tuples
+        :rtype: Iterator[tuple[int, Optional[dict], dict]]
+        """
+        totals = {"sketches": 0, "comments": 0, "attachments": 0}
+        start_time = time.time()
+
+        # task id -> review id
+        running = {}
+        # task id -> checks in a row that raised
+        poll_errors = {}
+        for review_id in review_ids:
+            started = self.shotgrid_sync_review_notes(review_id)
+            task_id = started.get("task_id") if isinstance(started, dict) else None
+            if not task_id:
+                print("Failed to start the note sync of review {}: {}".format(review_id, started))
+                yield review_id, None, dict(totals)
+                continue
+            running[task_id] = review_id
+
+        delay = 0
+        while running:
+            if timeout is not None and time.time() - start_time > timeout:
+                for task_id, review_id in sorted(running.items(), key=lambda task: task[1]):
+                    print("Timed out waiting for the note sync of review {}".format(review_id))
+                    yield review_id, None, dict(totals)
+                return
+
+            for task_id in list(running):
+                check_url = self._get_unversioned_api_url("/api/v2/shotgun/sync-review-notes/{}/".format(task_id))
+                try:
+                    response = self._poll_task("shotgridReviewNotes", check_url, delay=delay)
+                    result = self.json_codec.loads(response.content) if response.ok else None
+                except Exception as e:
+                    # e.g. a connection error, retried in the next round until the task failed too often in a row
+                    poll_errors[task_id] = poll_errors.get(task_id, 0) + 1
+                    if poll_errors[task_id] < max_poll_errors:
+                        if self.debug:
+                            print("Checking note sync task {} failed: {}".format(task_id, e))
+                        continue
+                    print("Giving up on the note sync of review {}: {}".format(running[task_id], e))
+                    yield running.pop(task_id), None, dict(totals)
+                    continue
+                finally:
+                    # one wait per round, shared by all running tasks
+                    delay = 0
+                poll_errors.pop(task_id, None)
+
+                if not response.ok:
+                    print("Checking the note sync of review {} failed: {}".format(running[task_id], response.text))
+                    yield running.pop(task_id), None, dict(totals)
+                    continue
+
+                status = result.get("status") if isinstance(result, dict) else None
+                if status == "done":
+                    self._add_note_counts(totals, result)
+                    yield running.pop(task_id), result, dict(totals)
+                elif status not in ("processing", "pending"):
+                    message = result.get("message") if status == "failed" else result
+                    print("Note sync of review {} failed: {}".format(running[task_id], message))
+                    yield running.pop(task_id), None, dict(totals)
+
+            delay = poll_interval
+
     def get_shotgrid_sync_review_notes_progress(self, task_id, raw_response=False):
         """
         Returns status of review notes sync for the task id provided in shotgun_sync_review_notes
@@ -2118,28 +2989,45 @@ class SyncSketchAPI:
 
         return self._get_json_response(url, method="get", raw_response=raw_response)
 
-    def shotgrid_sync_review_items(self, syncsketch_project_id, playlist_code, playlist_id, review_id=None):
+    def shotgrid_sync_review_items(
+        self,
+        syncsketch_project_id,
+        playlist_code,
+        playlist_id,
+        review_id=None,
+        max_workers=4,
+        progress_callback=None,
+        sync_state=None,
+    ):
         """
         Create or update SyncSketch review with shotgrid playlist items
         Returns task id to use in get_shotgun_sync_review_items_progress to get progress
 
+        The playlist items are synced concurrently, `max_workers` at a time, and the review items are put back in
+        playlist order afterwards. A failing item does not stop the sync, it is reported in "failed".
+
+        With a `sync_state` only playlist items that are new or changed since the last sync of the review are sent,
+        based on their version id and updated timestamp, or a hash of their contents.
+
         Response format:
 
-        - message=<STR> "Shotgrid review item sync started",
-        - status=<STR> processing/done/failed,
-        - progress_url=<STR> Full url to call for progress/results,
-        - task_id=<STR> task_ids - pass this value to the get_shotgun_sync_review_items_progress function,
-        - percent_complete=<INT> 0-100 value of percent complete,
-        - total_items=<INT> number of items being synced from shotgrid,
-        - remaining_items=<INT> number of items not yet pulled from shotgrid,
-        - data=<dict>
-        -    review_id=<INT> review.id,
-        -    review_link=<STR> url link to the syncsketch player with the review pulled from shotgrid,
+        - review_id=<INT> review.id,
+        - items=<LIST> ids of the synced items, in playlist order,
+        - failed=<LIST> dicts with "index" (position in the playlist), "item" (shotgrid playlist item) and "error",
+        - status=<STR> done/failed, failed if any item failed,
+        - total_items=<INT> number of items in the playlist,
+        - remaining_items=<INT> number of items that were not synced,
+        - skipped_items=<INT> number of unchanged items that were not sent again, with a sync_state,
 
         :param int syncsketch_project_id:
         :param str playlist_code:
         :param int playlist_id:
         :param int review_id: (optional)
+        :param int max_workers: (optional) Maximum number of items synced at the same time
+        :param progress_callback: (optional) Called with a syncsketch.progress.Progress as items complete, with
+                                  parts_done and total_parts counting playlist items, see syncsketch.progress
+        :param syncsketch.syncstate.ShotgridSyncState sync_state: (optional) Local record of earlier syncs, enables
+                                                                  incremental syncs
         :return:
         :rtype: dict
         """
@@ -2155,24 +3043,93 @@ class SyncSketchAPI:
         if self.debug:
             print(response)
 
+        items = response.get("items", [])
         result = dict(
             review_id=response["review_id"],
             items=[],
+            failed=[],
             status="done",
-            total_items=len(response["items"]),
+            total_items=len(items),
+            remaining_items=len(items),
+            skipped_items=0,
         )
 
-        if "items" in response:
-            for item in response["items"]:
-                data = {"playlist_item_json": json.dumps(item)}
-                item_sync_url = "/api/v2/shotgun/sync-items/project/{}/review/{}/".format(
-                    syncsketch_project_id, response["review_id"]
-                )
-                item_data = self._get_json_response(item_sync_url, method="post", postData=data)
-                result["items"].append(item_data["id"])
+        # SyncSketch item ids of the unchanged items, None for items that have to be sent
+        known_ids = [None] * len(items)
+        if sync_state is not None:
+            known_ids = [sync_state.get(response["review_id"], item) for item in items]
 
+        item_sync_url = "/api/v2/shotgun/sync-items/project/{}/review/{}/".format(
+            syncsketch_project_id, response["review_id"]
+        )
+        progress = None
+        if progress_callback is not None:
+            progress = ProgressReporter(progress_callback, total_parts=len(items), status="syncing")
+            progress.update(parts=len(items) - known_ids.count(None))
+
+        def sync_item(item):
+            try:
+                item_data = self._get_json_response(
+                    item_sync_url, method="post", postData={"playlist_item_json": self.json_codec.dumps_text(item)}
+                )
                 if self.debug:
                     print(item_data)
+                if "id" not in item_data:
+                    raise Exception("No item id in response: {}".format(item_data))
+                return item_data["id"]
+            finally:
+                if progress is not None:
+                    progress.update(parts=1)
+
+        sync_item = self.tracer.bind(sync_item)
+        with thread_pool(max(1, max_workers)) as executor:
+            futures = [
+                executor.submit(sync_item, item) if known_id is None else None
+                for item, known_id in zip(items, known_ids)
+            ]
+
+            for index, future in enumerate(futures):
+                if future is None:
+                    result["items"].append(known_ids[index])
+                    result["remaining_items"] -= 1
+                    result["skipped_items"] += 1
+                    continue
+
+                try:
+                    # For Python 3's ThreadPoolExecutor
+                    item_id = future.result() if hasattr(future, "result") else executor.result(future)
+                except Exception as e:
+                    result["failed"].append({"index": index, "item": items[index], "error": repr(e)})
+                    continue
+
+                if item_id is None:
+                    result["failed"].append({"index": index, "item": items[index], "error": "No item id returned"})
+                    continue
+
+                result["items"].append(item_id)
+                result["remaining_items"] -= 1
+                known_ids[index] = item_id
+
+        sent = len(items) - result["skipped_items"]
+        if max_workers > 1 and sent > 1:
+            # the server appends items in the order the concurrent requests arrive
+            self._restore_review_item_order(response["review_id"], result["items"])
+
+        if sync_state is not None:
+            # failed items are not recorded, so they are sent again next time
+            sync_state.replace(
+                response["review_id"],
+                [(item, item_id) for item, item_id in zip(items, known_ids) if item_id is not None],
+            )
+            sync_state.save()
+
+        if result["failed"]:
+            result["status"] = "failed"
+            print("Failed to sync {} of {} playlist items".format(len(result["failed"]), len(items)))
+
+        if progress is not None:
+            progress.finish(ok=not result["failed"])
+
         return result
 
     def get_shotgrid_sync_review_items_progress(self, task_id):
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+Local state for incremental Shotgrid playlist syncs.
+
+Pass a :class:`ShotgridSyncState` to :meth:`syncsketch.SyncSketchAPI.shotgrid_sync_review_items` and only playlist
+items that are new or changed since the last sync of the same review are sent again.
+
+.. code:: python
+
+    from syncsketch.syncstate import ShotgridSyncState
+
+    state = ShotgridSyncState("~/.syncsketch_shotgrid_sync.json")
+    s.shotgrid_sync_review_items(project_id, playlist_code, playlist_id, review_id=review_id, sync_state=state)
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import hashlib
+import json
+import os
+import threading
+from io import open
+
+from .fileutil import atomic_write_json
+
+# fields of a Shotgrid playlist item that change whenever the item or its version changes
+UPDATED_FIELDS = ("updated_at", "sg_updated_at")
+
+
+def playlist_item_key(item):
+    """
+    Return the key of a Shotgrid playlist item: the id of its version, or its own id.
+
+    :param dict item: Playlist item as returned by the shotgrid sync check endpoint
+    :rtype: str
+    """
+    version = item.get("version")
+    if isinstance(version, dict) and version.get("id") is not None:
+        return "version:%s" % version["id"]
+    if item.get("id") is not None:
+        return "id:%s" % item["id"]
+    return "sha256:%s" % _content_hash(item)
+
+
+def playlist_item_fingerprint(item):
+    """
+    Return a fingerprint that changes when a playlist item changes: its updated timestamp when it has one,
+    otherwise a hash of its contents.
+
+    :param dict item: Playlist item
+    :rtype: str
+    """
+    for field in UPDATED_FIELDS:
+        if item.get(field):
+            return "%s:%s" % (field, item[field])
+
+        version = item.get("version")
+        if isinstance(version, dict) and version.get(field):
+            return "version.%s:%s" % (field, version[field])
+
+    return "sha256:%s" % _content_hash(item)
+
+
+def _content_hash(item):
+    return hashlib.sha256(json.dumps(item, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class ShotgridSyncState(object):
+    """
+    Thread safe record of the playlist items synced into each review, optionally persisted as JSON.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path=None):
+        """
+        :param str path: (Optional) JSON file to load and save the state, in memory only when omitted
+        """
+        self.path = os.path.expanduser(path) if path else None
+        self._lock = threading.Lock()
+        # review id -> item key -> [fingerprint, syncsketch item id]
+        self._reviews = {}
+
+        if self.path and os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == self.VERSION:
+                self._reviews = data.get("reviews", {})
+
+    def get(self, review_id, item):
+        """
+        Return the SyncSketch item id of a playlist item if it was synced into the review and did not change since.
+
+        :param int review_id: SyncSketch review id
+        :param dict item: Playlist item
+        :rtype: Optional[int]
+        """
+        with self._lock:
+            entry = self._reviews.get(str(review_id), {}).get(playlist_item_key(item))
+        if entry and entry[0] == playlist_item_fingerprint(item):
+            return entry[1]
+        return None
+
+    def replace(self, review_id, synced):
+        """
+        Replace the state of a review.
+
+        :param int review_id: SyncSketch review id
+        :param list synced: (playlist item, SyncSketch item id) tuples of the items now in sync
+        """
+        entries = dict(
+            (playlist_item_key(item), [playlist_item_fingerprint(item), item_id]) for item, item_id in synced
+        )
+        with self._lock:
+            self._reviews[str(review_id)] = entries
+
+    def forget(self, review_id):
+        """
+        Drop the state of a review, so its next sync sends every item.
+        """
+        with self._lock:
+            self._reviews.pop(str(review_id), None)
+
+    def save(self):
+        """
+        Write the state to its JSON file, if it has one.
+        """
+        if not self.path:
+            return
+
+        with self._lock:
+            data = {"version": self.VERSION, "reviews": dict(self._reviews)}
+
+        atomic_write_json(self.path, data)
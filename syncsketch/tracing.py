@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+Optional OpenTelemetry tracing for the SyncSketch API client.
+
+When the ``opentelemetry-api`` package is installed, every public :class:`syncsketch.SyncSketchAPI` method
+opens a parent span, every HTTP call a child span and every multipart upload part a span with the part number,
+size and attempt as attributes. Without the package all of this is a no-op.
+
+Spans go to the globally configured tracer provider, or to the one passed to the client, e.g. for tests. The global
+provider is looked up on the first span after ``opentelemetry`` was imported, e.g. by the code that configured it,
+so clients created before tracing was set up are traced too. Until then the client does not import it at all:
+
+.. code:: python
+
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+
+    s = SyncSketchAPI("username", "api-key", use_header_auth=True, tracer_provider=provider)
+    s.upload_file(review_id, "/tmp/movie.webm")
+
+    print([span.name for span in exporter.get_finished_spans()])
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import functools
+import sys
+import types
+from contextlib import contextmanager
+
+TRACER_NAME = "syncsketch"
+
+# code flag of generator functions, inspect.CO_GENERATOR without importing inspect
+CO_GENERATOR = 0x20
+
+# OpenTelemetry modules, imported when the first Tracer is created, False when not installed
+_otel = None
+
+
+def _load_otel():
+    global _otel
+    if _otel is None:
+        try:
+            from opentelemetry import context as otel_context
+            from opentelemetry import trace as otel_trace
+
+            _otel = (otel_context, otel_trace)
+        except ImportError:
+            _otel = False
+    return _otel
+
+
+class _NoopSpan(object):
+    def set_attribute(self, key, value):
+        pass
+
+    def set_attributes(self, attributes):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+# Tracer._tracer before the tracer was looked up
+_UNRESOLVED = object()
+
+
+class Tracer(object):
+    """
+    Thin wrapper around an OpenTelemetry tracer that degrades to a no-op.
+    """
+
+    def __init__(self, tracer_provider=None):
+        """
+        :param tracer_provider: (Optional) OpenTelemetry TracerProvider, defaults to the global provider
+        """
+        self._tracer_provider = tracer_provider
+        self._tracer = _UNRESOLVED
+
+    def _get_tracer(self):
+        tracer = self._tracer
+        if tracer is _UNRESOLVED:
+            if self._tracer_provider is None and "opentelemetry.trace" not in sys.modules:
+                # nothing imported OpenTelemetry yet, so no global provider is configured, look again on the next span
+                return None
+
+            otel = _load_otel()
+            tracer = otel[1].get_tracer(TRACER_NAME, tracer_provider=self._tracer_provider) if otel else None
+            self._tracer = tracer
+        return tracer
+
+    @property
+    def enabled(self):
+        return self._get_tracer() is not None
+
+    @contextmanager
+    def span(self, name, attributes=None):
+        """
+        Open a span as a child of the current span.
+
+        :param str name: Span name
+        :param dict attributes: (Optional) Span attributes
+        """
+        tracer = self._get_tracer()
+        if tracer is None:
+            yield _NOOP_SPAN
+            return
+
+        with tracer.start_as_current_span(name, attributes=attributes) as span:
+            yield span
+
+    def bind(self, fn):
+        """
+        Return `fn` wrapped to run in the tracing context of the caller.
+        Use this for callables that are run in worker threads so their spans keep the right parent.
+
+        :param callable fn: Function to wrap
+        :return: Wrapped function
+        """
+        if self._get_tracer() is None:
+            return fn
+
+        otel_context = _otel[0]
+        ctx = otel_context.get_current()
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            token = otel_context.attach(ctx)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                otel_context.detach(token)
+
+        return wrapper
+
+
+def _traced(func):
+    span_name = "SyncSketchAPI.%s" % func.__name__
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if not self.tracer.enabled:
+            return func(self, *args, **kwargs)
+
+        with self.tracer.span(span_name):
+            return func(self, *args, **kwargs)
+
+    return wrapper
+
+
+def trace_public_methods(cls):
+    """
+    Class decorator that opens a span around every public method of `cls`.
+    Aliases of a method share the same wrapper and span name.
+    """
+    wrappers = {}
+
+    for name, value in list(vars(cls).items()):
+        if name.startswith("_") or not isinstance(value, types.FunctionType) or value.__code__.co_flags & CO_GENERATOR:
+            continue
+
+        if value not in wrappers:
+            wrappers[value] = _traced(value)
+
+        setattr(cls, name, wrappers[value])
+
+    return cls
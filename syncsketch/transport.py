@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+Pluggable HTTP transports for the SyncSketch API client.
+
+A transport is any object with a ``request(method, url, **kwargs)`` method that returns a
+``requests.Response``, the same signature as :func:`requests.request`. The default transport is the
+``requests`` module itself. Pass another one to :class:`syncsketch.SyncSketchAPI` with ``transport=...``.
+
+:class:`RecordingTransport` and :class:`ReplayTransport` record real traffic to a cassette file and replay it
+later without a network, either at full speed or with the recorded timing:
+
+.. code:: python
+
+    from syncsketch.transport import RecordingTransport, ReplayTransport
+
+    with RecordingTransport("tree.jsonl.gz") as transport:
+        s = SyncSketchAPI("username", "api-key", transport=transport)
+        tree = s.get_tree(withItems=True)
+
+    s = SyncSketchAPI("username", "api-key", transport=ReplayTransport("tree.jsonl.gz", realtime=True))
+    tree = s.get_tree(withItems=True)
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import base64
+import datetime
+import gzip
+import io
+import json
+import threading
+import time
+from collections import deque
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+try:
+    # Python 3
+    from urllib.parse import parse_qsl, urlsplit, urlunsplit
+except ImportError:
+    # Python 2
+    from urlparse import parse_qsl, urlsplit, urlunsplit
+
+CASSETTE_VERSION = 1
+
+# credentials are never written to a cassette and ignored when matching requests
+AUTH_PARAMS = ("api_key", "username", "token", "email")
+
+RECORDED_HEADERS = ("Content-Type", "ETag")
+
+
+class CassetteError(Exception):
+    """
+    Raised when a replayed request has no recording.
+    """
+
+
+def request_key(method, url, params=None):
+    """
+    Return the key requests are matched on: method, url without query and the sorted
+    query / params without credentials.
+
+    :param str method: HTTP method
+    :param str url: Request url
+    :param dict params: (Optional) Query parameters
+    :rtype: str
+    """
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if params:
+        items = params.items() if hasattr(params, "items") else params
+        query.extend((key, value) for key, value in items if value is not None)
+
+    query = sorted((str(key), str(value)) for key, value in query if key not in AUTH_PARAMS)
+    base = urlunsplit((parts.scheme, parts.netloc, parts.path, "", ""))
+
+    return "%s %s %s" % (method.upper(), base, json.dumps(query, separators=(",", ":")))
+
+
+def _open_cassette(path, mode):
+    if path.endswith(".gz"):
+        return io.TextIOWrapper(gzip.open(path, mode + "b"), encoding="utf-8")
+    return io.open(path, mode, encoding="utf-8")
+
+
+class RecordingTransport(object):
+    """
+    Transport that passes requests on to another transport and appends every exchange to a cassette file.
+
+    Cassettes are JSON lines, gzip compressed when the path ends in ".gz". Credentials in query parameters and
+    headers are not recorded.
+    """
+
+    def __init__(self, path, transport=None):
+        """
+        :param str path: Cassette file to write, existing files are overwritten
+        :param transport: (Optional) Transport to record, defaults to the requests module
+        """
+        self.path = path
+        self.transport = transport or requests
+        self._lock = threading.Lock()
+        self._file = _open_cassette(path, "w")
+        self._write({"version": CASSETTE_VERSION})
+
+    def _write(self, entry):
+        with self._lock:
+            self._file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+    def request(self, method, url, **kwargs):
+        start_time = time.time()
+        response = self.transport.request(method, url, **kwargs)
+        content = response.content
+
+        try:
+            body = {"text": content.decode("utf-8")}
+        except UnicodeDecodeError:
+            body = {"base64": base64.b64encode(content).decode("ascii")}
+
+        entry = {
+            "key": request_key(method, url, kwargs.get("params")),
+            "elapsed": time.time() - start_time,
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": dict((key, response.headers[key]) for key in RECORDED_HEADERS if key in response.headers),
+        }
+        entry.update(body)
+        self._write(entry)
+
+        return response
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class ReplayTransport(object):
+    """
+    Transport that answers requests from a cassette written by :class:`RecordingTransport`.
+
+    Requests are matched on method, url and query parameters. Repeated requests are answered in recorded order;
+    once the recordings for a request are used up the last one is repeated.
+    """
+
+    def __init__(self, path, realtime=False, speed=1.0):
+        """
+        :param str path: Cassette file to read
+        :param bool realtime: (Optional) Wait for the recorded duration of every request before answering
+        :param float speed: (Optional) Speed up (> 1) or slow down (< 1) the recorded timing when realtime is set
+        """
+        self.path = path
+        self.realtime = realtime
+        self.speed = speed
+        self._lock = threading.Lock()
+        self._recordings = {}
+        self._last = {}
+
+        with _open_cassette(path, "r") as f:
+            header = json.loads(f.readline())
+            if header.get("version") != CASSETTE_VERSION:
+                raise CassetteError("Unsupported cassette version: {}".format(header.get("version")))
+
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._recordings.setdefault(entry["key"], deque()).append(entry)
+
+    def request(self, method, url, **kwargs):
+        key = request_key(method, url, kwargs.get("params"))
+
+        with self._lock:
+            recordings = self._recordings.get(key)
+            if recordings:
+                entry = self._last[key] = recordings.popleft()
+            else:
+                entry = self._last.get(key)
+
+        if entry is None:
+            raise CassetteError("No recorded response for request: {}".format(key))
+
+        if self.realtime and entry["elapsed"] > 0:
+            time.sleep(entry["elapsed"] / self.speed)
+
+        return self._build_response(entry, url)
+
+    @staticmethod
+    def _build_response(entry, url):
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response.reason = entry.get("reason")
+        response.headers = CaseInsensitiveDict(entry.get("headers", {}))
+        response.url = url
+        response.encoding = "utf-8"
+        response.elapsed = datetime.timedelta(seconds=entry["elapsed"])
+
+        if "base64" in entry:
+            response._content = base64.b64decode(entry["base64"])
+        else:
+            response._content = entry["text"].encode("utf-8")
+        response._content_consumed = True
+
+        return response
@@ -0,0 +1,619 @@
+# -*- coding: utf-8 -*-
+"""
+Durable upload queue on disk, so large ingests are fire-and-forget and survive crashes and reboots.
+
+Jobs are rows in a SQLite database with a status ("pending", "running", "done" or "failed"), an attempt count and
+the result or error of the last attempt. Any number of processes can submit jobs to the same file, workers drain it
+with bounded concurrency and retry failed attempts with a growing delay.
+
+Running jobs keep a heartbeat. Jobs of a worker process that died, e.g. with the machine, are picked up again once
+their heartbeat is older than ``lease`` seconds. Multipart uploads (``upload_file``) save their uploaded parts as
+they go and resume with the missing parts, other jobs start over.
+
+Submit jobs, e.g. from a render farm task:
+
+.. code:: python
+
+    from syncsketch.uploadqueue import UploadQueue
+
+    queue = UploadQueue()  # ~/.syncsketch/uploads.db
+    job_id = queue.submit("upload_file", [review_id, "/mnt/renders/sh010_comp_v003.mov"])
+
+Drain the queue in a long running process, credentials can also come from SYNCSKETCH_USER and SYNCSKETCH_API_KEY:
+
+.. code:: bash
+
+    python -m syncsketch.uploadqueue run --user artist@example.com --api-key KEY --jobs 4
+    python -m syncsketch.uploadqueue list --status failed
+    python -m syncsketch.uploadqueue retry
+    python -m syncsketch.uploadqueue prune --status done --older-than 86400
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import traceback
+
+from .agent import FILE_METHODS, JOB_METHODS, _json_default
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+STATUSES = (PENDING, RUNNING, DONE, FAILED)
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".syncsketch", "uploads.db")
+
+# methods that save their progress while they run and resume from it on the next attempt
+RESUMABLE_METHODS = ("upload_file",)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    method TEXT NOT NULL,
+    args TEXT NOT NULL,
+    kwargs TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    result TEXT,
+    error TEXT,
+    checkpoint TEXT,
+    owner TEXT,
+    submitted REAL NOT NULL,
+    run_after REAL NOT NULL,
+    started REAL,
+    heartbeat REAL,
+    finished REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, run_after);
+"""
+
+_JSON_COLUMNS = ("args", "kwargs", "result", "checkpoint")
+
+
+class JobCheckpoint(object):
+    """
+    Keeps the upload state of one job in the queue, passed as ``checkpoint`` to
+    :meth:`syncsketch.SyncSketchAPI.upload_file`.
+    """
+
+    def __init__(self, queue, job_id, state=None, interval=1.0):
+        """
+        :param UploadQueue queue: Queue of the job
+        :param int job_id: Job id
+        :param dict state: (Optional) State saved by an earlier attempt
+        :param float interval: (Optional) Seconds between writes, the parts of the last interval are sent again after
+            a crash
+        """
+        self.queue = queue
+        self.job_id = job_id
+        self.interval = interval
+        self._state = state
+        self._saved = 0
+        self._lost = False
+
+    def load(self):
+        return self._state
+
+    def save(self, state):
+        self._state = state
+        now = time.time()
+        # a new or finished upload is written right away, progress at most once per interval
+        if state is None or not state["parts"] or now - self._saved >= self.interval:
+            self._saved = now
+            try:
+                if not self.queue._save_checkpoint(self.job_id, state) and not self._lost:
+                    self._lost = True
+                    print("Upload queue job {} lost its lease, its progress is no longer saved".format(self.job_id))
+            except sqlite3.Error as e:
+                # the upload goes on, a later save or the next attempt catches up
+                print("Failed to save the progress of upload queue job {}: {}".format(self.job_id, e))
+
+
+class UploadQueue(object):
+    """
+    Persistent queue of upload and update jobs of the API client.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, max_attempts=3, retry_delay=30, lease=60):
+        """
+        :param str path: (Optional) SQLite database file, created if missing
+        :param int max_attempts: (Optional) Default number of attempts of a job before it fails
+        :param float retry_delay: (Optional) Seconds before the first retry of a job, doubled for every further retry
+        :param float lease: (Optional) Seconds without a heartbeat before a running job counts as interrupted
+        """
+        self.path = os.path.expanduser(path)
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.lease = lease
+        self.owner = "{}:{}".format(socket.gethostname(), os.getpid())
+
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        self._lock = threading.Lock()
+        # autocommit, transactions are explicit
+        self._db = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+        self.api = None
+        self._workers = []
+        self._heartbeat_thread = None
+        self._stopping = threading.Event()
+        self._heartbeat_stop = threading.Event()
+        self._wake = threading.Event()
+
+    def _execute(self, sql, params=()):
+        with self._lock:
+            return self._db.execute(sql, params)
+
+    def _query(self, sql, params=()):
+        # rows are fetched under the lock, the connection is shared by all threads
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    def _job(self, row):
+        job = dict(zip(row.keys(), row))
+        for column in _JSON_COLUMNS:
+            if job[column] is not None:
+                job[column] = json.loads(job[column])
+        return job
+
+    """
+    Jobs
+    """
+
+    def submit(self, method, args=(), kwargs=None, max_attempts=None):
+        """
+        Queue a client method call, e.g. ``submit("upload_file", [review_id, filepath])``.
+        Relative file paths are resolved here, the workers may run in another directory.
+
+        :param str method: Client method, one of syncsketch.agent.JOB_METHODS
+        :param list args: (Optional) Positional arguments of the method, JSON serializable
+        :param dict kwargs: (Optional) Keyword arguments of the method, JSON serializable
+        :param int max_attempts: (Optional) Attempts before the job fails, the queue default when omitted
+        :return: Job id
+        :rtype: int
+        """
+        if method not in JOB_METHODS:
+            raise ValueError("{!r} can not run as a job, expected one of {}".format(method, ", ".join(JOB_METHODS)))
+
+        args = list(args)
+        kwargs = dict(kwargs or {})
+        if method in FILE_METHODS:
+            if len(args) > 1:
+                args[1] = os.path.abspath(args[1])
+            elif "filepath" in kwargs:
+                kwargs["filepath"] = os.path.abspath(kwargs["filepath"])
+
+        now = time.time()
+        cursor = self._execute(
+            "INSERT INTO jobs (method, args, kwargs, status, max_attempts, submitted, run_after) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (method, json.dumps(args), json.dumps(kwargs), PENDING, max_attempts or self.max_attempts, now, now),
+        )
+        self._wake.set()
+        return cursor.lastrowid
+
+    def status(self, job_id):
+        """
+        Return a job, None if it is unknown.
+
+        :param int job_id: Job id
+        :rtype: Optional[dict]
+        """
+        rows = self._query("SELECT * FROM jobs WHERE id = ?", (job_id,))
+        return self._job(rows[0]) if rows else None
+
+    def jobs(self, status=None, limit=None):
+        """
+        Return jobs in submission order, optionally only those with a status.
+
+        :param str status: (Optional) "pending", "running", "done" or "failed"
+        :param int limit: (Optional) Return at most this many jobs, the most recent ones
+        :rtype: list[dict]
+        """
+        sql = "SELECT * FROM jobs"
+        params = []
+        if status is not None:
+            sql += " WHERE status = ?"
+            params.append(status)
+        sql += " ORDER BY id DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [self._job(row) for row in reversed(self._query(sql, params))]
+
+    def counts(self):
+        """
+        Return the number of jobs per status.
+
+        :rtype: dict
+        """
+        counts = dict((status, 0) for status in STATUSES)
+        for status, count in self._query("SELECT status, COUNT(*) FROM jobs GROUP BY status"):
+            counts[status] = count
+        return counts
+
+    def retry(self, job_id=None):
+        """
+        Queue failed jobs again with a fresh attempt count.
+
+        :param int job_id: (Optional) Only this job, all failed jobs when omitted
+        :return: Number of jobs queued again
+        :rtype: int
+        """
+        sql = "UPDATE jobs SET status = ?, attempts = 0, run_after = ?, finished = NULL WHERE status = ?"
+        params = [PENDING, time.time(), FAILED]
+        if job_id is not None:
+            sql += " AND id = ?"
+            params.append(job_id)
+        count = self._execute(sql, params).rowcount
+        self._wake.set()
+        return count
+
+    def prune(self, statuses=(DONE,), older_than=None):
+        """
+        Delete jobs. Running jobs are never deleted, prune pending jobs to cancel them.
+
+        :param statuses: (Optional) Statuses of the jobs to delete, done jobs by default
+        :param float older_than: (Optional) Only jobs finished, or submitted when not finished, this many seconds ago
+        :return: Number of deleted jobs
+        :rtype: int
+        """
+        if isinstance(statuses, str):
+            statuses = (statuses,)
+        if RUNNING in statuses:
+            raise ValueError("running jobs can not be pruned")
+
+        sql = "DELETE FROM jobs WHERE status IN ({})".format(", ".join("?" for _ in statuses))
+        params = list(statuses)
+        if older_than is not None:
+            sql += " AND COALESCE(finished, submitted) < ?"
+            params.append(time.time() - older_than)
+        return self._execute(sql, params).rowcount
+
+    def recover(self):
+        """
+        Queue running jobs again whose worker stopped sending heartbeats, e.g. after a crash or reboot.
+        Called when workers start, and regularly while they run.
+
+        :return: Number of interrupted jobs
+        :rtype: int
+        """
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._db.execute(
+                    "SELECT id, attempts, max_attempts FROM jobs WHERE status = ? AND heartbeat < ?",
+                    (RUNNING, now - self.lease),
+                ).fetchall()
+                for job_id, attempts, max_attempts in rows:
+                    self._db.execute(
+                        "UPDATE jobs SET status = ?, error = ?, owner = NULL, run_after = ?, finished = ? WHERE id = ?",
+                        (
+                            PENDING if attempts < max_attempts else FAILED,
+                            "interrupted",
+                            now,
+                            None if attempts < max_attempts else now,
+                            job_id,
+                        ),
+                    )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    def _claim(self):
+        # pick the oldest due job, atomic between processes sharing the file
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute(
+                    "SELECT * FROM jobs WHERE status = ? AND run_after <= ? ORDER BY id LIMIT 1", (PENDING, now)
+                ).fetchone()
+                if row is not None:
+                    self._db.execute(
+                        "UPDATE jobs SET status = ?, attempts = attempts + 1, owner = ?, started = ?, heartbeat = ? "
+                        "WHERE id = ?",
+                        (RUNNING, self.owner, now, now, row["id"]),
+                    )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        job = self._job(row)
+        job["attempts"] += 1
+        return job
+
+    def _save_checkpoint(self, job_id, state):
+        # only while the job is still ours, after a lost lease another worker owns the checkpoint
+        cursor = self._execute(
+            "UPDATE jobs SET checkpoint = ?, heartbeat = ? WHERE id = ? AND owner = ? AND status = ?",
+            (json.dumps(state) if state is not None else None, time.time(), job_id, self.owner, RUNNING),
+        )
+        return cursor.rowcount > 0
+
+    def _finish(self, job, result, error):
+        now = time.time()
+        if error and job["attempts"] < job["max_attempts"]:
+            delay = self.retry_delay * 2 ** (job["attempts"] - 1)
+            cursor = self._execute(
+                "UPDATE jobs SET status = ?, error = ?, owner = NULL, run_after = ? "
+                "WHERE id = ? AND owner = ? AND status = ?",
+                (PENDING, error, now + delay, job["id"], self.owner, RUNNING),
+            )
+        else:
+            cursor = self._execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, owner = NULL, finished = ? "
+                "WHERE id = ? AND owner = ? AND status = ?",
+                (
+                    FAILED if error else DONE,
+                    json.dumps(result, default=_json_default),
+                    error,
+                    now,
+                    job["id"],
+                    self.owner,
+                    RUNNING,
+                ),
+            )
+
+        if cursor.rowcount == 0:
+            # the lease expired and the job was queued again or claimed by another worker, whose outcome counts
+            print("Dropped the result of upload queue job {}, its lease was lost".format(job["id"]))
+
+    """
+    Workers
+    """
+
+    def start(self, api, max_jobs=2, poll_interval=1.0):
+        """
+        Run jobs in background threads until stop is called, interrupted jobs first.
+
+        :param syncsketch.SyncSketchAPI api: API client that runs the jobs
+        :param int max_jobs: (Optional) Maximum number of jobs running at the same time in this process
+        :param float poll_interval: (Optional) Seconds between checks for jobs submitted by other processes
+        :return: self
+        """
+        self.api = api
+        self._stopping.clear()
+        self._heartbeat_stop.clear()
+        self.recover()
+
+        for index in range(max_jobs):
+            worker = threading.Thread(
+                target=self._work, args=(poll_interval,), name="syncsketch-uploadqueue-%d" % index
+            )
+            worker.daemon = True
+            worker.start()
+            self._workers.append(worker)
+
+        self._heartbeat_thread = threading.Thread(
+            target=self._heartbeat, args=(list(self._workers),), name="syncsketch-uploadqueue-heartbeat"
+        )
+        self._heartbeat_thread.daemon = True
+        self._heartbeat_thread.start()
+        return self
+
+    def stop(self, wait=True):
+        """
+        Stop the workers after their current jobs. Pending jobs stay queued. Running jobs keep their heartbeat
+        until they finish, so no other process picks them up meanwhile.
+
+        :param bool wait: (Optional) Wait for running jobs to finish
+        """
+        self._stopping.set()
+        self._wake.set()
+        workers, self._workers = self._workers, []
+        if wait:
+            for worker in workers:
+                worker.join()
+            # without wait the heartbeat ends by itself after the last job
+            self._heartbeat_stop.set()
+            if self._heartbeat_thread is not None:
+                self._heartbeat_thread.join()
+                self._heartbeat_thread = None
+
+    def join(self, timeout=None, poll_interval=1.0):
+        """
+        Wait until no job is pending or running, e.g. to drain the queue and exit.
+
+        :param float timeout: (Optional) Seconds to wait, forever when omitted
+        :param float poll_interval: (Optional) Seconds between checks
+        :return: True if the queue is drained, False on timeout
+        :rtype: bool
+        """
+        deadline = time.time() + timeout if timeout is not None else None
+        while True:
+            counts = self.counts()
+            if not counts[PENDING] and not counts[RUNNING]:
+                return True
+            if deadline is not None and time.time() >= deadline:
+                return False
+            time.sleep(poll_interval)
+
+    def wait(self, job_id, timeout=None, poll_interval=1.0):
+        """
+        Wait until a job is done or failed.
+
+        :param int job_id: Job id
+        :param float timeout: (Optional) Seconds to wait, forever when omitted
+        :param float poll_interval: (Optional) Seconds between status checks
+        :return: The finished job, None on timeout or if the job is unknown
+        :rtype: Optional[dict]
+        """
+        deadline = time.time() + timeout if timeout is not None else None
+        while True:
+            job = self.status(job_id)
+            if job is None or job["status"] in (DONE, FAILED):
+                return job
+            if deadline is not None and time.time() >= deadline:
+                print("Timed out waiting for job {}".format(job_id))
+                return None
+            time.sleep(poll_interval)
+
+    def close(self):
+        """
+        Stop the workers and close the database.
+        """
+        self.stop()
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _work(self, poll_interval):
+        while not self._stopping.is_set():
+            try:
+                job = self._claim()
+            except sqlite3.Error as e:
+                # e.g. "database is locked" while another process holds the file, try again
+                print("Failed to pick a job from the upload queue: {}".format(e))
+                self._stopping.wait(poll_interval)
+                continue
+
+            if job is None:
+                self._wake.wait(poll_interval)
+                self._wake.clear()
+                continue
+            self._run(job, poll_interval)
+
+    def _heartbeat(self, workers):
+        # runs until the last job of `workers` finished, another process would run a job without heartbeat again
+        while not self._heartbeat_stop.wait(self.lease / 3.0):
+            stopping = self._stopping.is_set()
+            if stopping and not any(worker.is_alive() for worker in workers):
+                return
+            try:
+                self._execute(
+                    "UPDATE jobs SET heartbeat = ? WHERE status = ? AND owner = ?", (time.time(), RUNNING, self.owner)
+                )
+                if not stopping and self.recover():
+                    self._wake.set()
+            except sqlite3.Error as e:
+                print("Failed to update the upload queue heartbeat: {}".format(e))
+
+    def _run(self, job, poll_interval):
+        kwargs = dict(job["kwargs"])
+        if job["method"] in RESUMABLE_METHODS:
+            kwargs["checkpoint"] = JobCheckpoint(self, job["id"], job["checkpoint"])
+
+        result = error = None
+        try:
+            result = getattr(self.api, job["method"])(*job["args"], **kwargs)
+            if result is None or result is False:
+                # client methods print the reason and return None or False on failure
+                error = "{} failed".format(job["method"])
+        except Exception as e:
+            if self.api.debug:
+                traceback.print_exc()
+            error = "{}: {}".format(type(e).__name__, e)
+
+        # keep trying to record the outcome, the heartbeat keeps the job ours meanwhile
+        while True:
+            try:
+                self._finish(job, result, error)
+                return
+            except sqlite3.Error as e:
+                print("Failed to record the result of upload queue job {}: {}".format(job["id"], e))
+            if self._stopping.wait(poll_interval):
+                try:
+                    self._finish(job, result, error)
+                except sqlite3.Error:
+                    print("Upload queue job {} runs again after its lease expired".format(job["id"]))
+                return
+
+
+def _parse_value(value):
+    # numbers and JSON values as such, anything else as a string
+    try:
+        return json.loads(value)
+    except ValueError:
+        return value
+
+
+def main(argv=None):
+    import argparse
+
+    from .agent import _add_client_arguments, _client_from_arguments
+
+    parser = argparse.ArgumentParser(description="SyncSketch durable upload queue")
+    parser.add_argument("--db", default=DEFAULT_PATH, help="queue database, default %(default)s")
+    commands = parser.add_subparsers(dest="command")
+
+    run = commands.add_parser("run", help="run jobs until interrupted")
+    run.add_argument("--jobs", type=int, default=2, help="jobs running at the same time")
+    run.add_argument("--drain", action="store_true", help="exit when no job is pending or running")
+    _add_client_arguments(run)
+
+    submit = commands.add_parser("submit", help="queue a job, e.g. submit upload_file 123 /tmp/movie.mov")
+    submit.add_argument("method", choices=JOB_METHODS)
+    submit.add_argument("args", nargs="*", help="positional arguments, numbers and JSON are decoded")
+    submit.add_argument("--max-attempts", type=int)
+
+    listing = commands.add_parser("list", help="show jobs")
+    listing.add_argument("--status", choices=STATUSES)
+    listing.add_argument("--limit", type=int, default=50)
+
+    retry = commands.add_parser("retry", help="queue failed jobs again")
+    retry.add_argument("job_id", type=int, nargs="?")
+
+    prune = commands.add_parser("prune", help="delete finished jobs")
+    prune.add_argument("--status", choices=(PENDING, DONE, FAILED), action="append")
+    prune.add_argument("--older-than", type=float, help="seconds")
+
+    args = parser.parse_args(argv)
+    if args.command is None:
+        parser.error("a command is required")
+
+    queue = UploadQueue(args.db)
+    try:
+        if args.command == "run":
+            queue.start(_client_from_arguments(run, args, args.jobs), max_jobs=args.jobs)
+            print("SyncSketch upload queue {} running, {}".format(queue.path, queue.counts()))
+            try:
+                if args.drain:
+                    queue.join()
+                else:
+                    while True:
+                        time.sleep(3600)
+            except KeyboardInterrupt:
+                print("Stopping after the running jobs")
+        elif args.command == "submit":
+            job_args = [_parse_value(value) for value in args.args]
+            print(queue.submit(args.method, job_args, max_attempts=args.max_attempts))
+        elif args.command == "list":
+            for job in queue.jobs(status=args.status, limit=args.limit):
+                print(
+                    "{id:>6}  {status:<8} {attempts}/{max_attempts}  {method}  {args}  {error}".format(
+                        **dict(job, error=job["error"] or "")
+                    )
+                )
+            print(queue.counts())
+        elif args.command == "retry":
+            print("{} jobs queued again".format(queue.retry(args.job_id)))
+        elif args.command == "prune":
+            print("{} jobs deleted".format(queue.prune(args.status or (DONE,), args.older_than)))
+    finally:
+        queue.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,440 @@
+# -*- coding: utf-8 -*-
+"""
+Multipart upload state and scheduling used by :meth:`syncsketch.SyncSketchAPI.upload_file` and
+:meth:`syncsketch.SyncSketchAPI.upload_many`.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import os
+import threading
+from io import open
+
+try:
+    import mmap
+except ImportError:
+    mmap = None
+
+DEFAULT_CHUNK_SIZE = 5 * 1024 * 1024
+
+# Set to False to always read parts into memory instead of memory-mapping the file
+USE_MMAP = True
+
+
+class PartReader(object):
+    """
+    Read only file-like view of one part, passed to requests as a streaming request body.
+
+    Reads return memoryview slices of the underlying buffer, so no bytes are copied before they hit the socket.
+    """
+
+    def __init__(self, view, on_close=None):
+        self._view = view
+        self._position = 0
+        self._on_close = on_close
+
+    def __len__(self):
+        return len(self._view)
+
+    def read(self, size=-1):
+        start = self._position
+        end = len(self._view) if size is None or size < 0 else min(len(self._view), start + size)
+        self._position = end
+        return self._view[start:end]
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_CUR:
+            offset += self._position
+        elif whence == os.SEEK_END:
+            offset += len(self._view)
+        self._position = max(0, min(len(self._view), offset))
+        return self._position
+
+    def close(self):
+        # memoryview.release is Python 3 only
+        if hasattr(self._view, "release"):
+            self._view.release()
+        if self._on_close is not None:
+            self._on_close()
+            self._on_close = None
+
+
+class MmapPartSource(object):
+    """
+    Parts served as memoryview slices of a read only memory-mapped file.
+    """
+
+    def __init__(self, filepath):
+        self._file = open(filepath, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+        try:
+            # TypeError on Python 2, its mmap does not support the buffer protocol of memoryview
+            self._view = memoryview(self._mmap)
+        except Exception:
+            self._mmap.close()
+            self._file.close()
+            raise
+
+        if hasattr(self._mmap, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+            self._mmap.madvise(mmap.MADV_SEQUENTIAL)
+
+    def part(self, offset, size):
+        return PartReader(self._view[offset : offset + size], on_close=lambda: self._drop_pages(offset, size))
+
+    def _drop_pages(self, offset, size):
+        # Drop the pages of a sent part from the resident set of this process. They stay in the page cache,
+        # so a retry of the part only faults them back in.
+        if hasattr(self._mmap, "madvise") and hasattr(mmap, "MADV_DONTNEED"):
+            start = offset - offset % mmap.PAGESIZE
+            try:
+                self._mmap.madvise(mmap.MADV_DONTNEED, start, size + offset - start)
+            except (OSError, ValueError):
+                pass
+
+    def close(self):
+        if hasattr(self._view, "release"):
+            self._view.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            # a part body is still referenced somewhere, the mapping is released once it is garbage collected
+            pass
+        self._file.close()
+
+
+class BufferedPartSource(object):
+    """
+    Parts read from disk into memory, for platforms or files that can't be memory-mapped.
+    """
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+
+    def part(self, offset, size):
+        with open(self.filepath, "rb") as f:
+            f.seek(offset)
+            return PartReader(memoryview(f.read(size)))
+
+    def close(self):
+        pass
+
+
+def open_part_source(filepath, use_mmap=None):
+    """
+    Return a part source for a file, memory-mapped when possible.
+
+    :param str filepath: Path of the file
+    :param bool use_mmap: (Optional) Override USE_MMAP
+    :rtype: MmapPartSource|BufferedPartSource
+    """
+    if use_mmap is None:
+        use_mmap = USE_MMAP
+
+    # empty files can't be mapped
+    if use_mmap and mmap is not None and os.stat(filepath).st_size:
+        try:
+            return MmapPartSource(filepath)
+        except (OSError, IOError, ValueError, TypeError):
+            pass
+
+    return BufferedPartSource(filepath)
+
+
+class MultipartUpload(object):
+    """
+    State of a single direct to S3 multipart upload.
+    """
+
+    def __init__(
+        self,
+        review_id,
+        filepath,
+        file_name="",
+        item_uuid=None,
+        noConvertFlag=False,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+    ):
+        self.review_id = review_id
+        self.filepath = filepath
+        self.item_uuid = item_uuid
+        self.noConvertFlag = noConvertFlag
+        self.chunk_size = chunk_size
+
+        stat = os.stat(filepath)
+        self.file_size = stat.st_size
+        self.file_mtime = stat.st_mtime
+        if not file_name:
+            file_name = os.path.basename(filepath)
+        elif not os.path.splitext(file_name)[1]:
+            file_name += os.path.splitext(filepath)[1]
+        self.file_name = file_name
+
+        import mimetypes
+
+        self.content_type = mimetypes.guess_type(filepath, strict=False)[0]
+
+        self.total_parts = (self.file_size + chunk_size - 1) // chunk_size
+
+        # set by SyncSketchAPI._start_multipart_upload
+        self.item_id = None
+        self.upload_id = None
+        self.upload_key = None
+        self.start_time = None
+
+        # part number -> {"PartNumber": int, "ETag": str}
+        self.parts = {}
+
+        # syncsketch.progress.ProgressReporter, set when progress is reported
+        self.progress = None
+
+        self._part_source = None
+        self._part_source_lock = threading.Lock()
+
+    def part_size(self, part_number):
+        """
+        :param int part_number: 1 based part number
+        :return: Size of the part in bytes
+        :rtype: int
+        """
+        offset = (part_number - 1) * self.chunk_size
+        return max(0, min(self.chunk_size, self.file_size - offset))
+
+    def part_body(self, part_number):
+        """
+        Return a new request body for a single part. Use a new body for every attempt.
+
+        :param int part_number: 1 based part number
+        :rtype: PartReader
+        """
+        with self._part_source_lock:
+            if self._part_source is None:
+                self._part_source = open_part_source(self.filepath)
+            part_source = self._part_source
+
+        return part_source.part((part_number - 1) * self.chunk_size, self.part_size(part_number))
+
+    def close(self):
+        """
+        Release the file of the part source.
+        """
+        with self._part_source_lock:
+            if self._part_source is not None:
+                self._part_source.close()
+                self._part_source = None
+
+    def state(self):
+        """
+        Return what is needed to resume this upload in another process, JSON serializable.
+
+        :rtype: dict
+        """
+        return {
+            "review_id": self.review_id,
+            "file_size": self.file_size,
+            "file_mtime": self.file_mtime,
+            "chunk_size": self.chunk_size,
+            "item_id": self.item_id,
+            "item_uuid": self.item_uuid,
+            "upload_id": self.upload_id,
+            "upload_key": self.upload_key,
+            "parts": self.completed_parts,
+        }
+
+    def restore(self, state):
+        """
+        Continue a started upload from a :meth:`state`, unless the file or the upload settings changed since.
+
+        :param dict state: State returned by :meth:`state`, or None
+        :return: True if the state was restored
+        :rtype: bool
+        """
+        if not state or not state.get("upload_id"):
+            return False
+        if (state["review_id"], state["file_size"], state["file_mtime"], state["chunk_size"]) != (
+            self.review_id,
+            self.file_size,
+            self.file_mtime,
+            self.chunk_size,
+        ):
+            return False
+
+        self.item_id = state["item_id"]
+        self.item_uuid = state["item_uuid"]
+        self.upload_id = state["upload_id"]
+        self.upload_key = state["upload_key"]
+        self.parts = dict((part["PartNumber"], part) for part in state["parts"])
+        return True
+
+    @property
+    def completed_parts(self):
+        """
+        Uploaded parts sorted by part number, as expected by the complete call.
+
+        :rtype: list[dict]
+        """
+        return [self.parts[part_number] for part_number in sorted(self.parts)]
+
+
+class UploadScheduler(object):
+    """
+    Hands out the work for many multipart uploads to one shared pool of workers.
+
+    - The largest pending file is started first and always gets at least every other free worker, so large files
+      keep streaming from the start.
+    - The remaining workers go to the active upload with the fewest bytes left, and new files are started from the
+      smallest up, so small files finish early.
+    """
+
+    START = "start"
+    PART = "part"
+
+    def __init__(self, uploads, max_active):
+        self._condition = threading.Condition()
+        self._pending = sorted(uploads, key=lambda upload: upload.file_size)
+        self._active = []
+        self._max_active = max(1, max_active)
+        self._stream = None
+        self._picks = 0
+        self.cancelled = False
+
+        # per upload bookkeeping
+        self._next_part = {}
+        self._in_flight = {}
+        self._started = set()
+        self._failed = set()
+        # uploads a worker completes or aborts right now
+        self._finishing = set()
+
+    def _bytes_left(self, upload):
+        return sum(upload.part_size(n) for n in range(self._next_part[upload], upload.total_parts + 1))
+
+    def next_job(self):
+        """
+        Block until there is work and return it.
+
+        :return: (UploadScheduler.START, upload, None), (UploadScheduler.PART, upload, part_number) or None when
+                 all uploads are finished or the scheduler was cancelled.
+        """
+        with self._condition:
+            while not self.cancelled:
+                candidates = [
+                    upload
+                    for upload in self._active
+                    if upload in self._started
+                    and upload not in self._failed
+                    and self._next_part[upload] <= upload.total_parts
+                ]
+
+                if candidates:
+                    self._picks += 1
+                    if self._stream in candidates and (self._picks % 2 == 0 or len(candidates) == 1):
+                        upload = self._stream
+                    else:
+                        upload = min(candidates, key=self._bytes_left)
+
+                    part_number = self._next_part[upload]
+                    self._next_part[upload] += 1
+                    self._in_flight[upload] += 1
+                    return self.PART, upload, part_number
+
+                if self._pending and len(self._active) < self._max_active:
+                    if self._stream is None:
+                        upload = self._stream = self._pending.pop()
+                    else:
+                        upload = self._pending.pop(0)
+
+                    self._active.append(upload)
+                    self._next_part[upload] = 1
+                    self._in_flight[upload] = 0
+                    return self.START, upload, None
+
+                if not self._pending and not self._active:
+                    return None
+
+                self._condition.wait()
+
+        return None
+
+    def start_done(self, upload, ok):
+        """
+        Record the result of a start job.
+
+        :return: True if the upload has no parts and is ready to be completed
+        :rtype: bool
+        """
+        with self._condition:
+            if ok:
+                self._started.add(upload)
+            if not ok or self.cancelled:
+                self._failed.add(upload)
+            self._condition.notify_all()
+            if upload in self._failed or upload.total_parts == 0:
+                self._finishing.add(upload)
+                return True
+            return False
+
+    def part_done(self, upload, part_number, part):
+        """
+        Record the result of a part job.
+
+        :param MultipartUpload upload:
+        :param int part_number:
+        :param dict part: Uploaded part or None on failure
+        :return: True if this was the last part in flight of the upload and it can be completed or aborted
+        :rtype: bool
+        """
+        with self._condition:
+            self._in_flight[upload] -= 1
+            if part is None or self.cancelled:
+                self._failed.add(upload)
+            if part is not None:
+                upload.parts[part_number] = part
+            self._condition.notify_all()
+
+            if self._in_flight[upload]:
+                return False
+            if upload in self._failed or len(upload.parts) == upload.total_parts:
+                self._finishing.add(upload)
+                return True
+            return False
+
+    def failed(self, upload):
+        with self._condition:
+            return upload in self._failed
+
+    def finish(self, upload):
+        """
+        Remove a completed or aborted upload so its worker slots go to other files.
+        """
+        with self._condition:
+            self._active.remove(upload)
+            if self._stream is upload:
+                self._stream = None
+            self._condition.notify_all()
+
+    def cancel(self):
+        """
+        Stop handing out work. Started uploads fail, workers abort the uploads they have parts or a start in flight
+        for once those return.
+
+        :return: Started uploads without work in flight, which no worker will finish and the caller has to abort
+        :rtype: list[MultipartUpload]
+        """
+        with self._condition:
+            self.cancelled = True
+            self._failed.update(self._active)
+            idle = [
+                upload
+                for upload in self._active
+                if upload in self._started and not self._in_flight[upload] and upload not in self._finishing
+            ]
+            self._finishing.update(idle)
+            self._condition.notify_all()
+            return idle
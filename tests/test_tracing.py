@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+from __future__ import absolute_import, division, print_function
+
+import json
+
+import pytest
+
+pytest.importorskip("opentelemetry.sdk")
+
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+from syncsketch import SyncSketchAPI
+from syncsketch.tracing import Tracer
+
+
+class StubResponse(object):
+    def __init__(self, data=None, headers=None):
+        self.status_code = 200
+        self.ok = True
+        self.content = json.dumps(data if data is not None else {}).encode("utf-8")
+        self.text = self.content.decode("utf-8")
+        self.headers = headers or {}
+
+
+class UploadTransport(object):
+    """
+    Answers the requests of a multipart upload.
+    """
+
+    def request(self, method, url, **kwargs):
+        if "/s3/" in url:
+            return StubResponse(headers={"ETag": '"etag"'})
+        if "/sign-part/" in url:
+            return StubResponse({"url": "https://s3.example.com/s3/upload/1"})
+        if url.endswith("/uploads/stats/upload-start/"):
+            return StubResponse({"item_id": 5, "item_uuid": "uuid"})
+        if url.endswith("/uploads/multipart-upload/"):
+            return StubResponse({"uploadId": "upload", "key": "key"})
+        if url.endswith("/complete/"):
+            return StubResponse({"status": "done"})
+        return StubResponse({"id": 5, "uuid": "uuid"})
+
+
+@pytest.fixture
+def exporter():
+    return InMemorySpanExporter()
+
+
+@pytest.fixture
+def provider(exporter):
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    return provider
+
+
+def test_upload_span_nesting(tmp_path, provider, exporter):
+    filepath = tmp_path / "movie.webm"
+    filepath.write_bytes(b"x" * 2500)
+
+    api = SyncSketchAPI("user", "key", use_header_auth=True, transport=UploadTransport(), tracer_provider=provider)
+    assert api.upload_file(1, str(filepath), chunk_size=1000, max_workers=2)["id"] == 5
+
+    spans = exporter.get_finished_spans()
+    by_id = dict((span.context.span_id, span) for span in spans)
+
+    def parent(span):
+        return by_id.get(span.parent.span_id) if span.parent is not None else None
+
+    (method_span,) = [span for span in spans if span.name == "SyncSketchAPI.upload_file"]
+    assert method_span.parent is None
+
+    part_spans = [span for span in spans if span.name == "upload_part"]
+    assert sorted(span.attributes["syncsketch.part_number"] for span in part_spans) == [1, 2, 3]
+    for span in part_spans:
+        assert parent(span) is method_span
+
+    # every span is within the call, the final get_item call opens its own method span
+    for span in spans:
+        root = span
+        while parent(root) is not None:
+            root = parent(root)
+        assert root is method_span
+
+    http_spans = [span for span in spans if span.name.startswith("HTTP ")]
+    for span in http_spans:
+        assert parent(span).name.startswith("SyncSketchAPI.") or parent(span) in part_spans
+
+    # every part signs and puts its data within its own span
+    for part_span in part_spans:
+        children = [span for span in http_spans if parent(span) is part_span]
+        assert len(children) == 2
+        assert any(span.attributes.get("http.method") == "PUT" for span in children)
+
+
+def test_tracer_resolved_on_first_span(provider, exporter, monkeypatch):
+    import sys
+
+    from opentelemetry import trace as otel_trace
+
+    # a client created before OpenTelemetry was imported
+    monkeypatch.delitem(sys.modules, "opentelemetry.trace")
+    tracer = Tracer()
+    assert not tracer.enabled
+
+    monkeypatch.setitem(sys.modules, "opentelemetry.trace", otel_trace)
+    monkeypatch.setattr(otel_trace, "get_tracer_provider", lambda: provider)
+    with tracer.span("configured later"):
+        pass
+
+    assert [span.name for span in exporter.get_finished_spans()] == ["configured later"]